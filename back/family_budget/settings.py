@@ -21,6 +21,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'family_budget_app.middleware.PerformanceMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -104,6 +105,39 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Request performance instrumentation (see family_budget_app/metrics.py).
+# Metrics are served to staff users at /metrics in Prometheus text format.
+SLOW_REQUEST_THRESHOLD_MS = 500
+
+# Currency of family-level totals, summaries and AI analysis (see family_budget_app/rates.py).
+# Exchange rates are loaded with `manage.py load_exchange_rates` and cached per process
+# for EXCHANGE_RATE_CACHE_SECONDS.
+BASE_CURRENCY = 'KZT'
+EXCHANGE_RATE_CACHE_SECONDS = 300
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'family_budget_app.performance': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+        # Tracebacks of failed background jobs (clients only see a short message)
+        'family_budget_app.jobs': {
+            'handlers': ['console'],
+            'level': 'ERROR',
+            'propagate': False,
+        },
+    },
+}
+
 # Allow authentication by email via custom backend and fallback to default ModelBackend
 AUTHENTICATION_BACKENDS = [
     'family_budget_app.backends.EmailBackend',
@@ -1,7 +1,9 @@
 from django.contrib import admin
 from django.urls import path, include
+from family_budget_app.views import MetricsView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('family_budget_app.urls')),
+    path('metrics', MetricsView.as_view(), name='metrics'),
 ]
\ No newline at end of file
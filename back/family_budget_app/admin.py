@@ -16,15 +16,39 @@ class FamilyAdmin(admin.ModelAdmin):
 
 @admin.register(Finance)
 class FinanceAdmin(admin.ModelAdmin):
-    list_display = ('user', 'balance', 'income', 'expenses', 'updated_at')
+    list_display = ('user', 'balance', 'income', 'expenses', 'currency', 'updated_at')
 
 @admin.register(Transaction)
 class TransactionAdmin(admin.ModelAdmin):
-    list_display = ('finance', 'amount', 'category', 'type', 'date')
+    list_display = ('finance', 'amount', 'currency', 'category', 'type', 'date')
 
 @admin.register(Goal)
 class GoalAdmin(admin.ModelAdmin):
     list_display = ('goal_name', 'family', 'target_amount', 'current_amount', 'deadline')
 
+@admin.register(RecurringRule)
+class RecurringRuleAdmin(admin.ModelAdmin):
+    list_display = ('finance', 'amount', 'type', 'frequency', 'interval', 'next_run', 'is_active')
+    list_filter = ('frequency', 'is_active')
+
+@admin.register(CategoryBudget)
+class CategoryBudgetAdmin(admin.ModelAdmin):
+    list_display = ('family', 'category', 'month', 'limit', 'spent')
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('job_id', 'kind', 'user', 'status', 'worker', 'created_at', 'finished_at')
+    list_filter = ('kind', 'status')
+
+@admin.register(ExchangeRate)
+class ExchangeRateAdmin(admin.ModelAdmin):
+    list_display = ('date', 'from_currency', 'to_currency', 'rate')
+    list_filter = ('from_currency', 'to_currency')
+
+@admin.register(AnalyticsSnapshot)
+class AnalyticsSnapshotAdmin(admin.ModelAdmin):
+    list_display = ('scope_key', 'kind', 'data_version', 'computed_at')
+    list_filter = ('kind',)
+
 admin.site.register(Role)
 admin.site.register(Category)
\ No newline at end of file
@@ -3,26 +3,169 @@ AI Budget Assistant Service
 
 Provides intelligent financial analysis and recommendations using:
 - Spending pattern analysis
-- Linear regression for expense prediction
+- Holt-Winters forecasting with yearly seasonality (forecasting.py)
 - Anomaly detection for unusual transactions
-- ML-based transaction categorization
+- Keyword-based transaction categorization, batched for ingest (assign_categories)
 - Personalized budget recommendations
+- Family-wide analysis of all members in one pass (FamilyBudgetAIService)
 """
 
 from decimal import Decimal
-from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional
 from collections import defaultdict
 import statistics
 
 import numpy as np
-import pandas as pd
-from sklearn.linear_model import LinearRegression
-from sklearn.preprocessing import StandardScaler
+from django.conf import settings
+from django.utils.functional import cached_property
+from django.utils import timezone
 
+from . import forecasting, money
+from .rates import cache as rates, converted
 from .models import Transaction, User, Finance, Category
 
 
+FORECAST_NOTES = {
+    'holt_winters': 'Holt-Winters forecast with yearly seasonality, trend and prediction intervals',
+    'holt': 'Trend forecast with prediction intervals (yearly seasonality needs 24 months of history)',
+}
+
+
+# Keywords per category; a description matches every keyword it contains (case-insensitive)
+CATEGORY_KEYWORDS = {
+    'Food & Dining': [
+        'restaurant', 'cafe', 'coffee', 'pizza', 'burger', 'groceries',
+        'supermarket', 'market', 'lunch', 'dinner', 'breakfast', 'fast food',
+        'diner', 'bakery', 'bistro', 'food delivery', 'uber eats', 'doordash'
+    ],
+    'Transportation': [
+        'gas', 'fuel', 'car', 'uber', 'lyft', 'taxi', 'bus', 'metro',
+        'parking', 'toll', 'public transport', 'train', 'flight', 'airline',
+        'transit', 'bicycle', 'motorcycle'
+    ],
+    'Entertainment': [
+        'movie', 'cinema', 'concert', 'music', 'game', 'xbox', 'playstation',
+        'spotify', 'netflix', 'disney', 'hulu', 'tickets', 'show', 'theater',
+        'streaming', 'entertainment'
+    ],
+    'Shopping': [
+        'mall', 'store', 'shop', 'amazon', 'ebay', 'retail', 'clothing',
+        'apparel', 'fashion', 'department store', 'boutique', 'outlet'
+    ],
+    'Utilities': [
+        'electricity', 'water', 'gas bill', 'internet', 'phone', 'mobile',
+        'utility', 'bill', 'power', 'broadband', 'wifi'
+    ],
+    'Healthcare': [
+        'pharmacy', 'doctor', 'hospital', 'medical', 'clinic', 'dental',
+        'dentist', 'medicine', 'drug', 'health', 'therapy', 'healthcare'
+    ],
+    'Education': [
+        'school', 'university', 'college', 'tuition', 'course', 'books',
+        'education', 'training', 'class', 'lesson', 'student'
+    ],
+    'Fitness': [
+        'gym', 'fitness', 'yoga', 'trainer', 'sports', 'athletic',
+        'workout', 'exercise', 'health club'
+    ],
+    'Other': []
+}
+
+# Stored categories a suggestion may be filed under, preferred first. Suggestions
+# never create categories; without a stored match the transaction stays uncategorized.
+SUGGESTED_CATEGORIES = {
+    'Food & Dining': ['Food & Dining', 'Кафе и рестораны', 'Продукты'],
+    'Transportation': ['Transportation', 'Транспорт'],
+    'Entertainment': ['Entertainment', 'Развлечения'],
+    'Shopping': ['Shopping'],
+    'Utilities': ['Utilities', 'Коммуналка'],
+    'Healthcare': ['Healthcare', 'Здоровье'],
+    'Education': ['Education'],
+    'Fitness': ['Fitness', 'Фитнес'],
+}
+
+
+def _categorize(description: str) -> Dict:
+    """Keyword scores of one lowercased description (see BudgetAIService.categorize_transaction)"""
+    # Calculate confidence scores
+    scores = {}
+    matched_keywords = {}
+
+    for category, keywords in CATEGORY_KEYWORDS.items():
+        if not keywords:
+            scores[category] = 0
+            matched_keywords[category] = []
+            continue
+
+        matched = [kw for kw in keywords if kw in description]
+        confidence = len(matched) / len(keywords) if keywords else 0
+        scores[category] = confidence
+        matched_keywords[category] = matched
+
+    # Get top categories
+    sorted_categories = sorted(scores.items(), key=lambda x: x[1], reverse=True)
+    top_category = sorted_categories[0]
+
+    result = {
+        'suggested_category': top_category[0],
+        'confidence': float(top_category[1]),
+        'all_categories': [
+            {
+                'name': cat,
+                'confidence': float(score),
+                'keywords_matched': matched_keywords.get(cat, []),
+            }
+            for cat, score in sorted_categories
+            if score > 0 or cat == 'Other'
+        ][:5],  # Top 5 categories
+    }
+
+    return result
+
+
+def categorize_descriptions(descriptions) -> List[Dict]:
+    """Categorize many descriptions in one call, in input order; repeated descriptions are scored once"""
+    keys = [description.lower() for description in descriptions]
+    scored = {key: _categorize(key) for key in set(keys)}
+    return [scored[key] for key in keys]
+
+
+def suggest_categories(descriptions) -> List[Optional[Category]]:
+    """Stored category each description's keywords point to, or None.
+
+    None where no keyword matched or no stored category corresponds to the
+    suggestion (see SUGGESTED_CATEGORIES). The whole batch is resolved with
+    one fresh query, so categories renamed or deleted by another process are
+    never assigned; none at all when nothing matched.
+    """
+    suggestions = [
+        result['suggested_category'] if result['confidence'] > 0 else None
+        for result in categorize_descriptions(descriptions)
+    ]
+    names = {name for suggestion in set(suggestions) - {None} for name in SUGGESTED_CATEGORIES.get(suggestion, ())}
+    if not names:
+        return [None] * len(suggestions)
+    stored = {}
+    for category in Category.objects.filter(category_name__in=names).order_by('category_id'):
+        stored.setdefault(category.category_name, category)
+    resolved = {
+        suggestion: next((stored[name] for name in SUGGESTED_CATEGORIES.get(suggestion, ()) if name in stored), None)
+        for suggestion in set(suggestions) - {None}
+    }
+    return [resolved.get(suggestion) for suggestion in suggestions]
+
+
+def assign_categories(transactions) -> int:
+    """Categorize unsaved, uncategorized expenses with a description; returns how many got a category"""
+    pending = [t for t in transactions if t.category_id is None and t.type == 'expense' and t.description]
+    assigned = 0
+    for t, category in zip(pending, suggest_categories(t.description for t in pending)):
+        if category is not None:
+            t.category = category
+            assigned += 1
+    return assigned
+
+
 class BudgetAIService:
     """AI-powered budget analysis and recommendation service"""
 
@@ -30,17 +173,27 @@ class BudgetAIService:
         """Initialize service with user context"""
         self.user = user
         self.finance = user.finance if hasattr(user, 'finance') else None
-        self.transactions = self._get_transactions()
+
+    @cached_property
+    def transactions(self) -> list:
+        """Loaded on first use, so categorization alone costs no query"""
+        return self._get_transactions()
 
     def _get_transactions(self) -> list:
-        """Fetch all transactions for the user"""
+        """Fetch all transactions for the user, with amounts in the base currency"""
         if not self.finance:
             return []
-        return list(
+        transactions = list(
             Transaction.objects.filter(finance=self.finance)
             .select_related('category')
+            .annotate(base_amount=converted())
             .order_by('-date')
         )
+        base = settings.BASE_CURRENCY
+        for transaction in transactions:
+            # Analysis copies only; these instances are never saved
+            transaction.amount, transaction.currency = transaction.base_amount, base
+        return transactions
 
     def analyze_spending(self) -> Dict:
         """
@@ -146,7 +299,7 @@ class BudgetAIService:
 
     def predict_monthly_expenses(self, months_ahead: int = 1) -> Dict:
         """
-        Predict future monthly expenses using linear regression
+        Predict future monthly expenses with Holt-Winters exponential smoothing (see forecasting.py)
 
         Args:
             months_ahead: Number of months to predict ahead
@@ -155,9 +308,12 @@ class BudgetAIService:
             {
                 'predicted_expenses': [amount, ...],
                 'predicted_income': [amount, ...],
+                'predicted_net': [amount, ...],
+                'intervals': {'level': float, 'expenses': {predicted, lower, upper}, 'income': {...}},
                 'confidence_score': float (0-1),
-                'model_accuracy': float (R² score),
+                'model_accuracy': float (R² of the one-step-ahead fit),
                 'prediction_months': [month_str, ...],
+                'method': 'holt_winters' | 'holt',
                 'note': str
             }
         """
@@ -180,9 +336,12 @@ class BudgetAIService:
             else:
                 monthly_data[month_key]['expenses'] += transaction.amount
 
-        # Sort by month
-        months = sorted(monthly_data.keys())
-        if len(months) < 2:
+        # Every month from the first to the last, quiet ones included, so seasons line up
+        first, last = min(monthly_data), max(monthly_data)
+        first_index = int(first[:4]) * 12 + int(first[5:]) - 1
+        last_index = int(last[:4]) * 12 + int(last[5:]) - 1
+        months = [f'{i // 12:04d}-{i % 12 + 1:02d}' for i in range(first_index, last_index + 1)]
+        if len(months) < forecasting.MIN_MONTHS:
             return {
                 'predicted_expenses': [],
                 'predicted_income': [],
@@ -192,73 +351,35 @@ class BudgetAIService:
                 'note': 'Need at least 2 months of data for prediction',
             }
 
-        # Prepare data for linear regression
-        X = np.array(range(len(months))).reshape(-1, 1)
-        expenses_y = np.array([float(monthly_data[m]['expenses']) for m in months])
-        income_y = np.array([float(monthly_data[m]['income']) for m in months])
-
-        # Train models
-        try:
-            expense_model = LinearRegression()
-            income_model = LinearRegression()
-
-            expense_model.fit(X, expenses_y)
-            income_model.fit(X, income_y)
-
-            # Get model accuracy (R² score)
-            expense_score = max(0, expense_model.score(X, expenses_y))
-            income_score = max(0, income_model.score(X, income_y))
-
-            # Predict next months
-            future_X = np.array(
-                range(len(months), len(months) + months_ahead)
-            ).reshape(-1, 1)
-
-            predicted_expenses = expense_model.predict(future_X)
-            predicted_income = income_model.predict(future_X)
-
-            # Ensure predictions are non-negative
-            predicted_expenses = np.maximum(predicted_expenses, 0)
-            predicted_income = np.maximum(predicted_income, 0)
-
-            # Calculate confidence (based on historical consistency)
-            expense_std = float(np.std(expenses_y))
-            expense_mean = float(np.mean(expenses_y))
-            confidence = (
-                min(1.0, (expense_score + income_score) / 2)
-                if expense_mean > 0
-                else 0.5
-            )
-
-            # Generate future month labels
-            last_month = datetime.strptime(months[-1], '%Y-%m')
-            future_months = []
-            for i in range(months_ahead):
-                future_month = last_month + timedelta(days=30 * (i + 1))
-                future_months.append(future_month.strftime('%Y-%m'))
+        series = np.array([
+            [float(monthly_data[m]['expenses']) for m in months],
+            [float(monthly_data[m]['income']) for m in months],
+        ])
+        result = forecasting.forecast(series, months_ahead)
+        expense_score, income_score = result.r2
+        expense_mean = float(series[0].mean())
+        confidence = (
+            min(1.0, (expense_score + income_score) / 2)
+            if expense_mean > 0
+            else 0.5
+        )
+        future_months = [
+            f'{i // 12:04d}-{i % 12 + 1:02d}' for i in range(last_index + 1, last_index + 1 + months_ahead)
+        ]
+        expenses, income = result.row(0), result.row(1)
 
-            return {
-                'predicted_expenses': [float(x) for x in predicted_expenses],
-                'predicted_income': [float(x) for x in predicted_income],
-                'predicted_net': [
-                    float(income - expense)
-                    for income, expense in zip(predicted_income, predicted_expenses)
-                ],
-                'confidence_score': float(confidence),
-                'model_accuracy': float((expense_score + income_score) / 2),
-                'prediction_months': future_months,
-                'historical_months': len(months),
-                'note': 'Based on linear trend analysis of historical data',
-            }
-        except Exception as e:
-            return {
-                'predicted_expenses': [],
-                'predicted_income': [],
-                'confidence_score': 0.0,
-                'model_accuracy': 0.0,
-                'prediction_months': [],
-                'note': f'Prediction failed: {str(e)}',
-            }
+        return {
+            'predicted_expenses': expenses['predicted'],
+            'predicted_income': income['predicted'],
+            'predicted_net': np.round(result.mean[1] - result.mean[0], 2).tolist(),
+            'intervals': {'level': result.level, 'expenses': expenses, 'income': income},
+            'confidence_score': float(confidence),
+            'model_accuracy': float((expense_score + income_score) / 2),
+            'prediction_months': future_months,
+            'historical_months': len(months),
+            'method': result.method,
+            'note': FORECAST_NOTES[result.method],
+        }
 
     def get_budget_recommendations(self) -> Dict:
         """
@@ -504,79 +625,296 @@ class BudgetAIService:
                 ]
             }
         """
-        description_lower = description.lower()
-
-        # Predefined category keywords
-        category_keywords = {
-            'Food & Dining': [
-                'restaurant', 'cafe', 'coffee', 'pizza', 'burger', 'groceries',
-                'supermarket', 'market', 'lunch', 'dinner', 'breakfast', 'fast food',
-                'diner', 'bakery', 'bistro', 'food delivery', 'uber eats', 'doordash'
-            ],
-            'Transportation': [
-                'gas', 'fuel', 'car', 'uber', 'lyft', 'taxi', 'bus', 'metro',
-                'parking', 'toll', 'public transport', 'train', 'flight', 'airline',
-                'transit', 'bicycle', 'motorcycle'
-            ],
-            'Entertainment': [
-                'movie', 'cinema', 'concert', 'music', 'game', 'xbox', 'playstation',
-                'spotify', 'netflix', 'disney', 'hulu', 'tickets', 'show', 'theater',
-                'streaming', 'entertainment'
-            ],
-            'Shopping': [
-                'mall', 'store', 'shop', 'amazon', 'ebay', 'retail', 'clothing',
-                'apparel', 'fashion', 'department store', 'boutique', 'outlet'
-            ],
-            'Utilities': [
-                'electricity', 'water', 'gas bill', 'internet', 'phone', 'mobile',
-                'utility', 'bill', 'power', 'broadband', 'wifi'
-            ],
-            'Healthcare': [
-                'pharmacy', 'doctor', 'hospital', 'medical', 'clinic', 'dental',
-                'dentist', 'medicine', 'drug', 'health', 'therapy', 'healthcare'
-            ],
-            'Education': [
-                'school', 'university', 'college', 'tuition', 'course', 'books',
-                'education', 'training', 'class', 'lesson', 'student'
-            ],
-            'Fitness': [
-                'gym', 'fitness', 'yoga', 'trainer', 'sports', 'athletic',
-                'workout', 'exercise', 'health club'
-            ],
-            'Other': []
-        }
+        return categorize_descriptions([description])[0]
 
-        # Calculate confidence scores
-        scores = {}
-        matched_keywords = {}
 
-        for category, keywords in category_keywords.items():
-            if not keywords:
-                scores[category] = 0
-                matched_keywords[category] = []
-                continue
+class FamilyBudgetAIService:
+    """
+    Analysis of a whole family at once.
 
-            matched = [kw for kw in keywords if kw in description_lower]
-            confidence = len(matched) / len(keywords) if keywords else 0
-            scores[category] = confidence
-            matched_keywords[category] = matched
+    All visible members' transactions are loaded with a single query into
+    NumPy arrays; per-member and combined breakdowns, Holt-Winters forecasts
+    (one batched fit over every series) and z-score anomalies are then
+    computed with grouped array operations instead of one BudgetAIService
+    per member.
 
-        # Get top categories
-        sorted_categories = sorted(scores.items(), key=lambda x: x[1], reverse=True)
-        top_category = sorted_categories[0]
+    Admins and family members see every member; kids and users without a
+    family only see themselves. Batch jobs that already know the members and
+    have bulk-loaded their rows (see `for_families`) pass them in directly.
+    """
 
-        result = {
-            'suggested_category': top_category[0],
-            'confidence': float(top_category[1]),
-            'all_categories': [
-                {
-                    'name': cat,
-                    'confidence': float(score),
-                    'keywords_matched': matched_keywords.get(cat, []),
-                }
-                for cat, score in sorted_categories
-                if score > 0 or cat == 'Other'
-            ][:5],  # Top 5 categories
+    def __init__(self, user: Optional[User], members: Optional[list] = None, rows: Optional[list] = None):
+        self.user = user
+        self.members = members if members is not None else self._visible_members()
+        if rows is None:
+            rows = list(self.transaction_rows(Transaction.objects.filter(finance__user__in=self.members)))
+        self._load(rows)
+
+    @staticmethod
+    def transaction_rows(queryset, *extra):
+        """Row tuples _load() expects (amounts in integer cents); `extra` fields are appended after them"""
+        return queryset.annotate(amount_cents=money.cents('amount')).values_list(
+            'transaction_id', 'finance__user_id', 'amount_cents', 'type',
+            'category__category_name', 'date', 'description', 'currency', *extra
+        )
+
+    @classmethod
+    def for_families(cls, family_ids):
+        """Yield (family_id, service) for every family, from two queries in total"""
+        members = defaultdict(list)
+        for member in User.objects.filter(family_id__in=family_ids).select_related('role').order_by('user_id'):
+            members[member.family_id].append(member)
+        rows = defaultdict(list)
+        for row in cls.transaction_rows(
+            Transaction.objects.filter(finance__user__family_id__in=family_ids), 'finance__user__family_id'
+        ).iterator(chunk_size=10000):
+            rows[row[-1]].append(row)
+        for family_id in family_ids:
+            if members[family_id]:
+                yield family_id, cls(None, members=members[family_id], rows=rows[family_id])
+
+    def _visible_members(self) -> list:
+        user = self.user
+        role = user.role.role_name if user.role else None
+        if not user.family_id or role == 'kid':
+            return [user]
+        return list(User.objects.filter(family_id=user.family_id).order_by('user_id'))
+
+    def _load(self, rows):
+        index = {member.user_id: i for i, member in enumerate(self.members)}
+        self.count = len(rows)
+        self.rows = rows
+        categories = sorted({row[4] or 'Uncategorized' for row in rows})
+        category_index = {name: i for i, name in enumerate(categories)}
+        self.categories = categories
+
+        self.member = np.fromiter((index[row[1]] for row in rows), dtype=np.int64, count=self.count)
+        self.amount = np.fromiter((row[2] for row in rows), dtype=np.float64, count=self.count) / 100
+        # Everything is analysed in the base currency; rates are looked up only for foreign rows
+        base = settings.BASE_CURRENCY
+        foreign = [i for i, row in enumerate(rows) if row[7] != base]
+        if foreign:
+            days = np.array([row[5].date() for row in (rows[i] for i in foreign)], dtype='datetime64[D]')
+            rate = rates.base_rates([rows[i][7] for i in foreign], days)
+            self.amount[foreign] = np.round(self.amount[foreign] * rate, 2)
+        self.is_income = np.fromiter((row[3] == 'income' for row in rows), dtype=bool, count=self.count)
+        # Months are bucketed in the active time zone, like ExtractMonth would (SQLite
+        # evaluates Extract* through a Python function per row, which is slower)
+        tz = timezone.get_current_timezone()
+        local_dates = (row[5].astimezone(tz) for row in rows)
+        month_key = np.fromiter((d.year * 12 + d.month - 1 for d in local_dates), dtype=np.int64, count=self.count)
+        self.first_month = int(month_key.min()) if self.count else 0
+        self.n_months = int(month_key.max()) - self.first_month + 1 if self.count else 0
+        self.month = month_key - self.first_month
+        self.category = np.fromiter(
+            (category_index[row[4] or 'Uncategorized'] for row in rows), dtype=np.int64, count=self.count
+        )
+
+    def _month_label(self, offset: int) -> str:
+        year, month = divmod(self.first_month + offset, 12)
+        return f'{year:04d}-{month + 1:02d}'
+
+    def analyze(self, months_ahead: int = 1, threshold: float = 2.0) -> Dict:
+        """
+        Returns:
+            {
+                'members': [{user_id, username, role, total_income, total_expenses, net_balance,
+                             by_category, by_month, forecast, anomalies}, ...],
+                'combined': {same breakdowns for the whole family},
+                'member_count': int,
+                'transaction_count': int,
+                'currency': base currency every amount is in
+            }
+        """
+        n_members, n_categories, n_months = len(self.members), len(self.categories), self.n_months
+        expense = np.where(self.is_income, 0.0, self.amount)
+        income = np.where(self.is_income, self.amount, 0.0)
+
+        # (member, month) and (member, category) grids; the combined row is their sum
+        member_month = self.member * n_months + self.month
+        expenses_by_month = np.bincount(member_month, expense, n_members * n_months).reshape(n_members, n_months)
+        income_by_month = np.bincount(member_month, income, n_members * n_months).reshape(n_members, n_months)
+        active_months = np.bincount(member_month, minlength=n_members * n_months).reshape(n_members, n_months) > 0
+        by_category = np.bincount(
+            self.member * n_categories + self.category, expense, n_members * n_categories
+        ).reshape(n_members, n_categories)
+
+        expenses_by_month = np.vstack([expenses_by_month, expenses_by_month.sum(axis=0)])
+        income_by_month = np.vstack([income_by_month, income_by_month.sum(axis=0)])
+        active_months = np.vstack([active_months, active_months.any(axis=0)])
+        by_category = np.vstack([by_category, by_category.sum(axis=0)])
+
+        forecasts = self._forecast(expenses_by_month, income_by_month, months_ahead)
+
+        # Members are compared against their own history, the family row against everyone's
+        flagged, zscore, means = self._anomalies(self.member * n_categories + self.category, threshold)
+        member_anomalies = defaultdict(list)
+        for i in flagged:
+            if len(member_anomalies[self.member[i]]) < 10:
+                member_anomalies[self.member[i]].append(self._describe_anomaly(i, zscore, means))
+        flagged, zscore, means = self._anomalies(self.category, threshold)
+        family_anomalies = [self._describe_anomaly(i, zscore, means) for i in flagged[:10]]
+
+        # Sums of floats pick up noise in the last digits; money is reported in cents
+        expenses_by_month, income_by_month, by_category = (
+            np.round(expenses_by_month, 2), np.round(income_by_month, 2), np.round(by_category, 2)
+        )
+        results = []
+        for i in range(n_members + 1):
+            months = np.flatnonzero(active_months[i])
+            total_expenses = round(float(expenses_by_month[i].sum()), 2)
+            total_income = round(float(income_by_month[i].sum()), 2)
+            order = np.argsort(-by_category[i], kind='stable')
+            spent = [(self.categories[c], float(by_category[i, c])) for c in order if by_category[i, c] > 0]
+            results.append({
+                'total_expenses': total_expenses,
+                'total_income': total_income,
+                'net_balance': round(total_income - total_expenses, 2),
+                'by_category': dict(spent),
+                'by_month': {
+                    self._month_label(m): {
+                        'income': float(income_by_month[i, m]),
+                        'expenses': float(expenses_by_month[i, m]),
+                        'net': round(float(income_by_month[i, m] - expenses_by_month[i, m]), 2),
+                    }
+                    for m in months
+                },
+                'avg_monthly_expense': round(total_expenses / len(months), 2) if len(months) else 0.0,
+                'top_categories': spent[:5],
+                'forecast': forecasts[i],
+                'anomalies': family_anomalies if i == n_members else member_anomalies.get(i, []),
+            })
+
+        combined = results.pop()
+        for member, result in zip(self.members, results):
+            result.update({
+                'user_id': member.user_id,
+                'username': member.username,
+                'role': member.role.role_name if member.role else None,
+            })
+        return {
+            'members': results,
+            'combined': combined,
+            'member_count': n_members,
+            'transaction_count': self.count,
+            'currency': settings.BASE_CURRENCY,
         }
 
-        return result
+    def _forecast(self, expenses, income, months_ahead) -> List[Dict]:
+        """Forecast every member's (and the family's) monthly series in one batched Holt-Winters call"""
+        n_series = expenses.shape[0]
+        if self.n_months < forecasting.MIN_MONTHS:
+            return [{
+                'predicted_expenses': [], 'predicted_income': [], 'prediction_months': [],
+                'note': 'Need at least 2 months of data for prediction',
+            }] * n_series
+
+        result = forecasting.forecast(np.vstack([expenses, income]), months_ahead)
+        labels = [self._month_label(self.n_months + i) for i in range(months_ahead)]
+
+        forecasts = []
+        for i in range(n_series):
+            predicted_expenses, predicted_income = result.row(i), result.row(n_series + i)
+            forecasts.append({
+                'predicted_expenses': predicted_expenses['predicted'],
+                'predicted_income': predicted_income['predicted'],
+                'predicted_net': np.round(result.mean[n_series + i] - result.mean[i], 2).tolist(),
+                'intervals': {'level': result.level, 'expenses': predicted_expenses, 'income': predicted_income},
+                'model_accuracy': float((result.r2[i] + result.r2[n_series + i]) / 2),
+                'prediction_months': labels,
+                'method': result.method,
+                'note': FORECAST_NOTES[result.method],
+            })
+        return forecasts
+
+    def category_expenses(self):
+        """(category, month) matrix of expenses, aligned with self.categories and the month axis"""
+        n_categories, n_months = len(self.categories), self.n_months
+        expense = np.where(self.is_income, 0.0, self.amount)
+        return np.bincount(
+            self.category * n_months + self.month, expense, n_categories * n_months
+        ).reshape(n_categories, n_months)
+
+    def forecast(self, months_ahead: int = 3, level: float = forecasting.DEFAULT_LEVEL) -> Dict:
+        """
+        Per-category expense forecasts plus total expenses, income and net, from one batched call
+
+        Returns:
+            {
+                'prediction_months': [month_str, ...],
+                'method': 'holt_winters' (2+ years of history) | 'holt',
+                'interval_level': float,
+                'historical_months': int,
+                'expenses': {predicted, lower, upper, model_accuracy},
+                'income': {...},
+                'net': [amount, ...],
+                'by_category': [{category, predicted, lower, upper, model_accuracy}, ...],
+                'currency': base currency every amount is in,
+                'note': str
+            }
+        """
+        if self.n_months < forecasting.MIN_MONTHS:
+            return {
+                'prediction_months': [], 'by_category': [], 'historical_months': self.n_months,
+                'currency': settings.BASE_CURRENCY,
+                'note': 'Need at least 2 months of data for prediction',
+            }
+        n_months = self.n_months
+        by_category = self.category_expenses()
+        totals = np.vstack([
+            by_category.sum(axis=0),
+            np.bincount(self.month, np.where(self.is_income, self.amount, 0.0), n_months),
+        ])
+        result = forecasting.forecast(np.vstack([totals, by_category]), months_ahead, level)
+
+        def series(i):
+            return {**result.row(i), 'model_accuracy': round(float(result.r2[i]), 4)}
+
+        # Categories nobody spent on (income-only ones) have nothing to forecast
+        spent = by_category.sum(axis=1) > 0
+        categories = [
+            {'category': self.categories[c], **series(2 + c)} for c in np.flatnonzero(spent)
+        ]
+        categories.sort(key=lambda item: -sum(item['predicted']))
+        return {
+            'prediction_months': [self._month_label(n_months + i) for i in range(months_ahead)],
+            'method': result.method,
+            'interval_level': level,
+            'historical_months': n_months,
+            'expenses': series(0),
+            'income': series(1),
+            'net': np.round(result.mean[1] - result.mean[0], 2).tolist(),
+            'by_category': categories,
+            'currency': settings.BASE_CURRENCY,
+            'note': FORECAST_NOTES[result.method],
+        }
+
+    def _anomalies(self, groups, threshold):
+        """Z-score every amount within its group (NumPy population std, as in detect_anomalies).
+
+        Returns the flagged row indices, most unusual first, with the z-scores and group means.
+        """
+        size = int(groups.max()) + 1 if self.count else 0
+        counts = np.bincount(groups, minlength=size)
+        means = np.bincount(groups, weights=self.amount, minlength=size) / np.maximum(counts, 1)
+        variance = np.bincount(groups, weights=self.amount ** 2, minlength=size) / np.maximum(counts, 1) - means ** 2
+        std = np.sqrt(np.maximum(variance, 0))[groups]
+        zscore = np.divide(self.amount - means[groups], std, out=np.zeros_like(self.amount), where=std > 1e-9)
+        flagged = np.flatnonzero((counts[groups] >= 3) & (np.abs(zscore) >= threshold))
+        return flagged[np.argsort(-np.abs(zscore[flagged]), kind='stable')], zscore, means[groups]
+
+    def _describe_anomaly(self, i, zscore, means) -> Dict:
+        row, z = self.rows[i], float(zscore[i])
+        category = self.categories[self.category[i]]
+        return {
+            'transaction_id': row[0],
+            'user_id': row[1],
+            'date': row[5].isoformat(),
+            'amount': float(self.amount[i]),
+            'category': category,
+            'description': row[6],
+            'reason': (f'Amount ${self.amount[i]:.2f} is {abs(z):.1f}x standard deviations '
+                       f'from average (${means[i]:.2f}) in {category}'),
+            'severity': 'high' if abs(z) >= 3 else 'medium' if abs(z) >= 2 else 'low',
+            'zscore': z,
+        }
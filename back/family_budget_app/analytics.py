@@ -0,0 +1,60 @@
+"""
+Nightly precomputation of family analytics.
+
+`compute_shard()` is the unit of work `compute_nightly_analytics` hands to
+its process pool: it bulk-loads one shard of families, runs the family
+analysis for each and upserts the results into AnalyticsSnapshot.
+Everything here must be importable by a freshly started worker process.
+"""
+
+import os
+import time
+
+from django.db import connections
+
+# Same key as GET /api/ai/analyze/?scope=family&months_ahead=3, so dashboards read these rows
+SNAPSHOT_KIND = 'ai.analyze'
+SNAPSHOT_PARAMS = {'scope': 'family', 'months_ahead': 3}
+
+
+def init_worker():
+    """ProcessPoolExecutor initializer: never share the parent's DB connections"""
+    import django
+    django.setup()
+    for conn in connections.all():
+        # Forked children inherit the parent's socket/file handle; drop it
+        # without a clean close so the parent's connection is unaffected.
+        conn.connection = None
+        conn.close()
+
+
+def compute_shard(family_ids):
+    """Analyze `family_ids` and write their snapshots; returns per-worker stats"""
+    from . import snapshots
+    from .ai_service import FamilyBudgetAIService
+    from .models import AnalyticsSnapshot
+
+    started = time.perf_counter()
+    # Versions are read before the data, so concurrent writes leave the snapshot stale
+    versions = snapshots.family_versions(family_ids)
+    rows, transactions = [], 0
+    for family_id, service in FamilyBudgetAIService.for_families(family_ids):
+        transactions += service.count
+        rows.append(snapshots.build(
+            snapshots.family_scope(family_id, versions.get(family_id, '')),
+            SNAPSHOT_KIND,
+            SNAPSHOT_PARAMS,
+            service.analyze(SNAPSHOT_PARAMS['months_ahead']),
+        ))
+    AnalyticsSnapshot.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=['scope_key', 'kind', 'params_hash'],
+        update_fields=['payload', 'data_version', 'computed_at'],
+    )
+    return {
+        'pid': os.getpid(),
+        'families': len(rows),
+        'transactions': transactions,
+        'seconds': time.perf_counter() - started,
+    }
@@ -1,18 +1,22 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 class FamilyBudgetAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'family_budget_app'
-    
+    # Default roles are seeded by migration 0003_seed_roles, so ready() stays
+    # free of DB queries (it runs for every manage.py command and worker).
+
     def ready(self):
-        # Ensure default roles exist on app startup. Guard against running
-        # during migrations or when DB isn't ready yet.
-        try:
-            from django.db.utils import OperationalError, ProgrammingError
-            from .models import Role
-            # create basic roles if missing
-            for rn in ('admin', 'family_member', 'kid', 'solo'):
-                Role.objects.get_or_create(role_name=rn)
-        except (OperationalError, ProgrammingError, ImportError):
-            # If DB isn't ready yet (makemigrations/migrate), skip
-            pass
\ No newline at end of file
+        from .metrics import install_serializer_timing
+        install_serializer_timing()
+        post_migrate.connect(_repair_search, sender=self)
+
+
+def _repair_search(using, plan=None, **kwargs):
+    # SQLite rebuilds a table when a migration alters it, dropping the search
+    # triggers with it
+    from django.db import connections
+    from .search import repair
+    if plan:
+        repair(connections[using])
@@ -0,0 +1,267 @@
+"""
+Benchmark suite for API, ORM and AI service hot paths.
+
+Run with `python manage.py benchmark` (see that command for options). Each
+case runs against a synthetic family built by `synthetic.py` inside a
+throwaway test database. Results are plain JSON so two runs can be compared
+for regressions.
+"""
+
+import platform
+import statistics
+import subprocess
+import time
+from decimal import Decimal
+
+import django
+from django.db import connection
+from django.utils import timezone
+
+# name -> function(ctx); registered with @case
+CASES = {}
+
+
+def case(name):
+    def register(func):
+        CASES[name] = func
+        return func
+    return register
+
+
+class Scenario:
+    """Synthetic dataset one round of benchmarks runs against"""
+
+    def __init__(self, members, transactions, seed=0):
+        from .synthetic import create_family, generate_transactions
+        self.members = members
+        self.transactions = transactions
+        prefix = f'bench-{members}m-{transactions}t-{seed}'
+        self.family, self.users, self.finances = create_family(prefix, members)
+        generate_transactions(self.finances, transactions, seed=seed)
+        self.user = self.users[0]
+        self._seed_rates()
+
+    @staticmethod
+    def _seed_rates():
+        """One foreign currency, so conversion paths have a rate to use"""
+        from django.conf import settings
+        from .models import ExchangeRate
+        ExchangeRate.objects.get_or_create(
+            from_currency='USD', to_currency=settings.BASE_CURRENCY, date=timezone.localdate(),
+            defaults={'rate': Decimal('500')},
+        )
+
+    def client(self):
+        from rest_framework.test import APIClient
+        client = APIClient(HTTP_HOST='localhost')
+        client.force_authenticate(self.user)
+        return client
+
+    def ai_service(self):
+        from .ai_service import BudgetAIService
+        return BudgetAIService(self.user)
+
+
+def _get(ctx, path):
+    response = ctx.client().get(path)
+    assert response.status_code == 200, f'{path} returned {response.status_code}'
+    return response
+
+
+@case('api.family_transactions')
+def bench_family_transactions(ctx):
+    _get(ctx, '/api/families/family_transactions/')
+
+
+@case('api.by_category')
+def bench_by_category(ctx):
+    _get(ctx, '/api/transactions/by_category/')
+
+
+@case('api.summary')
+def bench_summary(ctx):
+    _get(ctx, '/api/finance/summary/')
+
+
+@case('api.cashflow')
+def bench_cashflow(ctx):
+    since = timezone.localdate().replace(year=timezone.localdate().year - 1)
+    _get(ctx, f'/api/finance/cashflow/?granularity=day&scope=family&from={since}')
+
+
+@case('api.balance_history')
+def bench_balance_history(ctx):
+    _get(ctx, '/api/finance/balance_history/?scope=family&points=500')
+
+
+@case('api.transaction_search')
+def bench_transaction_search(ctx):
+    for query in ('покуп', 'зарплата', 'net'):
+        _get(ctx, f'/api/transactions/search/?q={query}')
+
+
+@case('api.transaction_duplicates')
+def bench_transaction_duplicates(ctx):
+    _get(ctx, '/api/transactions/duplicates/')
+
+
+@case('ai.load')
+def bench_ai_load(ctx):
+    ctx.ai_service()
+
+
+@case('ai.analyze_spending')
+def bench_analyze_spending(ctx):
+    ctx.ai_service().analyze_spending()
+
+
+@case('ai.predict_monthly_expenses')
+def bench_predict(ctx):
+    ctx.ai_service().predict_monthly_expenses(3)
+
+
+@case('ai.get_budget_recommendations')
+def bench_recommendations(ctx):
+    ctx.ai_service().get_budget_recommendations()
+
+
+@case('ai.detect_anomalies')
+def bench_anomalies(ctx):
+    ctx.ai_service().detect_anomalies()
+
+
+@case('ai.family_analyze')
+def bench_family_analyze(ctx):
+    from .ai_service import FamilyBudgetAIService
+    FamilyBudgetAIService(ctx.user).analyze(3)
+
+
+@case('ai.forecast')
+def bench_forecast(ctx):
+    from .ai_service import FamilyBudgetAIService
+    FamilyBudgetAIService(ctx.user).forecast(6)
+
+
+@case('goal.simulate')
+def bench_goal_simulate(ctx):
+    from datetime import timedelta
+    from .models import Goal
+    from .simulation import simulate_goal
+    goal = Goal(family=ctx.family, goal_name='benchmark', target_amount=Decimal('100000'),
+                current_amount=Decimal('0'), deadline=timezone.localdate() + timedelta(days=730))
+    simulate_goal(goal, paths=5000)
+
+
+@case('ai.categorize_transaction')
+def bench_categorize(ctx):
+    service = ctx.ai_service()
+    for description in ('Starbucks coffee', 'Uber ride', 'Netflix subscription', 'Pharmacy', 'Магнит'):
+        service.categorize_transaction(description)
+
+
+@case('ai.categorize_batch')
+def bench_categorize_batch(ctx):
+    from .ai_service import categorize_descriptions
+    descriptions = ('Starbucks coffee', 'Uber ride', 'Netflix subscription', 'Pharmacy', 'Магнит')
+    categorize_descriptions([f'{description} #{i % 50}' for i, description in enumerate(descriptions * 200)])
+
+
+@case('api.transaction_import')
+def bench_transaction_import(ctx):
+    descriptions = ('Starbucks coffee', 'Uber ride', 'Netflix subscription', 'Pharmacy', 'Магнит')
+    rows = [
+        {'amount': '12.34', 'type': 'expense', 'date': timezone.now().isoformat(), 'description': description}
+        for description in descriptions * 20
+    ]
+    response = ctx.client().post('/api/transactions/import/', {'transactions': rows}, format='json')
+    assert response.status_code == 201, f'import returned {response.status_code}'
+
+
+@case('orm.ledger_totals')
+def bench_ledger_totals(ctx):
+    from .ledger import ledger_totals
+    ledger_totals([finance.pk for finance in ctx.finances])
+
+
+@case('ai.family_load')
+def bench_family_load(ctx):
+    from .ai_service import FamilyBudgetAIService
+    FamilyBudgetAIService(ctx.user)
+
+
+@case('orm.transaction_save')
+def bench_transaction_save(ctx):
+    from .models import Transaction
+    Transaction(
+        finance=ctx.finances[0], amount=Decimal('12.34'), type='expense',
+        date=timezone.now(), description='benchmark write',
+    ).save()
+
+
+@case('orm.transaction_save_foreign')
+def bench_transaction_save_foreign(ctx):
+    from .models import Transaction
+    Transaction(
+        finance=ctx.finances[0], amount=Decimal('12.34'), currency='USD', type='expense',
+        date=timezone.now(), description='benchmark write',
+    ).save()
+
+
+def measure(func, ctx, rounds, warmup=1):
+    """Time `rounds` calls of func(ctx) after `warmup` untimed calls"""
+    for _ in range(warmup):
+        func(ctx)
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func(ctx)
+        timings.append(time.perf_counter() - start)
+    return {
+        'rounds': rounds,
+        'min': min(timings),
+        'max': max(timings),
+        'mean': statistics.mean(timings),
+        'median': statistics.median(timings),
+        'stdev': statistics.stdev(timings) if len(timings) > 1 else 0.0,
+    }
+
+
+def environment():
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'timestamp': timezone.now().isoformat(),
+        'git_commit': commit,
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+        'machine': platform.machine(),
+    }
+
+
+def compare(baseline, current, threshold):
+    """Pair results by (case, members, transactions) and flag slowdowns above `threshold`"""
+    def key(result):
+        return (result['case'], result['members'], result['transactions'])
+
+    previous = {key(r): r for r in baseline['results']}
+    rows = []
+    for result in current['results']:
+        old = previous.get(key(result))
+        if not old or not old['median']:
+            continue
+        ratio = result['median'] / old['median']
+        rows.append({
+            'case': result['case'],
+            'members': result['members'],
+            'transactions': result['transactions'],
+            'baseline_median': old['median'],
+            'median': result['median'],
+            'ratio': ratio,
+            'regression': ratio > 1 + threshold,
+        })
+    return rows
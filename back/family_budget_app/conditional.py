@@ -0,0 +1,71 @@
+"""
+Conditional GET support (ETag) for dashboard reads.
+
+Validators are computed from small aggregate queries instead of from the
+response body:
+
+- finances: Max(updated_at), Sum(version), Count and Sum(pk); every ledger
+  write bumps Finance.version and updated_at, and membership changes alter
+  the count and id sum
+- members: a hash of the member columns the responses show
+
+When the client's If-None-Match still matches, the view returns 304 without
+running its query or serializer.
+
+No Last-Modified header is sent: responses also depend on membership,
+exchange rates and the query string, which no single timestamp covers, so
+If-Modified-Since alone could be answered with a stale 304.
+"""
+
+import hashlib
+
+from django.db.models import Count, Max, Sum
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+
+from .models import Finance, User
+
+
+class Validators:
+    def __init__(self, *parts):
+        self.parts = parts
+        digest = hashlib.sha1('|'.join(str(part) for part in parts).encode()).hexdigest()[:20]
+        # Weak: equal validators mean semantically equal bodies, not byte-identical ones
+        self.etag = 'W/' + quote_etag(digest)
+
+
+def finance_parts(finances):
+    """Validator parts of a set of finances (one query)"""
+    agg = finances.aggregate(modified=Max('updated_at'), version=Sum('version'), count=Count('pk'), ids=Sum('pk'))
+    return agg['count'], agg['ids'], agg['version'], agg['modified']
+
+
+def member_parts(family_id):
+    """Fingerprint of what member listings show (one query)"""
+    rows = User.objects.filter(family_id=family_id).order_by('pk').values_list(
+        'pk', 'username', 'email', 'age', 'role_id', 'role__role_name', 'family__family_name'
+    )
+    return (hashlib.sha1(repr(list(rows)).encode()).hexdigest(),)
+
+
+def family_validators(scope, family_id, include_finances=True, include_members=True, extra=()):
+    """`extra` parts are for whatever else the response depends on"""
+    parts = [scope, family_id, *extra]
+    if include_finances:
+        parts.extend(finance_parts(Finance.objects.filter(user__family_id=family_id)))
+    if include_members:
+        parts.extend(member_parts(family_id))
+    return Validators(*parts)
+
+
+def respond(request, validators, build):
+    """304 if the client's copy is current, else build() with validators attached"""
+    if request.GET:
+        # ?fields=/?expand= and friends change the body, so they are part of the entity tag
+        validators = Validators(*validators.parts, request.GET.urlencode())
+    not_modified = get_conditional_response(request, etag=validators.etag)
+    response = not_modified if not_modified is not None else build()
+    response['ETag'] = validators.etag
+    # Responses are per user; make clients revalidate instead of reusing blindly
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
@@ -0,0 +1,102 @@
+"""
+Duplicate transaction detection.
+
+Double-submitted forms and overlapping bank imports store the same
+transaction twice. Every transaction carries a fingerprint: a 64-bit hash of
+its finance, type, amount and currency, local calendar day and normalized
+description (case-folded words, punctuation and spacing dropped). Two rows
+with the same fingerprint are suspected duplicates.
+
+The fingerprint is computed in Python on every write: Transaction.save()
+and the transaction queryset's bulk_create() fill it in, and the bulk
+update endpoint recomputes it when it changes descriptions (`refresh()`).
+It is indexed together with the finance, so
+
+- checking a batch of new rows against stored ones is one indexed lookup
+  (`matches()`), and
+- listing suspected duplicate groups of a user's finances reads only the
+  index (`groups()`), instead of scanning and comparing every transaction.
+"""
+
+import hashlib
+import re
+from datetime import datetime
+
+from django.utils import timezone
+
+from .money import to_cents
+
+_WORD = re.compile(r'\w+')
+
+
+def normalize(description):
+    """Case-folded words of a description, single-spaced"""
+    return ' '.join(_WORD.findall((description or '').casefold()))
+
+
+def fingerprint(finance_id, type, amount, currency, date, description) -> str:
+    """16 hex digits identifying a transaction up to its time of day and description formatting"""
+    if isinstance(date, datetime):
+        date = timezone.localdate(date) if timezone.is_aware(date) else date.date()
+    key = f'{finance_id}|{type}|{to_cents(amount)}|{currency}|{date.isoformat()}|{normalize(description)}'
+    return hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+
+
+def matches(transactions):
+    """Ids of stored transactions each of `transactions` duplicates, in input order.
+
+    One query for the whole batch. Rows of the batch are only compared with
+    stored rows, not with each other: one statement may well list two
+    identical purchases.
+    """
+    from .models import Transaction
+    for t in transactions:
+        t.fingerprint = t.compute_fingerprint()
+    if not transactions:
+        return []
+    existing = {}
+    for key, pk in (
+        Transaction.objects.filter(
+            finance_id__in={t.finance_id for t in transactions},
+            fingerprint__in={t.fingerprint for t in transactions},
+        )
+        .order_by('pk')
+        .values_list('fingerprint', 'transaction_id')
+    ):
+        existing.setdefault(key, []).append(pk)
+    return [existing.get(t.fingerprint, []) for t in transactions]
+
+
+def refresh(rows, description):
+    """Recompute fingerprints of stored rows (dicts with LEDGER_FIELDS) given their new `description`"""
+    from .models import Transaction
+    Transaction.objects.bulk_update(
+        [
+            Transaction(transaction_id=row['transaction_id'], fingerprint=fingerprint(
+                row['finance_id'], row['type'], row['amount'], row['currency'], row['date'], description,
+            ))
+            for row in rows
+        ],
+        ['fingerprint'],
+        batch_size=500,
+    )
+
+
+def groups(finances, limit, offset=0):
+    """(number of groups, page of (fingerprint, size) pairs) of suspected duplicates in `finances`.
+
+    Groups are newest first by their most recently created transaction.
+    Counting, grouping and ordering read the (finance, fingerprint) index
+    only; rows are not touched.
+    """
+    from django.db.models import Count, Max
+    from .models import Transaction
+    grouped = (
+        Transaction.objects.filter(finance__in=finances)
+        .exclude(fingerprint='')
+        .values('fingerprint')
+        .annotate(size=Count('pk'), newest=Max('pk'))
+        .filter(size__gt=1)
+    )
+    page = grouped.order_by('-newest')[offset:offset + limit]
+    return grouped.count(), [(group['fingerprint'], group['size']) for group in page]
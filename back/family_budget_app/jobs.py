@@ -0,0 +1,124 @@
+"""
+Background jobs for expensive AI and report computations.
+
+Views call `enqueue()` instead of computing inline and hand the job id back
+to the client, which polls GET /api/jobs/<id>/ (optionally waiting a few
+seconds with ?wait=<seconds>). `python manage.py run_jobs` starts a worker
+that claims pending jobs from the Job table and runs the handler registered
+for their kind.
+
+An identical request (same user, kind and params) made while a job is still
+pending or running returns that job instead of queueing a second one; a
+partial unique constraint on `params_hash` keeps concurrent requests from
+both queueing it.
+
+A failed job's traceback goes to the `family_budget_app.jobs` log; the job
+itself only records a short message that is safe to show to clients.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import socket
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger('family_budget_app.jobs')
+
+# Stored on failed jobs and shown to clients; details are only logged
+FAILED_MESSAGE = 'The computation failed. The error has been logged.'
+
+# kind -> function(user, **params) returning a JSON-serializable result
+HANDLERS = {}
+
+
+def handler(kind):
+    def register(func):
+        HANDLERS[kind] = func
+        return func
+    return register
+
+
+def params_hash(kind, user_id, params):
+    payload = json.dumps([kind, user_id, params], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def enqueue(user, kind, params=None):
+    """Queue a job, or return the identical one that is already pending/running"""
+    if kind not in HANDLERS:
+        raise ValueError(f'Unknown job kind {kind!r}')
+    params = params or {}
+    digest = params_hash(kind, user.pk, params)
+    while True:
+        existing = Job.objects.filter(params_hash=digest, status__in=Job.ACTIVE_STATUSES).first()
+        if existing:
+            return existing
+        try:
+            with transaction.atomic():
+                return Job.objects.create(user=user, kind=kind, params=params, params_hash=digest)
+        except IntegrityError:
+            # A concurrent identical request queued it first; return that job
+            continue
+
+
+def worker_name():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def claim_next(worker):
+    """Atomically move the oldest pending job to running; None if the queue is empty.
+
+    The conditional UPDATE makes the claim safe with several workers: only
+    one of them sees a row count of 1 for a given job.
+    """
+    while True:
+        job_id = (
+            Job.objects.filter(status='pending').order_by('created_at', 'job_id')
+            .values_list('job_id', flat=True).first()
+        )
+        if job_id is None:
+            return None
+        claimed = Job.objects.filter(job_id=job_id, status='pending').update(
+            status='running', worker=worker, started_at=timezone.now()
+        )
+        if claimed:
+            return Job.objects.select_related('user', 'user__role').get(job_id=job_id)
+
+
+def run(job):
+    """Execute a claimed job and store its result or error"""
+    try:
+        result = HANDLERS[job.kind](job.user, **job.params)
+    except Exception:
+        logger.exception('Job %s (%s) failed', job.pk, job.kind)
+        Job.objects.filter(pk=job.pk).update(status='failed', error=FAILED_MESSAGE, finished_at=timezone.now())
+        return False
+    job.result = result
+    job.status = 'done'
+    job.finished_at = timezone.now()
+    job.save(update_fields=['result', 'status', 'finished_at'])
+    return True
+
+
+def requeue_stale(older_than):
+    """Return jobs stuck in 'running' (e.g. their worker died) to the queue"""
+    return Job.objects.filter(status='running', started_at__lt=timezone.now() - older_than).update(
+        status='pending', worker='', started_at=None
+    )
+
+
+def _snapshot_handler(kind):
+    def run(user, **params):
+        # Computing through the snapshot store also refreshes what dashboards read
+        from . import snapshots
+        return snapshots.read(user, kind, params).payload
+    return run
+
+
+for _kind in ('ai.analyze', 'ai.predict', 'ai.forecast', 'ai.recommendations', 'ai.anomalies'):
+    handler(_kind)(_snapshot_handler(_kind))
@@ -0,0 +1,162 @@
+"""
+Set-based bookkeeping for bulk transaction writes.
+
+Transaction.save/delete keep Finance totals, goal progress and category
+budget counters up to date one row at a time. Bulk paths (bulk_create, queryset update/delete) bypass
+those hooks, so they call `apply_transactions()` with the affected rows:
+deltas are aggregated in Python and written with a single UPDATE per table.
+Like the per-row hooks, finance totals move in each finance's currency and
+goal/budget counters in the base currency (see rates.py).
+"""
+
+from collections import defaultdict
+from decimal import Decimal
+
+from django.conf import settings
+from django.db.models import Case, F, Sum, Value, When
+from django.utils import timezone
+
+from . import money
+from .models import CategoryBudget, Finance, Goal, Transaction
+from .rates import cache, converted
+
+# Fields a row needs for apply_transactions(); use with .values(*LEDGER_FIELDS)
+LEDGER_FIELDS = ('finance_id', 'amount', 'currency', 'type', 'goal_id', 'category_id', 'date')
+
+MONEY = money.MoneyField()
+
+
+def _row_value(row, name):
+    return row[name] if isinstance(row, dict) else getattr(row, name)
+
+
+def _delta_case(deltas):
+    """CASE pk WHEN ... THEN delta ... ELSE 0 END"""
+    return Case(
+        *[When(pk=pk, then=money.value(delta)) for pk, delta in deltas.items()],
+        default=money.value(0),
+        output_field=MONEY,
+    )
+
+
+def apply_transactions(rows, sign=1):
+    """Add (sign=1) or reverse (sign=-1) the effect of `rows` on totals.
+
+    `rows` are Transaction instances or dicts with LEDGER_FIELDS.
+    """
+    rows = list(rows)
+    # finance_id -> (currency, family_id), one query for every finance touched
+    finance_info = {
+        pk: (currency, family_id)
+        for pk, currency, family_id in Finance.objects.filter(
+            pk__in={_row_value(row, 'finance_id') for row in rows}
+        ).values_list('pk', 'currency', 'user__family_id')
+    }
+    base = settings.BASE_CURRENCY
+    # finance_id -> [income delta, expenses delta]
+    finances = defaultdict(lambda: [Decimal('0'), Decimal('0')])
+    goals = defaultdict(Decimal)
+    # (finance_id, category_id, month) -> spent delta
+    spending = defaultdict(Decimal)
+    for row in rows:
+        amount = Decimal(str(_row_value(row, 'amount'))) * sign
+        currency = _row_value(row, 'currency')
+        date = _row_value(row, 'date')
+        finance_id = _row_value(row, 'finance_id')
+        finance_currency = finance_info.get(finance_id, (base, None))[0]
+        finance_amount = cache.convert(amount, currency, finance_currency, date)
+        base_amount = cache.convert(amount, currency, base, date)
+        if _row_value(row, 'type') == 'income':
+            finances[finance_id][0] += finance_amount
+        else:
+            finances[finance_id][1] += finance_amount
+            category_id = _row_value(row, 'category_id')
+            if category_id:
+                month = timezone.localdate(date).replace(day=1)
+                spending[(finance_id, category_id, month)] += base_amount
+        goal_id = _row_value(row, 'goal_id')
+        if goal_id:
+            # Income tagged with a goal withdraws from it (see models.contributed)
+            goals[goal_id] += -base_amount if _row_value(row, 'type') == 'income' else base_amount
+
+    if finances:
+        income_delta = _delta_case({pk: deltas[0] for pk, deltas in finances.items()})
+        expenses_delta = _delta_case({pk: deltas[1] for pk, deltas in finances.items()})
+        Finance.objects.filter(pk__in=list(finances)).update(
+            income=F('income') + income_delta,
+            expenses=F('expenses') + expenses_delta,
+            balance=F('income') + income_delta - F('expenses') - expenses_delta,
+            version=F('version') + 1,
+            updated_at=timezone.now(),
+        )
+    if goals:
+        Goal.objects.filter(pk__in=list(goals)).update(
+            current_amount=F('current_amount') + _delta_case(goals)
+        )
+    if spending:
+        _apply_budget_spending(spending, {pk: info[1] for pk, info in finance_info.items()})
+
+
+def _apply_budget_spending(spending, family_of):
+    """Fold per-finance spending into family CategoryBudget counters"""
+    by_family = defaultdict(Decimal)
+    for (finance_id, category_id, month), amount in spending.items():
+        if family_of.get(finance_id):
+            by_family[(family_of[finance_id], category_id, month)] += amount
+    if not by_family:
+        return
+    budgets = {}
+    for pk, family_id, category_id, month in CategoryBudget.objects.filter(
+        family_id__in={key[0] for key in by_family},
+        category_id__in={key[1] for key in by_family},
+        month__in={key[2] for key in by_family},
+    ).values_list('pk', 'family_id', 'category_id', 'month'):
+        if (family_id, category_id, month) in by_family:
+            budgets[pk] = by_family[(family_id, category_id, month)]
+    if budgets:
+        CategoryBudget.objects.filter(pk__in=list(budgets)).update(spent=F('spent') + _delta_case(budgets))
+
+
+def ledger_totals(finance_ids):
+    """True {finance_id: (income, expenses)} in each finance's currency, summed in one grouped query"""
+    amount = converted(to_field='finance__currency')
+    totals = (
+        Transaction.objects.filter(finance_id__in=finance_ids)
+        .values('finance_id')
+        .annotate(
+            income=Sum(Case(When(type='income', then=amount), default=Value(0), output_field=MONEY)),
+            expenses=Sum(Case(When(type='expense', then=amount), default=Value(0), output_field=MONEY)),
+        )
+        .order_by()
+        .values_list('finance_id', 'income', 'expenses')
+    )
+    # Integer sums of cents: exact, already Decimal
+    return {
+        finance_id: (income or Decimal('0'), expenses or Decimal('0'))
+        for finance_id, income, expenses in totals
+    }
+
+
+def tag_goals(transactions):
+    """Bulk counterpart of Transaction._resolve_goal for unsaved instances"""
+    pending = [t for t in transactions if not t.goal_id and t.category_id]
+    if not pending:
+        return
+    earliest = min(t.date for t in pending)
+    goals = defaultdict(list)
+    for goal_id, category_id, deadline, finance_id in (
+        Goal.objects.filter(
+            category_id__in={t.category_id for t in pending},
+            family__members__finance__in={t.finance_id for t in pending},
+            deadline__gte=timezone.localdate(earliest),
+        )
+        .order_by('deadline')
+        .values_list('goal_id', 'category_id', 'deadline', 'family__members__finance')
+    ):
+        goals[(finance_id, category_id)].append((deadline, goal_id))
+    for t in pending:
+        day = timezone.localdate(t.date)
+        for deadline, goal_id in goals.get((t.finance_id, t.category_id), ()):
+            if deadline >= day:
+                t.goal_id = goal_id
+                break
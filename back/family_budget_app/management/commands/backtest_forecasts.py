@@ -0,0 +1,70 @@
+import json
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from family_budget_app import forecasting
+from family_budget_app.ai_service import FamilyBudgetAIService
+from family_budget_app.models import Family
+
+
+class Command(BaseCommand):
+    help = ('Backtest the forecasting engine on families\' monthly per-category expenses: rolling-origin '
+            'accuracy against naive and linear baselines, interval coverage and runtime per forecast')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--family', type=int, action='append', help='Family id (repeatable; default: all)')
+        parser.add_argument('--limit', type=int, default=100, help='At most this many families (default: 100)')
+        parser.add_argument('--horizon', type=int, default=3, help='Months forecast per fold (default: 3)')
+        parser.add_argument('--folds', type=int, default=4, help='Forecast origins per family (default: 4)')
+        parser.add_argument('--level', type=float, default=forecasting.DEFAULT_LEVEL,
+                            help='Prediction interval level (default: 0.8)')
+        parser.add_argument('--json', action='store_true', help='Print per-family results as JSON lines')
+
+    def handle(self, *args, **options):
+        if options['level'] not in forecasting.Z:
+            raise CommandError(f'--level must be one of {sorted(forecasting.Z)}')
+        if options['horizon'] < 1 or options['folds'] < 1:
+            raise CommandError('--horizon and --folds must be positive')
+        family_ids = options['family'] or list(
+            Family.objects.order_by('family_id').values_list('family_id', flat=True)[:options['limit']]
+        )
+
+        results = []
+        for family_id, service in FamilyBudgetAIService.for_families(family_ids):
+            if service.n_months < forecasting.MIN_MONTHS + options['horizon']:
+                continue
+            # Same series GET /api/ai/forecast/ forecasts: every category's monthly expenses
+            series = service.category_expenses()
+            series = series[series.sum(axis=1) > 0]
+            if not len(series):
+                continue
+            result = {'family_id': family_id, **forecasting.backtest(
+                series, options['horizon'], options['folds'], options['level']
+            )}
+            results.append(result)
+            if options['json']:
+                self.stdout.write(json.dumps(result))
+
+        if not results:
+            self.stdout.write(self.style.WARNING('No family has enough history to backtest'))
+            return
+        # Averages weighted by series count, so large families count for what they forecast
+        weights = np.array([r['series'] for r in results], dtype=np.float64)
+        self.stdout.write(
+            f'{len(results)} families, {int(weights.sum())} series, '
+            f'horizon {options["horizon"]} x {options["folds"]} folds'
+        )
+        for name in ('holt_winters', 'naive', 'linear'):
+            mae, rmse, smape = (
+                np.average([r['accuracy'][name][metric] for r in results], weights=weights)
+                for metric in ('mae', 'rmse', 'smape')
+            )
+            self.stdout.write(f'  {name:<13} MAE {mae:12.2f}  RMSE {rmse:12.2f}  sMAPE {smape:6.1f}%')
+        coverage = np.average([r['interval_coverage'] for r in results], weights=weights)
+        per_forecast = np.mean([r['seconds_per_forecast'] for r in results])
+        per_series = np.average([r['seconds_per_series'] for r in results], weights=weights)
+        self.stdout.write(self.style.SUCCESS(
+            f'{options["level"]:.0%} interval coverage {coverage:.1%}; '
+            f'{per_forecast * 1000:.2f} ms per batched forecast, {per_series * 1e6:.1f} us per series'
+        ))
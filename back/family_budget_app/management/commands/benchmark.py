@@ -0,0 +1,86 @@
+import fnmatch
+import json
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from family_budget_app import benchmarks
+
+
+def _int_list(value):
+    return [int(part) for part in value.split(',') if part]
+
+
+class Command(BaseCommand):
+    help = ('Run the API/ORM/AI benchmark suite against synthetic data in a throwaway test database '
+            'and optionally compare with a previous JSON result')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--members', type=_int_list, default=[1, 10, 100],
+                            help='Comma-separated family sizes (default: 1,10,100)')
+        parser.add_argument('--transactions', type=_int_list, default=[1000, 100000, 1000000],
+                            help='Comma-separated transaction counts (default: 1000,100000,1000000)')
+        parser.add_argument('--cases', default='*',
+                            help='Glob of case names to run, e.g. "api.*" (default: all)')
+        parser.add_argument('--rounds', type=int, default=5)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help='Write results as JSON to this file')
+        parser.add_argument('--compare', help='Baseline JSON file to compare against')
+        parser.add_argument('--threshold', type=float, default=0.10,
+                            help='Relative slowdown of the median reported as a regression (default: 0.10)')
+        parser.add_argument('--list', action='store_true', help='List available cases and exit')
+
+    def handle(self, *args, **options):
+        if options['list']:
+            for name in benchmarks.CASES:
+                self.stdout.write(name)
+            return
+
+        cases = {name: func for name, func in benchmarks.CASES.items()
+                 if fnmatch.fnmatch(name, options['cases'])}
+        if not cases:
+            raise CommandError(f"No benchmark cases match {options['cases']!r}")
+
+        # Every large-scenario request would otherwise end up in the slow-request log
+        logging.getLogger('family_budget_app.performance').setLevel(logging.ERROR)
+
+        # Never touch the configured database: build a fresh test DB instead
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            report = {'environment': benchmarks.environment(), 'results': []}
+            for members in options['members']:
+                for transactions in options['transactions']:
+                    self.stdout.write(f'Building scenario: {members} members, {transactions} transactions...')
+                    scenario = benchmarks.Scenario(members, transactions, seed=options['seed'])
+                    for name, func in cases.items():
+                        stats = benchmarks.measure(func, scenario, options['rounds'])
+                        report['results'].append({
+                            'case': name, 'members': members, 'transactions': transactions, **stats,
+                        })
+                        self.stdout.write(
+                            f"  {name:<32} median {stats['median'] * 1000:10.2f} ms"
+                            f"  (min {stats['min'] * 1000:.2f}, stdev {stats['stdev'] * 1000:.2f})"
+                        )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as fh:
+                json.dump(report, fh, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+
+        if options['compare']:
+            with open(options['compare'], encoding='utf-8') as fh:
+                baseline = json.load(fh)
+            rows = benchmarks.compare(baseline, report, options['threshold'])
+            regressions = [row for row in rows if row['regression']]
+            self.stdout.write(f"\nComparison with {options['compare']}:")
+            for row in rows:
+                line = (f"  {row['case']:<32} {row['members']:>4}m {row['transactions']:>8}t  "
+                        f"{row['baseline_median'] * 1000:10.2f} -> {row['median'] * 1000:10.2f} ms  "
+                        f"x{row['ratio']:.2f}")
+                self.stdout.write(self.style.ERROR(line) if row['regression'] else line)
+            if regressions:
+                raise CommandError(f'{len(regressions)} benchmark(s) regressed by more than '
+                                   f"{options['threshold']:.0%}")
@@ -0,0 +1,91 @@
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils import timezone
+
+from family_budget_app import analytics, snapshots
+from family_budget_app.models import AnalyticsSnapshot, Family
+
+
+class Command(BaseCommand):
+    help = ('Precompute analysis, forecasts and anomalies for every family into AnalyticsSnapshot, '
+            'sharding families across a process pool')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help='Worker processes (default: CPU count; 1 runs in-process)')
+        parser.add_argument('--shard-size', type=int, default=200, help='Families per shard (default: 200)')
+        parser.add_argument('--resume', action='store_true',
+                            help='Skip families whose snapshot was already computed since --since')
+        parser.add_argument('--since', help='ISO datetime for --resume (default: start of today)')
+
+    def handle(self, *args, **options):
+        if options['workers'] < 1 or options['shard_size'] < 1:
+            raise CommandError('--workers and --shard-size must be positive')
+
+        families = Family.objects.order_by('family_id')
+        if options['resume']:
+            since = self._since(options['since'])
+            done = AnalyticsSnapshot.objects.filter(
+                kind=analytics.SNAPSHOT_KIND,
+                params_hash=snapshots.params_hash(analytics.SNAPSHOT_PARAMS),
+                family__isnull=False,
+                computed_at__gte=since,
+            )
+            families = families.exclude(family_id__in=done.values('family_id'))
+        family_ids = list(families.values_list('family_id', flat=True))
+        size = options['shard_size']
+        shards = [family_ids[i:i + size] for i in range(0, len(family_ids), size)]
+        self.stdout.write(f'{len(family_ids)} families in {len(shards)} shards, {options["workers"]} worker(s)')
+        if not shards:
+            return
+
+        started = time.perf_counter()
+        per_worker = defaultdict(lambda: {'shards': 0, 'families': 0, 'transactions': 0, 'seconds': 0.0})
+        for i, stats in enumerate(self._run(shards, options['workers']), 1):
+            worker = per_worker[stats['pid']]
+            worker['shards'] += 1
+            for key in ('families', 'transactions', 'seconds'):
+                worker[key] += stats[key]
+            self.stdout.write(f"  shard {i}/{len(shards)}: {stats['families']} families "
+                              f"in {stats['seconds']:.2f}s (pid {stats['pid']})")
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write('\nPer worker:')
+        for pid, worker in sorted(per_worker.items()):
+            busy = max(worker['seconds'], 1e-9)
+            self.stdout.write(
+                f"  pid {pid}: {worker['shards']} shards, {worker['families']} families, "
+                f"{worker['transactions']} transactions, {worker['families'] / busy:.1f} families/s, "
+                f"{worker['transactions'] / busy:.0f} transactions/s"
+            )
+        total = sum(worker['families'] for worker in per_worker.values())
+        self.stdout.write(self.style.SUCCESS(
+            f'Computed {total} snapshots in {elapsed:.1f}s ({total / max(elapsed, 1e-9):.1f} families/s)'
+        ))
+
+    def _since(self, value):
+        if not value:
+            return timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+        try:
+            since = datetime.fromisoformat(value)
+        except ValueError:
+            raise CommandError(f'Invalid --since {value!r}; expected an ISO datetime')
+        return timezone.make_aware(since) if timezone.is_naive(since) else since
+
+    def _run(self, shards, workers):
+        if workers == 1:
+            for shard in shards:
+                yield analytics.compute_shard(shard)
+            return
+        # Children must open their own connections rather than reuse ours
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=workers, initializer=analytics.init_worker) as pool:
+            futures = [pool.submit(analytics.compute_shard, shard) for shard in shards]
+            for future in as_completed(futures):
+                yield future.result()
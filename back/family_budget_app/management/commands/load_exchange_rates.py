@@ -0,0 +1,66 @@
+import csv
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from family_budget_app.models import CURRENCY_CHOICES, ExchangeRate
+from family_budget_app.rates import cache
+
+RATE_PLACES = Decimal('0.00000001')
+
+
+class Command(BaseCommand):
+    help = ('Load daily exchange rates from a CSV file with columns date,from,to,rate '
+            '(1 `from` = `rate` `to`). Rates out of the base currency are stored inverted; '
+            'existing rates of the same pair and day are replaced')
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV file; a header row is optional')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per upsert (default: 1000)')
+
+    def handle(self, *args, **options):
+        base = settings.BASE_CURRENCY
+        known = {code for code, _ in CURRENCY_CHOICES}
+        rates, skipped = {}, 0
+        with open(options['path'], newline='') as handle:
+            for line, row in enumerate(csv.reader(handle), start=1):
+                if not row or (line == 1 and row[0].strip().lower() == 'date'):
+                    continue
+                try:
+                    day = datetime.strptime(row[0].strip(), '%Y-%m-%d').date()
+                    source, target = row[1].strip().upper(), row[2].strip().upper()
+                    rate = Decimal(row[3].strip())
+                except (IndexError, ValueError, InvalidOperation):
+                    raise CommandError(f'Line {line}: expected date,from,to,rate, got {row!r}')
+                if rate <= 0 or source not in known or target not in known:
+                    raise CommandError(f'Line {line}: unknown currency or non-positive rate in {row!r}')
+                # Conversions only need every currency's rate to the base currency
+                if source == base and target != base:
+                    source, target, rate = target, base, 1 / rate
+                elif target != base or source == base:
+                    skipped += 1
+                    continue
+                # A later line for the same pair and day wins
+                rates[(source, day)] = rate.quantize(RATE_PLACES)
+
+        objs = [
+            ExchangeRate(date=day, from_currency=currency, to_currency=base, rate=rate)
+            for (currency, day), rate in rates.items()
+        ]
+        with transaction.atomic():
+            for start in range(0, len(objs), options['batch_size']):
+                ExchangeRate.objects.bulk_create(
+                    objs[start:start + options['batch_size']],
+                    update_conflicts=True,
+                    unique_fields=['from_currency', 'to_currency', 'date'],
+                    update_fields=['rate'],
+                )
+        # Other processes pick the new rates up within EXCHANGE_RATE_CACHE_SECONDS
+        cache.clear()
+        self.stdout.write(self.style.SUCCESS(
+            f'Loaded {len(objs)} rates to {base} for {len({c for c, _ in rates})} currencies'
+            + (f', skipped {skipped} rows between two other currencies' if skipped else '')
+        ))
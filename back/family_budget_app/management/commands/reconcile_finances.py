@@ -0,0 +1,74 @@
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from family_budget_app.ledger import ledger_totals
+from family_budget_app.models import Finance
+
+
+class Command(BaseCommand):
+    help = ('Recompute Finance income/expenses/balance from the transaction ledger, '
+            'report discrepancies and repair them in bulk')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Finances per chunk (default: 1000)')
+        parser.add_argument('--dry-run', action='store_true', help='Only report discrepancies')
+        parser.add_argument('--verbose-rows', type=int, default=20,
+                            help='How many discrepancies to print (default: 20)')
+
+    def handle(self, *args, **options):
+        zero = (Decimal('0'), Decimal('0'))
+        checked = drifted = 0
+        total_drift = Decimal('0')
+        last_pk = 0
+        while True:
+            # Keyset pagination: each chunk is an indexed range of finances plus
+            # one grouped aggregate over their transactions, so memory stays flat.
+            # The chunk is locked before its totals are read, so a transaction
+            # written meanwhile is either counted or applies its delta after the
+            # repair, never overwritten by stale absolute totals.
+            with transaction.atomic():
+                finances = list(
+                    Finance.objects.select_for_update().filter(pk__gt=last_pk).order_by('pk')
+                    .only('finance_id', 'income', 'expenses', 'balance', 'user_id')[:options['chunk_size']]
+                )
+                if not finances:
+                    break
+                last_pk = finances[-1].pk
+                checked += len(finances)
+                totals = ledger_totals([finance.pk for finance in finances])
+
+                repairs = []
+                for finance in finances:
+                    income, expenses = totals.get(finance.pk, zero)
+                    balance = income - expenses
+                    if (finance.income, finance.expenses, finance.balance) == (income, expenses, balance):
+                        continue
+                    drifted += 1
+                    total_drift += abs(Decimal(finance.balance) - balance)
+                    if drifted <= options['verbose_rows']:
+                        self.stdout.write(
+                            f'  finance {finance.pk} (user {finance.user_id}): '
+                            f'income {finance.income} -> {income}, expenses {finance.expenses} -> {expenses}, '
+                            f'balance {finance.balance} -> {balance}'
+                        )
+                    finance.income, finance.expenses, finance.balance = income, expenses, balance
+                    repairs.append(finance)
+
+                if repairs and not options['dry_run']:
+                    Finance.objects.bulk_update(repairs, ['income', 'expenses', 'balance'])
+                    # bulk_update() skips auto_now; stamp as ledger.apply_transactions() does
+                    Finance.objects.filter(pk__in=[finance.pk for finance in repairs]).update(
+                        version=F('version') + 1, updated_at=timezone.now()
+                    )
+
+        if drifted > options['verbose_rows']:
+            self.stdout.write(f'  ... and {drifted - options["verbose_rows"]} more')
+        action = 'found' if options['dry_run'] else 'repaired'
+        self.stdout.write(self.style.SUCCESS(
+            f'Checked {checked} finances, {action} {drifted} with drifted totals '
+            f'(total balance drift {total_drift})'
+        ))
@@ -0,0 +1,46 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from family_budget_app import jobs
+
+
+class Command(BaseCommand):
+    help = 'Run a background worker that executes queued AI/report jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Drain the queue and exit instead of polling')
+        parser.add_argument('--poll-interval', type=float, default=1.0,
+                            help='Seconds to sleep when the queue is empty (default: 1)')
+        parser.add_argument('--max-jobs', type=int, default=0, help='Exit after this many jobs (0 = no limit)')
+        parser.add_argument('--stale-after', type=int, default=600,
+                            help='Requeue jobs left running longer than this many seconds (default: 600)')
+
+    def handle(self, *args, **options):
+        worker = jobs.worker_name()
+        stale_after = timedelta(seconds=options['stale_after'])
+        processed = 0
+        self.stdout.write(f'Worker {worker} started')
+        try:
+            while not options['max_jobs'] or processed < options['max_jobs']:
+                close_old_connections()
+                requeued = jobs.requeue_stale(stale_after)
+                if requeued:
+                    self.stdout.write(self.style.WARNING(f'Requeued {requeued} stale job(s)'))
+                job = jobs.claim_next(worker)
+                if job is None:
+                    if options['once']:
+                        break
+                    time.sleep(options['poll_interval'])
+                    continue
+                started = time.perf_counter()
+                ok = jobs.run(job)
+                processed += 1
+                self.stdout.write(
+                    f"Job {job.job_id} {job.kind} {'done' if ok else 'failed'} in {time.perf_counter() - started:.2f}s"
+                )
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(f'Worker {worker} processed {processed} job(s)'))
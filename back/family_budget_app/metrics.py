@@ -0,0 +1,161 @@
+"""
+Per-endpoint performance metrics.
+
+PerformanceMetricsMiddleware (see middleware.py) records, for every request:
+- latency, as a histogram per route and method
+- ORM query count and total DB time (via connection.execute_wrapper)
+- time spent producing serializer `.data`
+- response size in bytes
+
+Metrics live in process memory and are exposed in Prometheus text format
+at the admin-only /metrics endpoint. With several workers each process
+reports its own numbers.
+"""
+
+import contextvars
+import functools
+import threading
+import time
+from collections import defaultdict
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+# Stats of the request currently being handled (None outside requests)
+current_request = contextvars.ContextVar('current_request_stats', default=None)
+
+
+class RequestStats:
+    """Counters collected while a single request is being handled"""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self._in_serializer = False
+
+    def db_wrapper(self, execute, sql, params, many, context):
+        """connection.execute_wrapper hook counting queries and DB time"""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.queries += 1
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+
+class MetricsRegistry:
+    """Thread-safe in-process store of per-route request metrics"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.latency = defaultdict(lambda: Histogram(LATENCY_BUCKETS))
+            self.query_counts = defaultdict(lambda: Histogram(QUERY_COUNT_BUCKETS))
+            self.requests = defaultdict(int)
+            self.db_seconds = defaultdict(float)
+            self.serializer_seconds = defaultdict(float)
+            self.response_bytes = defaultdict(int)
+
+    def observe(self, route, method, status, duration, stats, response_bytes):
+        key = (route, method)
+        with self._lock:
+            self.latency[key].observe(duration)
+            self.query_counts[key].observe(stats.queries)
+            self.requests[(route, method, str(status))] += 1
+            self.db_seconds[key] += stats.db_time
+            self.serializer_seconds[key] += stats.serializer_time
+            self.response_bytes[key] += response_bytes
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            _render_histogram(lines, 'http_request_duration_seconds',
+                              'Request latency by route.', self.latency)
+            _render_histogram(lines, 'http_request_db_queries',
+                              'ORM queries issued per request.', self.query_counts)
+            _render_counter(lines, 'http_requests_total', 'Requests handled.',
+                            self.requests, ('route', 'method', 'status'))
+            _render_counter(lines, 'http_request_db_seconds_total', 'Time spent in database queries.',
+                            self.db_seconds, ('route', 'method'))
+            _render_counter(lines, 'http_request_serializer_seconds_total', 'Time spent producing serializer data.',
+                            self.serializer_seconds, ('route', 'method'))
+            _render_counter(lines, 'http_response_bytes_total', 'Response body bytes sent.',
+                            self.response_bytes, ('route', 'method'))
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _render_counter(lines, name, help_text, values, label_names):
+    lines.append(f'# HELP {name} {help_text}')
+    lines.append(f'# TYPE {name} counter')
+    for key, value in sorted(values.items()):
+        lines.append(f'{name}{_labels(label_names, key)} {value}')
+
+
+def _render_histogram(lines, name, help_text, histograms):
+    lines.append(f'# HELP {name} {help_text}')
+    lines.append(f'# TYPE {name} histogram')
+    label_names = ('route', 'method')
+    for key, hist in sorted(histograms.items()):
+        for bound, count in zip(hist.buckets, hist.counts):
+            lines.append(f'{name}_bucket{_labels(label_names, key, [("le", bound)])} {count}')
+        lines.append(f'{name}_bucket{_labels(label_names, key, [("le", "+Inf")])} {hist.count}')
+        lines.append(f'{name}_sum{_labels(label_names, key)} {hist.sum}')
+        lines.append(f'{name}_count{_labels(label_names, key)} {hist.count}')
+
+
+registry = MetricsRegistry()
+
+
+def _timed_data(fget):
+    @functools.wraps(fget)
+    def data(self):
+        stats = current_request.get()
+        # Nested .data calls are already covered by the outermost one
+        if stats is None or stats._in_serializer:
+            return fget(self)
+        stats._in_serializer = True
+        start = time.perf_counter()
+        try:
+            return fget(self)
+        finally:
+            stats.serializer_time += time.perf_counter() - start
+            stats._in_serializer = False
+    data._metrics_timed = True
+    return data
+
+
+def install_serializer_timing():
+    """Time every DRF serializer's `.data` (called once from AppConfig.ready)"""
+    from rest_framework.serializers import BaseSerializer
+    if getattr(BaseSerializer.data.fget, '_metrics_timed', False):
+        return
+    BaseSerializer.data = property(_timed_data(BaseSerializer.data.fget))
@@ -0,0 +1,50 @@
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from .metrics import RequestStats, current_request, registry
+
+logger = logging.getLogger('family_budget_app.performance')
+
+
+class PerformanceMetricsMiddleware:
+    """Record latency, DB usage, serializer time and payload size per route.
+
+    Requests slower than settings.SLOW_REQUEST_THRESHOLD_MS are logged to the
+    `family_budget_app.performance` logger.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.slow_threshold = getattr(settings, 'SLOW_REQUEST_THRESHOLD_MS', 500) / 1000
+
+    def __call__(self, request):
+        stats = RequestStats()
+        token = current_request.set(stats)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(stats.db_wrapper))
+                response = self.get_response(request)
+        finally:
+            current_request.reset(token)
+        duration = time.perf_counter() - start
+
+        match = getattr(request, 'resolver_match', None)
+        route = match.view_name if match and match.view_name else 'unmatched'
+        response_bytes = 0 if response.streaming else len(response.content)
+        registry.observe(route, request.method, response.status_code, duration, stats, response_bytes)
+
+        if duration >= self.slow_threshold:
+            logger.warning(
+                'Slow request: %s %s (%s) took %.0f ms, %d queries / %.0f ms DB, '
+                '%.0f ms serializing, %d bytes, status %s',
+                request.method, request.get_full_path(), route, duration * 1000,
+                stats.queries, stats.db_time * 1000, stats.serializer_time * 1000,
+                response_bytes, response.status_code,
+            )
+        return response
@@ -0,0 +1,24 @@
+from django.db import migrations
+
+
+DEFAULT_ROLES = ('admin', 'family_member', 'kid', 'solo')
+
+
+def seed_roles(apps, schema_editor):
+    # Previously done in AppConfig.ready() on every process start
+    Role = apps.get_model('family_budget_app', 'Role')
+    existing = set(Role.objects.values_list('role_name', flat=True))
+    Role.objects.bulk_create(
+        [Role(role_name=name) for name in DEFAULT_ROLES if name not in existing]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('family_budget_app', '0002_family_join_code_invitation'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_roles, migrations.RunPython.noop),
+    ]
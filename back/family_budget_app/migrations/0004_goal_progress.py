@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-10-19 19:22
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('family_budget_app', '0003_seed_roles'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='goal',
+            name='category',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='goals', to='family_budget_app.category'),
+        ),
+        migrations.AddField(
+            model_name='transaction',
+            name='goal',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='contributions', to='family_budget_app.goal'),
+        ),
+        migrations.AddIndex(
+            model_name='goal',
+            index=models.Index(fields=['family', 'deadline'], name='family_budg_family__f240cf_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='goal',
+            index=models.Index(fields=['family', 'category'], name='family_budg_family__5f47ee_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.7 on 2026-10-19 19:26
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('family_budget_app', '0005_recurring_rule'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CategoryBudget',
+            fields=[
+                ('budget_id', models.AutoField(primary_key=True, serialize=False)),
+                ('month', models.DateField()),
+                ('limit', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('spent', models.DecimalField(decimal_places=2, default=0.0, max_digits=12)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='budgets', to='family_budget_app.category')),
+                ('family', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='budgets', to='family_budget_app.family')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='categorybudget',
+            constraint=models.UniqueConstraint(fields=('family', 'category', 'month'), name='unique_category_budget'),
+        ),
+    ]
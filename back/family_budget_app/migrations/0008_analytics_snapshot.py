@@ -0,0 +1,30 @@
+# Generated by Django 4.2.7 on 2026-10-19 19:34
+
+import django.core.serializers.json
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('family_budget_app', '0007_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnalyticsSnapshot',
+            fields=[
+                ('snapshot_id', models.AutoField(primary_key=True, serialize=False)),
+                ('kind', models.CharField(max_length=50)),
+                ('payload', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('computed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('family', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='analytics_snapshots', to='family_budget_app.family')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='analyticssnapshot',
+            constraint=models.UniqueConstraint(fields=('family', 'kind'), name='unique_analytics_snapshot'),
+        ),
+    ]
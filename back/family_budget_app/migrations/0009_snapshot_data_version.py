@@ -0,0 +1,66 @@
+# Generated by Django 4.2.7 on 2026-10-19 19:39
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def drop_snapshots(apps, schema_editor):
+    # Snapshots are a cache: rows from the (family, kind) keying carry no data
+    # version and would be recomputed anyway, so they are simply dropped.
+    apps.get_model('family_budget_app', 'AnalyticsSnapshot').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('family_budget_app', '0008_analytics_snapshot'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_snapshots, migrations.RunPython.noop),
+        migrations.RemoveConstraint(
+            model_name='analyticssnapshot',
+            name='unique_analytics_snapshot',
+        ),
+        migrations.AddField(
+            model_name='analyticssnapshot',
+            name='data_version',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='analyticssnapshot',
+            name='finance',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='analytics_snapshots', to='family_budget_app.finance'),
+        ),
+        migrations.AddField(
+            model_name='analyticssnapshot',
+            name='params',
+            field=models.JSONField(default=dict),
+        ),
+        migrations.AddField(
+            model_name='analyticssnapshot',
+            name='params_hash',
+            field=models.CharField(default='', max_length=64),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='analyticssnapshot',
+            name='scope_key',
+            field=models.CharField(default='', max_length=40),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='finance',
+            name='version',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='analyticssnapshot',
+            name='family',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='analytics_snapshots', to='family_budget_app.family'),
+        ),
+        migrations.AddConstraint(
+            model_name='analyticssnapshot',
+            constraint=models.UniqueConstraint(fields=('scope_key', 'kind', 'params_hash'), name='unique_analytics_snapshot'),
+        ),
+    ]
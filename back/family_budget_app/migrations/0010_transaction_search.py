@@ -0,0 +1,23 @@
+from django.db import migrations
+
+
+def install_search(apps, schema_editor):
+    # Builds the index over existing rows; see family_budget_app/search.py
+    from family_budget_app import search
+    search.install(schema_editor.connection)
+
+
+def uninstall_search(apps, schema_editor):
+    from family_budget_app import search
+    search.uninstall(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('family_budget_app', '0009_snapshot_data_version'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search, uninstall_search),
+    ]
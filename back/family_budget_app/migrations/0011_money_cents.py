@@ -0,0 +1,78 @@
+from django.db import migrations, models
+
+import family_budget_app.money
+
+# (model, field, max_digits, default) of every money column
+MONEY_FIELDS = [
+    ('finance', 'balance', 12, 0),
+    ('finance', 'income', 12, 0),
+    ('finance', 'expenses', 12, 0),
+    ('transaction', 'amount', 10, None),
+    ('recurringrule', 'amount', 10, None),
+    ('categorybudget', 'limit', 12, None),
+    ('categorybudget', 'spent', 12, 0),
+    ('goal', 'target_amount', 12, None),
+    ('goal', 'current_amount', 12, 0),
+]
+
+
+def to_cents(model_name, name):
+    # Decimal amounts -> integer cents, in one UPDATE per column
+    def forwards(apps, schema_editor):
+        model = apps.get_model('family_budget_app', model_name)
+        quote = schema_editor.quote_name
+        schema_editor.execute(
+            f'UPDATE {quote(model._meta.db_table)} '
+            f'SET {quote(name + "_cents")} = CAST(ROUND({quote(name)} * 100) AS BIGINT)'
+        )
+    return forwards
+
+
+def from_cents(model_name, name):
+    def backwards(apps, schema_editor):
+        model = apps.get_model('family_budget_app', model_name)
+        quote = schema_editor.quote_name
+        schema_editor.execute(
+            f'UPDATE {quote(model._meta.db_table)} SET {quote(name)} = {quote(name + "_cents")} / 100.0'
+        )
+    return backwards
+
+
+def convert(model_name, name, max_digits, default):
+    """Add <name>_cents, fill it from <name>, drop <name> and take over its name"""
+    field = family_budget_app.money.MoneyField(max_digits=max_digits, default=0 if default is None else default)
+    operations = [
+        migrations.AddField(
+            model_name=model_name,
+            name=f'{name}_cents',
+            field=field,
+            preserve_default=default is not None,
+        ),
+        migrations.RunPython(to_cents(model_name, name), from_cents(model_name, name)),
+    ]
+    if default is None:
+        # State only: lets a rollback re-add the decimal column to a non-empty table
+        operations.append(migrations.SeparateDatabaseAndState(state_operations=[
+            migrations.AlterField(
+                model_name=model_name,
+                name=name,
+                field=models.DecimalField(max_digits=max_digits, decimal_places=2, default=0),
+            ),
+        ]))
+    return operations + [
+        migrations.RemoveField(model_name=model_name, name=name),
+        migrations.RenameField(model_name=model_name, old_name=f'{name}_cents', new_name=name),
+    ]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('family_budget_app', '0010_transaction_search'),
+    ]
+
+    operations = [
+        operation
+        for model_name, name, max_digits, default in MONEY_FIELDS
+        for operation in convert(model_name, name, max_digits, default)
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.7 on 2026-10-19 20:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('family_budget_app', '0011_money_cents'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExchangeRate',
+            fields=[
+                ('rate_id', models.AutoField(primary_key=True, serialize=False)),
+                ('date', models.DateField()),
+                ('from_currency', models.CharField(choices=[('KZT', 'Kazakhstani tenge'), ('RUB', 'Russian ruble'), ('USD', 'US dollar'), ('EUR', 'Euro')], max_length=3)),
+                ('to_currency', models.CharField(choices=[('KZT', 'Kazakhstani tenge'), ('RUB', 'Russian ruble'), ('USD', 'US dollar'), ('EUR', 'Euro')], max_length=3)),
+                ('rate', models.DecimalField(decimal_places=8, max_digits=18)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='finance',
+            name='currency',
+            field=models.CharField(choices=[('KZT', 'Kazakhstani tenge'), ('RUB', 'Russian ruble'), ('USD', 'US dollar'), ('EUR', 'Euro')], default='KZT', max_length=3),
+        ),
+        migrations.AddField(
+            model_name='recurringrule',
+            name='currency',
+            field=models.CharField(choices=[('KZT', 'Kazakhstani tenge'), ('RUB', 'Russian ruble'), ('USD', 'US dollar'), ('EUR', 'Euro')], default='KZT', max_length=3),
+        ),
+        migrations.AddField(
+            model_name='transaction',
+            name='currency',
+            field=models.CharField(choices=[('KZT', 'Kazakhstani tenge'), ('RUB', 'Russian ruble'), ('USD', 'US dollar'), ('EUR', 'Euro')], default='KZT', max_length=3),
+        ),
+        migrations.AddConstraint(
+            model_name='exchangerate',
+            constraint=models.UniqueConstraint(fields=('from_currency', 'to_currency', 'date'), name='unique_exchange_rate'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.7 on 2026-10-19 20:14
+
+from django.db import migrations, models
+
+from family_budget_app.duplicates import fingerprint
+
+BATCH_SIZE = 2000
+
+
+def backfill_fingerprints(apps, schema_editor):
+    # Filled in before the index exists, in primary key batches
+    Transaction = apps.get_model('family_budget_app', 'Transaction')
+    last = 0
+    while True:
+        batch = list(
+            Transaction.objects.filter(pk__gt=last).order_by('pk').only(
+                'finance_id', 'type', 'amount', 'currency', 'date', 'description'
+            )[:BATCH_SIZE]
+        )
+        if not batch:
+            break
+        for t in batch:
+            t.fingerprint = fingerprint(t.finance_id, t.type, t.amount, t.currency, t.date, t.description)
+        Transaction.objects.bulk_update(batch, ['fingerprint'], batch_size=500)
+        last = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('family_budget_app', '0012_exchange_rates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transaction',
+            name='fingerprint',
+            field=models.CharField(default='', editable=False, max_length=16),
+        ),
+        migrations.RunPython(backfill_fingerprints, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['finance', 'fingerprint'], name='family_budg_finance_32f680_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+from family_budget_app.money import MoneyField, value
+from family_budget_app.rates import converted
+
+
+def recount_goals(apps, schema_editor):
+    # Income tagged with a goal used to add to its progress; it now withdraws from it
+    Goal = apps.get_model('family_budget_app', 'Goal')
+    Transaction = apps.get_model('family_budget_app', 'Transaction')
+    amount = converted()
+    total = (
+        Transaction.objects.filter(goal=models.OuterRef('pk'))
+        .order_by()
+        .values('goal')
+        .annotate(total=models.Sum(
+            models.Case(models.When(type='income', then=amount * -1), default=amount, output_field=MoneyField())
+        ))
+        .values('total')
+    )
+    Goal.objects.filter(pk__in=Transaction.objects.filter(type='income').values('goal')).update(
+        current_amount=Coalesce(models.Subquery(total, output_field=MoneyField()), value(0), output_field=MoneyField())
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('family_budget_app', '0013_transaction_fingerprint'),
+    ]
+
+    operations = [
+        migrations.RunPython(recount_goals, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-19 20:24
+
+from django.db import migrations, models
+
+FAILED_MESSAGE = 'The computation failed. The error has been logged.'
+
+
+def prepare_jobs(apps, schema_editor):
+    Job = apps.get_model('family_budget_app', 'Job')
+    # Keep the oldest active job of each hash; later duplicates could not have been queued
+    kept = set()
+    for pk, digest in (
+        Job.objects.filter(status__in=('pending', 'running')).order_by('job_id').values_list('pk', 'params_hash')
+    ):
+        if digest in kept:
+            Job.objects.filter(pk=pk).update(status='failed', error='Duplicate of an earlier job')
+        kept.add(digest)
+    # Tracebacks were stored and served to clients; they now only go to the log
+    Job.objects.filter(status='failed').exclude(error='Duplicate of an earlier job').update(error=FAILED_MESSAGE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('family_budget_app', '0014_goal_income_withdraws'),
+    ]
+
+    operations = [
+        migrations.RunPython(prepare_jobs, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='job',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ('pending', 'running'))), fields=('params_hash',), name='unique_active_job'),
+        ),
+    ]
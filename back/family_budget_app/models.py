@@ -1,8 +1,29 @@
+from django.conf import settings
 from django.db import models
+from django.db.models import F
+from django.db.models.functions import Cast, Coalesce
 from django.contrib.auth.models import AbstractUser
+from django.core.serializers.json import DjangoJSONEncoder
 from django.utils import timezone
+from datetime import timedelta
+import calendar
+from decimal import Decimal
+import math
 import uuid
 
+from .money import MoneyField
+from . import money
+from .duplicates import fingerprint
+from .rates import converted
+
+CURRENCY_CHOICES = [
+    ('KZT', 'Kazakhstani tenge'),
+    ('RUB', 'Russian ruble'),
+    ('USD', 'US dollar'),
+    ('EUR', 'Euro'),
+]
+
+
 class Role(models.Model):
     ROLE_CHOICES = [
         ('admin', 'Admin'),
@@ -16,6 +37,18 @@ class Role(models.Model):
     def __str__(self):
         return self.get_role_name_display()
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # Role lookups are served from an in-process cache; drop it on change
+        from .registry import roles
+        roles.clear()
+
+    def delete(self, *args, **kwargs):
+        from .registry import roles
+        result = super().delete(*args, **kwargs)
+        roles.clear()
+        return result
+
 
 class Family(models.Model):
     family_id = models.AutoField(primary_key=True)
@@ -52,10 +85,14 @@ class User(AbstractUser):
 class Finance(models.Model):
     finance_id = models.AutoField(primary_key=True)
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='finance')
-    balance = models.DecimalField(max_digits=12, decimal_places=2, default=0.00)
-    income = models.DecimalField(max_digits=12, decimal_places=2, default=0.00)
-    expenses = models.DecimalField(max_digits=12, decimal_places=2, default=0.00)
+    balance = MoneyField(max_digits=12, default=0)
+    income = MoneyField(max_digits=12, default=0)
+    expenses = MoneyField(max_digits=12, default=0)
+    # Currency the totals above are kept in; transactions default to it
+    currency = models.CharField(max_length=3, choices=CURRENCY_CHOICES, default=settings.BASE_CURRENCY)
     updated_at = models.DateTimeField(auto_now=True)
+    # Bumped on every ledger change; analytics snapshots store the version they were computed from
+    version = models.PositiveBigIntegerField(default=0)
 
     def update_balance(self):
         from decimal import Decimal
@@ -63,7 +100,10 @@ class Finance(models.Model):
         income = Decimal(str(self.income)) if self.income else Decimal('0')
         expenses = Decimal(str(self.expenses)) if self.expenses else Decimal('0')
         self.balance = income - expenses
+        self.version = F('version') + 1
         self.save()
+        # Drop the expression; the new value is reloaded on next access
+        del self.version
 
 class Category(models.Model):
     category_id = models.AutoField(primary_key=True)
@@ -72,6 +112,30 @@ class Category(models.Model):
     def __str__(self):
         return self.category_name
 
+def contributed(amount=None):
+    """SQL contribution of each tagged transaction to its goal, in the base currency.
+
+    Money set aside for a goal is filed as an expense under the goal's
+    category; income under it is money taken back out.
+    """
+    amount = converted() if amount is None else amount
+    return models.Case(models.When(type='income', then=amount * -1), default=amount, output_field=MoneyField())
+
+
+def _local_date(value):
+    """Calendar date of a (possibly aware) datetime in the current time zone"""
+    return timezone.localdate(value) if timezone.is_aware(value) else value.date()
+
+
+class TransactionQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        # bulk_create() skips save(), which fills in the fingerprint of single writes
+        objs = list(objs)
+        for obj in objs:
+            obj.fingerprint = obj.compute_fingerprint()
+        return super().bulk_create(objs, *args, **kwargs)
+
+
 class Transaction(models.Model):
     TRANSACTION_TYPES = [
         ('income', 'Income'),
@@ -80,51 +144,152 @@ class Transaction(models.Model):
 
     transaction_id = models.AutoField(primary_key=True)
     finance = models.ForeignKey(Finance, on_delete=models.CASCADE, related_name='transactions')
-    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    amount = MoneyField(max_digits=10)
+    # Currency `amount` is in; converted when it is added to totals in another currency
+    currency = models.CharField(max_length=3, choices=CURRENCY_CHOICES, default=settings.BASE_CURRENCY)
     category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True)
     type = models.CharField(max_length=10, choices=TRANSACTION_TYPES)
     date = models.DateTimeField(default=timezone.now)
     description = models.TextField(blank=True)
+    # Savings goal this transaction contributes to (set explicitly or
+    # auto-tagged from the goal's category, see _resolve_goal)
+    goal = models.ForeignKey('Goal', on_delete=models.SET_NULL, null=True, blank=True, related_name='contributions')
+    # Set when the transaction was materialized from a RecurringRule
+    recurring_rule = models.ForeignKey('RecurringRule', on_delete=models.SET_NULL, null=True, blank=True, related_name='occurrences')
+    # Hash of finance, type, amount, day and normalized description; equal
+    # fingerprints mark suspected duplicates (see duplicates.py)
+    fingerprint = models.CharField(max_length=16, default='', editable=False)
+
+    objects = TransactionQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['finance', 'fingerprint']),
+        ]
+        constraints = [
+            # A rule materializes each occurrence at most once (keeps the scheduler idempotent)
+            models.UniqueConstraint(
+                fields=['recurring_rule', 'date'],
+                condition=models.Q(recurring_rule__isnull=False),
+                name='unique_recurring_occurrence',
+            ),
+        ]
+
+    def _resolve_goal(self):
+        """Tag the transaction with the family goal linked to its category, if any"""
+        if self.goal_id or not self.category_id or not self.finance_id:
+            return
+        self.goal_id = (
+            Goal.objects.filter(
+                family__members__finance=self.finance_id,
+                category_id=self.category_id,
+                deadline__gte=_local_date(self.date),
+            )
+            .order_by('deadline')
+            .values_list('goal_id', flat=True)
+            .first()
+        )
+
+    def compute_fingerprint(self):
+        return fingerprint(self.finance_id, self.type, self.amount, self.currency, self.date, self.description)
+
+    def amount_in(self, currency):
+        """`amount` converted to `currency` at the rate of the transaction's day"""
+        from .rates import cache
+        return cache.convert(self.amount, self.currency, currency, self.date)
+
+    def goal_amount(self):
+        """What the transaction adds to its goal's progress, in the base currency (see contributed())"""
+        amount = self.amount_in(settings.BASE_CURRENCY)
+        return -amount if self.type == 'income' else amount
+
+    def _apply_goal_contribution(self, old_goal_id, old_amount):
+        """Incrementally move goal progress (in the base currency) from the old tagging to the new one"""
+        amount = self.goal_amount() if self.goal_id else None
+        if old_goal_id and old_goal_id == self.goal_id:
+            delta = amount - old_amount
+            if delta:
+                Goal.objects.filter(pk=self.goal_id).update(current_amount=F('current_amount') + money.value(delta))
+            return
+        if old_goal_id:
+            Goal.objects.filter(pk=old_goal_id).update(current_amount=F('current_amount') - money.value(old_amount))
+        if self.goal_id:
+            Goal.objects.filter(pk=self.goal_id).update(current_amount=F('current_amount') + money.value(amount))
+
+    def _budget_key(self):
+        """(finance, category, month) whose CategoryBudget this row counts against"""
+        if self.type != 'expense' or not self.category_id:
+            return None
+        return (self.finance_id, self.category_id, _local_date(self.date).replace(day=1))
+
+    def _apply_budget_spending(self, old):
+        """Incrementally move spending (in the base currency) between CategoryBudget counters"""
+        before = old._budget_key() if old else None
+        after = self._budget_key()
+        base = settings.BASE_CURRENCY
+        if before and before == after:
+            delta = self.amount_in(base) - old.amount_in(base)
+            if delta:
+                CategoryBudget.record(*after, delta)
+            return
+        if before:
+            CategoryBudget.record(*before, -old.amount_in(base))
+        if after:
+            CategoryBudget.record(*after, self.amount_in(base))
 
     def save(self, *args, **kwargs):
         # Determine whether this is a new record or an update
         is_new = self.pk is None
-        old_amount = None
+        old = None
         old_type = None
+        old_goal_id = None
         if not is_new:
             try:
                 old = Transaction.objects.get(pk=self.pk)
-                old_amount = old.amount
                 old_type = old.type
+                old_goal_id = old.goal_id
             except Transaction.DoesNotExist:
                 # treat as new if not found
                 is_new = True
+                old = None
+
+        self._resolve_goal()
+        self.fingerprint = self.compute_fingerprint()
+        # Fails before anything is written when no rate is known for the currency
+        self.amount_in(settings.BASE_CURRENCY)
 
         # Save the transaction first
         super().save(*args, **kwargs)
 
+        self._apply_goal_contribution(old_goal_id, old.goal_amount() if old_goal_id else None)
+        self._apply_budget_spending(old)
+
         # Ensure finance exists
         if not self.finance:
             return
 
+        # Finance totals are kept in the finance's currency
+        currency = self.finance.currency
+        amount = self.amount_in(currency)
         # Simple approach: on create, add amount to income/expenses; on update, adjust by difference
         if is_new:
             if self.type == 'income':
-                self.finance.income = (self.finance.income or 0) + self.amount
+                self.finance.income = (self.finance.income or 0) + amount
             else:
-                self.finance.expenses = (self.finance.expenses or 0) + self.amount
+                self.finance.expenses = (self.finance.expenses or 0) + amount
         else:
             # reverse old values then apply new ones
-            if old_amount is not None and old_type is not None:
+            if old is not None and old_type is not None:
+                old_amount = old.amount_in(currency)
                 if old_type == 'income':
                     self.finance.income = (self.finance.income or 0) - old_amount
                 else:
                     self.finance.expenses = (self.finance.expenses or 0) - old_amount
 
             if self.type == 'income':
-                self.finance.income = (self.finance.income or 0) + self.amount
+                self.finance.income = (self.finance.income or 0) + amount
             else:
-                self.finance.expenses = (self.finance.expenses or 0) + self.amount
+                self.finance.expenses = (self.finance.expenses or 0) + amount
 
         # Recompute balance and save
         self.finance.update_balance()
@@ -133,17 +298,171 @@ class Transaction(models.Model):
         # Before deleting, reverse the transaction effect on the related finance
         try:
             if self.finance:
+                amount = self.amount_in(self.finance.currency)
                 if self.type == 'income':
-                    self.finance.income = (self.finance.income or 0) - self.amount
+                    self.finance.income = (self.finance.income or 0) - amount
                 else:
-                    self.finance.expenses = (self.finance.expenses or 0) - self.amount
+                    self.finance.expenses = (self.finance.expenses or 0) - amount
                 self.finance.update_balance()
         except Exception:
             # If anything goes wrong, proceed with delete to avoid leaving stale DB state
             pass
+        base_amount = self.amount_in(settings.BASE_CURRENCY)
+        if self.goal_id:
+            Goal.objects.filter(pk=self.goal_id).update(current_amount=F('current_amount') - money.value(self.goal_amount()))
+        budget_key = self._budget_key()
+        if budget_key:
+            CategoryBudget.record(*budget_key, -base_amount)
         return super().delete(*args, **kwargs)
 
 
+def _add_months(value, months, day):
+    """Shift a datetime by whole months, clamping `day` to the month length"""
+    year, month = divmod(value.month - 1 + months, 12)
+    year += value.year
+    month += 1
+    return value.replace(year=year, month=month, day=min(day, calendar.monthrange(year, month)[1]))
+
+
+class RecurringRule(models.Model):
+    """Template for a transaction that repeats (salary, rent, subscriptions).
+
+    Occurrences are created by the `materialize_recurring` management command.
+    """
+    FREQUENCY_CHOICES = [
+        ('daily', 'Daily'),
+        ('weekly', 'Weekly'),
+        ('monthly', 'Monthly'),
+        ('yearly', 'Yearly'),
+    ]
+
+    rule_id = models.AutoField(primary_key=True)
+    finance = models.ForeignKey(Finance, on_delete=models.CASCADE, related_name='recurring_rules')
+    amount = MoneyField(max_digits=10)
+    currency = models.CharField(max_length=3, choices=CURRENCY_CHOICES, default=settings.BASE_CURRENCY)
+    category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, blank=True)
+    type = models.CharField(max_length=10, choices=Transaction.TRANSACTION_TYPES)
+    description = models.TextField(blank=True)
+    frequency = models.CharField(max_length=10, choices=FREQUENCY_CHOICES, default='monthly')
+    interval = models.PositiveSmallIntegerField(default=1)
+    start_date = models.DateTimeField(default=timezone.now)
+    end_date = models.DateTimeField(null=True, blank=True)
+    # Date of the next occurrence that hasn't been materialized yet
+    next_run = models.DateTimeField(null=True, blank=True)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['is_active', 'next_run']),
+        ]
+
+    def __str__(self):
+        return f"{self.description or self.type} every {self.interval} {self.frequency}"
+
+    # Changing any of these moves next_run onto the new schedule
+    SCHEDULE_FIELDS = ('start_date', 'frequency', 'interval')
+
+    def save(self, *args, **kwargs):
+        if self.next_run is None:
+            self.next_run = self.start_date
+        elif self.pk is not None:
+            old = RecurringRule.objects.filter(pk=self.pk).values(*self.SCHEDULE_FIELDS).first()
+            if old and any(old[name] != getattr(self, name) for name in self.SCHEDULE_FIELDS):
+                self.next_run = self.reschedule()
+        super().save(*args, **kwargs)
+
+    def reschedule(self):
+        """First occurrence of the current schedule after the last materialized one"""
+        last = self.occurrences.aggregate(last=models.Max('date'))['last']
+        when = self.start_date
+        while last is not None and when <= last:
+            when = self.advance(when)
+        return when
+
+    def advance(self, when):
+        """Return the occurrence that follows `when`"""
+        if self.frequency == 'daily':
+            return when + timedelta(days=self.interval)
+        if self.frequency == 'weekly':
+            return when + timedelta(weeks=self.interval)
+        # Monthly/yearly rules stay anchored to the start day (31st -> 28th -> 31st)
+        months = self.interval * (12 if self.frequency == 'yearly' else 1)
+        return _add_months(when, months, self.start_date.day)
+
+    def due_occurrences(self, until):
+        """Dates of occurrences due up to `until`, and the next_run after them"""
+        dates = []
+        when = self.next_run or self.start_date
+        while when <= until and (self.end_date is None or when <= self.end_date):
+            dates.append(when)
+            when = self.advance(when)
+        return dates, when
+
+
+class CategoryBudget(models.Model):
+    """Monthly spending limit for a category, shared by the whole family.
+
+    `spent` is a running counter maintained on every transaction write, so
+    over-budget checks never need to re-sum transactions.
+    """
+    budget_id = models.AutoField(primary_key=True)
+    family = models.ForeignKey(Family, on_delete=models.CASCADE, related_name='budgets')
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='budgets')
+    # First day of the budgeted month
+    month = models.DateField()
+    limit = MoneyField(max_digits=12)
+    spent = MoneyField(max_digits=12, default=0)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['family', 'category', 'month'], name='unique_category_budget'),
+        ]
+
+    def __str__(self):
+        return f"{self.category} {self.month:%Y-%m}: {self.spent}/{self.limit}"
+
+    def save(self, *args, **kwargs):
+        self.month = self.month.replace(day=1)
+        if self.pk is None:
+            # Seed the counter with what was already spent this month
+            self.spent = self.compute_spent()
+        else:
+            # Moved to another category or month: the counter belongs to the old one
+            old = CategoryBudget.objects.filter(pk=self.pk).values_list('category_id', 'month').first()
+            if old is not None and old != (self.category_id, self.month):
+                self.spent = self.compute_spent()
+        super().save(*args, **kwargs)
+
+    def compute_spent(self):
+        """Sum this budget's expenses from the ledger (used to seed/repair the counter)"""
+        next_month = _add_months(self.month, 1, 1)
+        total = Transaction.objects.filter(
+            finance__user__family_id=self.family_id,
+            category_id=self.category_id,
+            type='expense',
+            date__date__gte=self.month,
+            date__date__lt=next_month,
+        ).aggregate(total=models.Sum(converted()))['total']
+        return total or Decimal('0')
+
+    @property
+    def remaining(self):
+        return Decimal(str(self.limit)) - Decimal(str(self.spent))
+
+    @property
+    def is_over(self):
+        return self.remaining < 0
+
+    @classmethod
+    def record(cls, finance_id, category_id, month, delta):
+        """Add `delta` to the family budget for (category, month), if one exists"""
+        cls.objects.filter(
+            family__members__finance=finance_id, category_id=category_id, month=month
+        ).update(spent=F('spent') + money.value(delta))
+
+
 class Invitation(models.Model):
     invitation_id = models.AutoField(primary_key=True)
     family = models.ForeignKey(Family, on_delete=models.CASCADE, related_name='invitations')
@@ -157,16 +476,198 @@ class Invitation(models.Model):
     def __str__(self):
         return f"Invite {self.invited_email} to {self.family.family_name}"
 
+class GoalQuerySet(models.QuerySet):
+    def with_progress(self):
+        """Annotate progress percentage and recent contributions in SQL"""
+        percent = models.DecimalField(max_digits=14, decimal_places=2)
+        since = timezone.now() - timedelta(days=Goal.CONTRIBUTION_WINDOW_DAYS)
+        recent = (
+            Transaction.objects.filter(goal=models.OuterRef('pk'), date__gte=since)
+            .order_by()
+            .values('goal')
+            .annotate(total=models.Sum(contributed()))
+            .values('total')
+        )
+        return self.annotate(
+            progress_pct=models.Case(
+                models.When(
+                    target_amount__gt=0,
+                    # As floats: cents / cents would be integer division, truncating to whole percents
+                    then=models.ExpressionWrapper(
+                        Cast('current_amount', models.FloatField()) * 100 / Cast('target_amount', models.FloatField()),
+                        output_field=percent,
+                    ),
+                ),
+                default=models.Value(Decimal('0')),
+                output_field=percent,
+            ),
+            recent_contributions=Coalesce(
+                models.Subquery(recent, output_field=MoneyField()), money.value(0), output_field=MoneyField()
+            ),
+        )
+
+
 class Goal(models.Model):
+    # Contribution rate for the projected completion date is measured over this window
+    CONTRIBUTION_WINDOW_DAYS = 90
+
     goal_id = models.AutoField(primary_key=True)
     family = models.ForeignKey(Family, on_delete=models.CASCADE, related_name='goals')
     goal_name = models.CharField(max_length=200)
-    target_amount = models.DecimalField(max_digits=12, decimal_places=2)
-    current_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0.00)
+    target_amount = MoneyField(max_digits=12)
+    current_amount = MoneyField(max_digits=12, default=0)
+    # Transactions filed under this category by family members count towards the goal
+    category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, blank=True, related_name='goals')
     deadline = models.DateField()
     created_at = models.DateTimeField(default=timezone.now)
 
+    objects = GoalQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['family', 'deadline']),
+            models.Index(fields=['family', 'category']),
+        ]
+
     def progress_percentage(self):
         if self.target_amount > 0:
-            return (self.current_amount / self.target_amount) * 100
-        return 0
\ No newline at end of file
+            return (Decimal(str(self.current_amount)) / Decimal(str(self.target_amount))) * 100
+        return 0
+
+    def recalculate(self):
+        """Reset current_amount to the sum of tagged contributions"""
+        total = self.contributions.aggregate(total=models.Sum(contributed()))['total']
+        self.current_amount = total or Decimal('0')
+        self.save(update_fields=['current_amount'])
+
+    def projected_completion_date(self, recent_contributions=None):
+        """Estimate when the goal is reached at the recent contribution rate.
+
+        Returns None when nothing has been contributed recently.
+        """
+        today = timezone.localdate()
+        remaining = Decimal(str(self.target_amount)) - Decimal(str(self.current_amount))
+        if remaining <= 0:
+            return today
+        if recent_contributions is None:
+            since = timezone.now() - timedelta(days=self.CONTRIBUTION_WINDOW_DAYS)
+            recent_contributions = self.contributions.filter(date__gte=since).aggregate(
+                total=models.Sum(contributed())
+            )['total']
+        if not recent_contributions or recent_contributions <= 0:
+            return None
+        # A goal younger than the window has only been collecting for its age
+        window = min(self.CONTRIBUTION_WINDOW_DAYS, max((timezone.now() - self.created_at).days, 1))
+        daily_rate = Decimal(str(recent_contributions)) / window
+        return today + timedelta(days=math.ceil(remaining / daily_rate))
+
+class Job(models.Model):
+    """Expensive computation (AI analysis, reports) handed off to a `run_jobs` worker.
+
+    Handlers are registered by `kind` in jobs.py. Identical requests from the
+    same user share one pending/running job via `params_hash`.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+    # At most one job per params_hash may be in these statuses
+    ACTIVE_STATUSES = ('pending', 'running')
+
+    job_id = models.AutoField(primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='jobs')
+    kind = models.CharField(max_length=50)
+    params = models.JSONField(default=dict)
+    # sha256 of (kind, user, params); used to deduplicate queued requests
+    params_hash = models.CharField(max_length=64, db_index=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    result = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    error = models.TextField(blank=True, default='')
+    worker = models.CharField(max_length=100, blank=True, default='')
+    created_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['params_hash'],
+                condition=models.Q(status__in=('pending', 'running')),
+                name='unique_active_job',
+            ),
+        ]
+
+    def __str__(self):
+        return f"Job {self.job_id} {self.kind} ({self.status})"
+
+    @property
+    def is_finished(self):
+        return self.status in ('done', 'failed')
+
+
+class ExchangeRate(models.Model):
+    """Rate of a day: one `from_currency` is worth `rate` `to_currency`.
+
+    Loaded from files by `load_exchange_rates`; conversions read them through
+    the in-process cache in rates.py.
+    """
+    rate_id = models.AutoField(primary_key=True)
+    date = models.DateField()
+    from_currency = models.CharField(max_length=3, choices=CURRENCY_CHOICES)
+    to_currency = models.CharField(max_length=3, choices=CURRENCY_CHOICES)
+    rate = models.DecimalField(max_digits=18, decimal_places=8)
+
+    class Meta:
+        constraints = [
+            # Also serves "latest rate on or before a day" lookups
+            models.UniqueConstraint(fields=['from_currency', 'to_currency', 'date'], name='unique_exchange_rate'),
+        ]
+
+    def __str__(self):
+        return f"{self.date}: 1 {self.from_currency} = {self.rate} {self.to_currency}"
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        from .rates import cache
+        cache.clear()
+
+    def delete(self, *args, **kwargs):
+        from .rates import cache
+        result = super().delete(*args, **kwargs)
+        cache.clear()
+        return result
+
+
+class AnalyticsSnapshot(models.Model):
+    """Persisted result of an expensive analytics computation (see snapshots.py).
+
+    Rows are keyed by scope ('finance:<id>' or 'family:<id>'), kind and a
+    hash of the parameters. `data_version` records the ledger version the
+    payload was computed from; a snapshot whose version no longer matches is
+    stale and gets recomputed.
+    """
+    snapshot_id = models.AutoField(primary_key=True)
+    scope_key = models.CharField(max_length=40)
+    family = models.ForeignKey(Family, on_delete=models.CASCADE, null=True, blank=True,
+                               related_name='analytics_snapshots')
+    finance = models.ForeignKey(Finance, on_delete=models.CASCADE, null=True, blank=True,
+                                related_name='analytics_snapshots')
+    kind = models.CharField(max_length=50)
+    params = models.JSONField(default=dict)
+    params_hash = models.CharField(max_length=64)
+    data_version = models.CharField(max_length=64, blank=True, default='')
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+    computed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['scope_key', 'kind', 'params_hash'], name='unique_analytics_snapshot'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} for {self.scope_key} at {self.computed_at:%Y-%m-%d %H:%M}"
@@ -0,0 +1,64 @@
+"""
+Money stored as integer minor units (cents).
+
+MoneyField is a DecimalField with two decimal places everywhere above the
+database (model instances, forms, DRF serializers and the API see Decimal
+values exactly as before), but its column is a BIGINT of cents. SUM() and
+running totals are then exact integer arithmetic on every backend, and
+aggregates come back as Decimal without per-row str()/float() round trips.
+
+Python amounts combined with money columns inside SQL, e.g.
+F('spent') + delta, must be wrapped with `value()` so they are sent as cents
+as well; a bare Decimal would be sent as-is and added to a cents column.
+"""
+
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.db import models
+
+CENTS = Decimal('0.01')
+
+
+def to_cents(amount) -> int:
+    """Integer cents of a Decimal/str/int/float amount, rounded half up"""
+    return int(Decimal(str(amount)).quantize(CENTS, rounding=ROUND_HALF_UP).scaleb(2))
+
+
+def from_cents(cents) -> Decimal:
+    return Decimal(int(cents)).scaleb(-2)
+
+
+class MoneyField(models.DecimalField):
+    """Decimal amount with two decimal places, stored as a BIGINT of cents"""
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('max_digits', 14)
+        kwargs['decimal_places'] = 2
+        super().__init__(*args, **kwargs)
+
+    def get_internal_type(self):
+        return 'BigIntegerField'
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        if value is None or hasattr(value, 'as_sql'):
+            return value
+        if not prepared:
+            value = self.get_prep_value(value)
+        return to_cents(value)
+
+    def get_db_prep_save(self, value, connection):
+        return self.get_db_prep_value(value, connection)
+
+    def from_db_value(self, value, expression, connection):
+        # SQLite may hand back a float for sums over mixed expressions; cents are whole
+        return None if value is None else from_cents(round(value))
+
+
+def value(amount):
+    """SQL literal for a Python amount, in cents (for F() arithmetic on money columns)"""
+    return models.Value(amount, output_field=MoneyField())
+
+
+def cents(name):
+    """Raw integer cents of a money column, for bulk numeric loads (no Decimal per row)"""
+    return models.ExpressionWrapper(models.F(name), output_field=models.BigIntegerField())
@@ -0,0 +1,166 @@
+"""
+Sparse fieldsets for API responses.
+
+Any viewset using ProjectionMixin with a serializer using DynamicFieldsMixin
+accepts:
+
+- ?fields=a,b    only return these fields
+- ?exclude=c,d   return everything except these fields
+- ?expand=rel    render these nested relations in full; relations listed in
+                 Meta.expandable_fields that are not expanded are returned as
+                 primary keys. Without ?expand, Meta.default_expand applies
+                 (kept equal to the historical response shape).
+
+The trimmed serializer also narrows the query: only() loads just the columns
+the remaining fields read, select_related() joins only the relations they
+traverse and expanded to-many relations are prefetched with their own
+projected queryset. Method fields and properties declare the model paths
+they read in Meta.field_sources; a field whose needs are unknown disables
+narrowing for that query (the response is still trimmed).
+
+On writes (POST/PUT/PATCH) ?fields and ?exclude only trim the response:
+the request body is validated against every field, so required fields
+cannot be skipped by leaving them out of ?fields.
+"""
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+
+def _param_set(request, name):
+    value = request.query_params.get(name) if request is not None else None
+    if value is None:
+        return None
+    return {part.strip() for part in value.split(',') if part.strip()}
+
+
+def _trimmed(items, request):
+    """`items` (fields or rendered values by name) narrowed to ?fields minus ?exclude"""
+    only = _param_set(request, 'fields')
+    if only:
+        items = {name: value for name, value in items.items() if name in only}
+    for name in _param_set(request, 'exclude') or ():
+        items.pop(name, None)
+    return items
+
+
+class DynamicFieldsMixin:
+    """ModelSerializer mixin applying ?fields/?exclude/?expand of the current request"""
+
+    def _is_root(self):
+        parent = self.parent
+        return parent is None or (isinstance(parent, serializers.ListSerializer) and parent.parent is None)
+
+    def _request(self):
+        return self.context.get('request') if self._is_root() else None
+
+    def get_fields(self):
+        fields = super().get_fields()
+        meta = self.Meta
+        request = self._request()
+        expandable = getattr(meta, 'expandable_fields', ())
+        expand = _param_set(request, 'expand')
+        if expand is None:
+            expand = set(getattr(meta, 'default_expand', expandable))
+
+        for name in expandable:
+            if name in fields and name not in expand:
+                nested = fields[name]
+                many = isinstance(nested, serializers.ListSerializer)
+                fields[name] = serializers.PrimaryKeyRelatedField(read_only=True, many=many, source=nested.source)
+
+        if request is not None and request.method in SAFE_METHODS:
+            fields = _trimmed(fields, request)
+        return fields
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        request = self._request()
+        if request is not None and request.method not in SAFE_METHODS:
+            # Writes kept every field for validation; trim only what is sent back
+            data = _trimmed(data, request)
+        return data
+
+
+def _field_paths(serializer, model):
+    """(column paths, {relation: nested serializer}) a serializer reads, or None if unknown"""
+    declared = getattr(getattr(serializer, 'Meta', None), 'field_sources', {})
+    paths, prefetch = set(), {}
+    for name, field in serializer.fields.items():
+        if name in declared:
+            paths.update(declared[name])
+            continue
+        if field.source == '*':
+            return None
+        source = field.source.replace('.', '__')
+        try:
+            model_field = model._meta.get_field(source.split('__')[0])
+        except FieldDoesNotExist:
+            # A property or method: its needs are unknown
+            return None
+        nested = field.child if isinstance(field, serializers.ListSerializer) else field
+        if isinstance(nested, serializers.BaseSerializer):
+            if model_field.many_to_many or model_field.one_to_many:
+                prefetch[source] = nested
+            else:
+                sub = _field_paths(nested, model_field.related_model)
+                if sub is None or sub[1]:
+                    return None
+                paths.update(f'{source}__{path}' for path in sub[0])
+                paths.add(f'{source}__{model_field.related_model._meta.pk.name}')
+        elif isinstance(field, serializers.ManyRelatedField) or model_field.one_to_many or model_field.many_to_many:
+            prefetch[source] = None
+        else:
+            paths.add(source)
+    return paths, prefetch
+
+
+def project_queryset(queryset, serializer, extra=()):
+    """Narrow `queryset` to what `serializer` (possibly many=True) renders; `extra` columns are always loaded"""
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    model = queryset.model
+    needs = _field_paths(serializer, model)
+    if needs is None:
+        return queryset
+    paths, prefetch = needs
+
+    relations = set()
+    for path in paths:
+        parts = path.split('__')
+        for depth in range(1, len(parts)):
+            relations.add('__'.join(parts[:depth]))
+    queryset = queryset.select_related(None)
+    if relations:
+        queryset = queryset.select_related(*relations)
+    queryset = queryset.only(model._meta.pk.name, *paths, *extra)
+
+    for source, nested in prefetch.items():
+        if nested is None:
+            queryset = queryset.prefetch_related(source)
+            continue
+        relation = model._meta.get_field(source)
+        # Reverse FK rows need their FK column to be attached to their parents
+        extra_columns = (relation.remote_field.attname,) if relation.one_to_many else ()
+        related_qs = project_queryset(relation.related_model._default_manager.all(), nested, extra_columns)
+        queryset = queryset.prefetch_related(Prefetch(source, queryset=related_qs))
+    return queryset
+
+
+def projected(serializer_class, queryset, context, many=True):
+    """Serializer for `queryset` whose query is narrowed to the requested fields"""
+    serializer = serializer_class(many=many, context=context)
+    serializer.instance = project_queryset(queryset, serializer)
+    return serializer
+
+
+class ProjectionMixin:
+    """GenericAPIView mixin narrowing list/detail querysets to the requested fields"""
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.request.method != 'GET':
+            return queryset
+        return project_queryset(queryset, self.get_serializer())
@@ -0,0 +1,167 @@
+"""
+Exchange rates and currency conversion.
+
+Amounts are stored in the currency they were entered in. Finance totals are
+kept in the finance's own currency; family-level counters (goal progress,
+category budgets), summaries, time series and AI analysis are in
+settings.BASE_CURRENCY.
+
+Every currency is converted through its rate to the base currency, so
+X -> Y is amount * rate(X) / rate(Y). A day uses the latest rate published
+on or before it, or the earliest known rate when it predates all of them.
+Days are UTC calendar days, matching how datetimes are compared in SQL.
+
+- `cache` holds each currency's rates as sorted NumPy arrays, loaded once
+  per process (and again after EXCHANGE_RATE_CACHE_SECONDS or a local
+  change). Scalar and bulk conversions are searchsorted lookups, so they add
+  no query per row.
+- `converted()` is the SQL counterpart for aggregations run in the database;
+  rows already in the target currency never touch the rate table.
+"""
+
+import hashlib
+import threading
+import time
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+
+from django.conf import settings
+from django.db.models import Case, DecimalField, F, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce, Round
+
+from .money import MoneyField, to_cents
+
+RATE = DecimalField(max_digits=18, decimal_places=8)
+
+
+def base_currency():
+    return settings.BASE_CURRENCY
+
+
+def utc_day(value):
+    """UTC calendar day of a datetime (dates are returned as they are)"""
+    if isinstance(value, datetime):
+        return value.astimezone(dt_timezone.utc).date() if value.tzinfo else value.date()
+    return value
+
+
+class UnknownRate(LookupError):
+    """No rate to the base currency has been loaded for a currency"""
+
+
+class RateCache:
+    """Process-wide table of every currency's rates to the base currency"""
+
+    def __init__(self):
+        self._tables = None
+        self._version = ''
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def _load(self):
+        # NumPy is imported on first use, not at startup (models import this module)
+        import numpy as np
+        from .models import ExchangeRate
+        rows = ExchangeRate.objects.filter(to_currency=base_currency()).order_by('from_currency', 'date').values_list(
+            'pk', 'from_currency', 'date', 'rate'
+        )
+        grouped = {}
+        # Over the rates themselves: load_exchange_rates corrects existing rows in place,
+        # which changes neither the row count nor the newest pk
+        digest = hashlib.blake2b(digest_size=8)
+        for pk, currency, day, rate in rows:
+            days, rates = grouped.setdefault(currency, ([], []))
+            days.append(day)
+            rates.append(rate)
+            digest.update(f'{pk}|{currency}|{day.isoformat()}|{rate}\n'.encode())
+        self._tables = {
+            currency: (np.array(days, dtype='datetime64[D]'), np.array(rates, dtype=np.float64), rates)
+            for currency, (days, rates) in grouped.items()
+        }
+        self._version = digest.hexdigest()
+        self._loaded_at = time.monotonic()
+        return self._tables
+
+    def _get(self):
+        tables = self._tables
+        if tables is None or time.monotonic() - self._loaded_at > settings.EXCHANGE_RATE_CACHE_SECONDS:
+            with self._lock:
+                tables = self._load()
+        return tables
+
+    def clear(self):
+        with self._lock:
+            self._tables = None
+
+    @property
+    def version(self) -> str:
+        """Changes whenever the loaded rates do (part of analytics data versions)"""
+        self._get()
+        return self._version
+
+    def currencies(self):
+        return {base_currency(), *self._get()}
+
+    def _table(self, currency):
+        table = self._get().get(currency)
+        if table is None:
+            raise UnknownRate(f'No exchange rate from {currency} to {base_currency()}')
+        return table
+
+    def rate(self, currency, day) -> Decimal:
+        """Rate of one `currency` in the base currency on `day`"""
+        import numpy as np
+        if currency == base_currency():
+            return Decimal('1')
+        days, _, rates = self._table(currency)
+        index = np.searchsorted(days, np.datetime64(utc_day(day), 'D'), side='right') - 1
+        return rates[max(index, 0)]
+
+    def convert(self, amount, from_currency, to_currency, when) -> Decimal:
+        """`amount` in `to_currency`, rounded to cents"""
+        if from_currency == to_currency:
+            return amount
+        value = Decimal(str(amount)) * self.rate(from_currency, when) / self.rate(to_currency, when)
+        return Decimal(to_cents(value)).scaleb(-2)
+
+    def base_rates(self, currencies, days):
+        """Vectorized rate(currency, day) for parallel arrays of currencies and datetime64[D] days"""
+        import numpy as np
+        currencies = np.asarray(currencies)
+        result = np.ones(len(currencies), dtype=np.float64)
+        for currency in np.unique(currencies):
+            if currency == base_currency():
+                continue
+            table_days, table_rates, _ = self._table(currency)
+            rows = np.flatnonzero(currencies == currency)
+            index = np.searchsorted(table_days, days[rows], side='right') - 1
+            result[rows] = table_rates[np.maximum(index, 0)]
+        return result
+
+
+cache = RateCache()
+
+
+def _base_rate(currency, date):
+    """SQL rate to the base currency of the currency in field `currency` on the day of field `date`"""
+    from .models import ExchangeRate
+    rates = ExchangeRate.objects.filter(from_currency=OuterRef(currency), to_currency=base_currency())
+    before = Subquery(rates.filter(date__lte=OuterRef(date)).order_by('-date').values('rate')[:1])
+    earliest = Subquery(rates.order_by('date').values('rate')[:1])
+    return Case(
+        When(**{currency: base_currency()}, then=Value(Decimal('1'))),
+        default=Coalesce(before, earliest, output_field=RATE),
+        output_field=RATE,
+    )
+
+
+def converted(to_field=None, amount='amount', currency='currency', date='date'):
+    """SQL amount of each row in the base currency, or in the currency held in field `to_field`"""
+    if to_field is None:
+        same = Q(**{currency: base_currency()})
+        factor = _base_rate(currency, date)
+    else:
+        same = Q(**{currency: F(to_field)})
+        factor = _base_rate(currency, date) / _base_rate(to_field, date)
+    # Rounded to whole cents per row, as cache.convert() does for the incremental counters
+    return Case(When(same, then=F(amount)), default=Round(F(amount) * factor), output_field=MoneyField())
@@ -0,0 +1,57 @@
+"""
+In-process lookup tables for small, rarely changing reference models.
+
+Roles are read on almost every membership write; instead of running
+`get_or_create` each time, the registry loads the whole table once per
+process and serves lookups by name from memory.
+"""
+
+import threading
+
+
+class NameRegistry:
+    """Process-wide cache of `model` instances keyed by `name_field`.
+
+    The cache is loaded lazily on first use and reloaded when a name is
+    missing (another process may have created it). Model save/delete hooks
+    call `clear()` so changes made in this process are picked up right away.
+    """
+
+    def __init__(self, model_path: str, name_field: str):
+        self.model_path = model_path
+        self.name_field = name_field
+        self._items = None
+        self._lock = threading.Lock()
+
+    @property
+    def model(self):
+        from django.apps import apps
+        return apps.get_model(self.model_path)
+
+    def _load(self) -> dict:
+        items = {}
+        for obj in self.model.objects.all():
+            items.setdefault(getattr(obj, self.name_field), obj)
+        self._items = items
+        return items
+
+    def get(self, name: str, create: bool = True):
+        """Return the instance called `name`, creating it if allowed."""
+        items = self._items
+        if items is None or name not in items:
+            with self._lock:
+                items = self._load()
+        obj = items.get(name)
+        if obj is None and create:
+            obj, _ = self.model.objects.get_or_create(**{self.name_field: name})
+            with self._lock:
+                if self._items is not None:
+                    self._items[name] = obj
+        return obj
+
+    def clear(self):
+        with self._lock:
+            self._items = None
+
+
+roles = NameRegistry('family_budget_app.Role', 'role_name')
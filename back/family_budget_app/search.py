@@ -0,0 +1,133 @@
+"""
+Full-text search over transaction descriptions.
+
+SQLite: an FTS5 external-content table over the transaction table (the text
+is not stored twice), kept in sync by triggers so every write path,
+including bulk_create(), queryset update()/delete() and cascades, updates the
+index. The unicode61 tokenizer folds case for Cyrillic as well as Latin
+text, and 2/3 character prefix indexes keep short prefix queries cheap.
+finance_id is indexed as a second column so the user's scope is intersected
+inside the index instead of ranking every family's matches first. Results
+are ranked by bm25() over the description.
+
+PostgreSQL: a GIN index on to_tsvector('simple', description), queried with
+prefix tsqueries and ranked by ts_rank(). The 'simple' configuration does no
+stemming, so merchant names in any language match as typed.
+
+Django rebuilds SQLite tables when a migration alters them, which drops
+their triggers, so repair() restores them after every migrate (see apps.py).
+"""
+
+import re
+
+from django.db import connection
+
+TRANSACTION_TABLE = 'family_budget_app_transaction'
+FTS_TABLE = 'family_budget_app_transaction_fts'
+GIN_INDEX = 'transaction_description_search'
+
+# Words of a query used at most; each becomes a prefix term and all must match
+MAX_TERMS = 8
+
+_WORD = re.compile(r'\w+')
+
+_SQLITE_SCHEMA = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        description, finance_id,
+        content='{TRANSACTION_TABLE}', content_rowid='transaction_id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert AFTER INSERT ON {TRANSACTION_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, description, finance_id) VALUES (new.transaction_id, new.description, new.finance_id);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete AFTER DELETE ON {TRANSACTION_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, description, finance_id) VALUES ('delete', old.transaction_id, old.description, old.finance_id);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update AFTER UPDATE OF description, finance_id ON {TRANSACTION_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, description, finance_id) VALUES ('delete', old.transaction_id, old.description, old.finance_id);
+        INSERT INTO {FTS_TABLE}(rowid, description, finance_id) VALUES (new.transaction_id, new.description, new.finance_id);
+    END""",
+]
+
+_POSTGRES_VECTOR = "to_tsvector('simple'::regconfig, COALESCE(description, ''))"
+
+
+def install(conn=connection, rebuild=False):
+    """Create the search index and its triggers if missing; rebuild=True reindexes every row"""
+    with conn.cursor() as cursor:
+        if conn.vendor == 'sqlite':
+            cursor.execute(f"SELECT 1 FROM sqlite_master WHERE name = '{FTS_TABLE}'")
+            created = cursor.fetchone() is None
+            for statement in _SQLITE_SCHEMA:
+                cursor.execute(statement)
+            if created or rebuild:
+                cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+        elif conn.vendor == 'postgresql':
+            cursor.execute(
+                f'CREATE INDEX IF NOT EXISTS {GIN_INDEX} ON {TRANSACTION_TABLE} USING GIN ({_POSTGRES_VECTOR})'
+            )
+
+
+def repair(conn=connection):
+    """Recreate missing SQLite triggers of an installed index (rows are unchanged by a table rebuild)"""
+    if conn.vendor != 'sqlite':
+        return
+    with conn.cursor() as cursor:
+        cursor.execute(f"SELECT 1 FROM sqlite_master WHERE name = '{FTS_TABLE}'")
+        if cursor.fetchone() is None:
+            return
+        for statement in _SQLITE_SCHEMA[1:]:
+            cursor.execute(statement)
+
+
+def uninstall(conn=connection):
+    with conn.cursor() as cursor:
+        if conn.vendor == 'sqlite':
+            for suffix in ('insert', 'delete', 'update'):
+                cursor.execute(f'DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}')
+            cursor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+        elif conn.vendor == 'postgresql':
+            cursor.execute(f'DROP INDEX IF EXISTS {GIN_INDEX}')
+
+
+def terms(text):
+    """Lowercased words of a user query, at most MAX_TERMS"""
+    return _WORD.findall((text or '').lower())[:MAX_TERMS]
+
+
+def search(finance_ids, text, limit, offset=0):
+    """[(transaction_id, rank)] of transactions of these finances matching every word of `text` as a prefix.
+
+    Best matches first (lower rank is better); ties go to the newest rows.
+    """
+    words = terms(text)
+    finance_ids = [int(pk) for pk in finance_ids]
+    if not words or not finance_ids:
+        return []
+
+    if connection.vendor == 'postgresql':
+        tsquery = ' & '.join(f"'{word}':*" for word in words)
+        sql = f"""
+            SELECT transaction_id, -ts_rank({_POSTGRES_VECTOR}, query) AS rank
+            FROM {TRANSACTION_TABLE}, to_tsquery('simple', %s) query
+            WHERE {_POSTGRES_VECTOR} @@ query AND finance_id = ANY(%s)
+            ORDER BY rank, transaction_id DESC LIMIT %s OFFSET %s
+        """
+        params = [tsquery, finance_ids, limit, offset]
+    else:
+        # Quoted so FTS5 operators (AND, NEAR, ...) in user input are plain words
+        words = ' AND '.join(f'"{word}"*' for word in words)
+        scope = ' OR '.join(str(pk) for pk in finance_ids)
+        match = f'description : ({words}) AND finance_id : ({scope})'
+        # bm25 weights: only description matches count towards the rank
+        sql = f"""
+            SELECT rowid, bm25({FTS_TABLE}, 1.0, 0.0) AS rank
+            FROM {FTS_TABLE}
+            WHERE {FTS_TABLE} MATCH %s
+            ORDER BY rank, rowid DESC LIMIT %s OFFSET %s
+        """
+        params = [match, limit, offset]
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
@@ -1,6 +1,8 @@
 from rest_framework import serializers
 from django.contrib.auth import authenticate
-from .models import User, Family, Role, Finance, Transaction, Category, Goal
+from .models import User, Family, Role, Finance, Transaction, Category, Goal, RecurringRule, CategoryBudget, Job
+from .registry import roles
+from .projection import DynamicFieldsMixin
 
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
@@ -35,8 +37,7 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
 
         # Assign role if role_name provided (create if doesn't exist)
         if role_name:
-            role_obj, _ = Role.objects.get_or_create(role_name=role_name)
-            user.role = role_obj
+            user.role = roles.get(role_name)
             user.save()
 
         # Create finance profile for new user
@@ -61,13 +62,17 @@ class UserLoginSerializer(serializers.Serializer):
             return attrs
         raise serializers.ValidationError('Email and password are required')
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     role_name = serializers.SerializerMethodField(read_only=True)
     family_name = serializers.SerializerMethodField(read_only=True)
 
     class Meta:
         model = User
         fields = ['user_id', 'username', 'email', 'age', 'role', 'role_name', 'family', 'family_name']
+        field_sources = {
+            'role_name': ['role__role_name'],
+            'family_name': ['family__family_name'],
+        }
 
     def get_role_name(self, obj):
         return obj.role.role_name if obj.role else None
@@ -75,27 +80,65 @@ class UserSerializer(serializers.ModelSerializer):
     def get_family_name(self, obj):
         return obj.family.family_name if obj.family else None
 
-class FamilySerializer(serializers.ModelSerializer):
+class FamilySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     admin = UserSerializer(read_only=True)
     members = UserSerializer(many=True, read_only=True)
 
     class Meta:
         model = Family
         fields = ['family_id', 'family_name', 'admin', 'created_at', 'members']
+        expandable_fields = ['admin', 'members']
 
-class FinanceSerializer(serializers.ModelSerializer):
+class FinanceSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Finance
-        fields = ['finance_id', 'balance', 'income', 'expenses', 'updated_at']
+        fields = ['finance_id', 'balance', 'income', 'expenses', 'currency', 'updated_at']
+
+    def validate_currency(self, value):
+        return TransactionSerializer.validate_currency(self, value)
+
+    def update(self, instance, validated_data):
+        """Switching currency re-totals the finance from its ledger in the new one"""
+        old_currency = instance.currency
+        instance = super().update(instance, validated_data)
+        if instance.currency != old_currency:
+            from .ledger import ledger_totals
+            instance.income, instance.expenses = ledger_totals([instance.pk]).get(instance.pk, (0, 0))
+            instance.update_balance()
+        return instance
 
-class TransactionSerializer(serializers.ModelSerializer):
+class TransactionSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     user = serializers.SerializerMethodField(read_only=True)
     category_name = serializers.SerializerMethodField(read_only=True)
     transaction_type = serializers.SerializerMethodField(read_only=True)
     
     class Meta:
         model = Transaction
-        fields = ['transaction_id', 'amount', 'category', 'category_name', 'type', 'transaction_type', 'date', 'description', 'user']
+        fields = ['transaction_id', 'amount', 'currency', 'category', 'category_name', 'type', 'transaction_type', 'date', 'description', 'goal', 'user']
+        extra_kwargs = {
+            'goal': {'required': False, 'allow_null': True},
+            # Defaults to the currency of the finance the transaction is filed under
+            'currency': {'required': False},
+        }
+        field_sources = {
+            'user': ['finance__user__user_id', 'finance__user__username', 'finance__user__email'],
+            'category_name': ['category__category_name'],
+            'transaction_type': ['type'],
+        }
+
+    def validate_currency(self, value):
+        """Only currencies with a loaded exchange rate can be converted into totals"""
+        from .rates import cache
+        if value not in cache.currencies():
+            raise serializers.ValidationError(f'No exchange rate is loaded for {value}.')
+        return value
+
+    def validate_goal(self, value):
+        """Only goals of the requesting user's family can be contributed to"""
+        request = self.context.get('request')
+        if value and request and value.family_id != request.user.family_id:
+            raise serializers.ValidationError('Goal does not belong to your family.')
+        return value
 
     def get_user(self, obj):
         """Return user information from the related Finance object"""
@@ -115,14 +158,99 @@ class TransactionSerializer(serializers.ModelSerializer):
         """Return transaction type display name"""
         return 'income' if obj.type == 'income' else 'expense'
 
-class CategorySerializer(serializers.ModelSerializer):
+class TransactionBulkSerializer(serializers.Serializer):
+    """Payload of the bulk_delete/bulk_update transaction actions"""
+    MAX_IDS = 1000
+
+    ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False, max_length=MAX_IDS)
+
+
+class TransactionBulkUpdateSerializer(TransactionBulkSerializer):
+    category = serializers.PrimaryKeyRelatedField(queryset=Category.objects.all(), allow_null=True, required=False)
+    goal = serializers.PrimaryKeyRelatedField(queryset=Goal.objects.all(), allow_null=True, required=False)
+    description = serializers.CharField(required=False, allow_blank=True)
+
+    validate_goal = TransactionSerializer.validate_goal
+
+    def validate(self, attrs):
+        if not set(attrs) - {'ids'}:
+            raise serializers.ValidationError('Provide at least one of category, goal or description.')
+        return attrs
+
+class CategorySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Category
         fields = '__all__'
 
-class GoalSerializer(serializers.ModelSerializer):
-    progress_percentage = serializers.ReadOnlyField()
+class GoalSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    progress_percentage = serializers.SerializerMethodField(read_only=True)
+    projected_completion_date = serializers.SerializerMethodField(read_only=True)
 
     class Meta:
         model = Goal
-        fields = '__all__'
\ No newline at end of file
+        fields = '__all__'
+        # current_amount is maintained from tagged transactions; see Goal.recalculate
+        read_only_fields = ['family', 'current_amount']
+        field_sources = {
+            'progress_percentage': ['current_amount', 'target_amount'],
+            'projected_completion_date': ['current_amount', 'target_amount', 'created_at'],
+        }
+
+    def get_progress_percentage(self, obj):
+        """Use the SQL-computed value from GoalQuerySet.with_progress() when present"""
+        progress = getattr(obj, 'progress_pct', None)
+        if progress is None:
+            progress = obj.progress_percentage()
+        return round(float(progress), 2)
+
+    def get_projected_completion_date(self, obj):
+        projected = obj.projected_completion_date(getattr(obj, 'recent_contributions', None))
+        return projected.isoformat() if projected else None
+
+class RecurringRuleSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    category_name = serializers.SerializerMethodField(read_only=True)
+
+    class Meta:
+        model = RecurringRule
+        fields = ['rule_id', 'amount', 'currency', 'category', 'category_name', 'type', 'description', 'frequency',
+                  'interval', 'start_date', 'end_date', 'next_run', 'is_active', 'created_at']
+        read_only_fields = ['next_run', 'created_at']
+        extra_kwargs = {'currency': {'required': False}}
+        field_sources = {'category_name': ['category__category_name']}
+
+    validate_currency = TransactionSerializer.validate_currency
+
+    def get_category_name(self, obj):
+        return obj.category.category_name if obj.category else 'Uncategorized'
+
+    def validate_interval(self, value):
+        if value < 1:
+            raise serializers.ValidationError('Interval must be at least 1.')
+        return value
+
+
+class CategoryBudgetSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    category_name = serializers.SerializerMethodField(read_only=True)
+    remaining = serializers.DecimalField(max_digits=12, decimal_places=2, read_only=True)
+    over_budget = serializers.BooleanField(source='is_over', read_only=True)
+
+    class Meta:
+        model = CategoryBudget
+        fields = ['budget_id', 'category', 'category_name', 'month', 'limit', 'spent', 'remaining', 'over_budget']
+        read_only_fields = ['spent']
+        field_sources = {
+            'category_name': ['category__category_name'],
+            'remaining': ['limit', 'spent'],
+            'over_budget': ['limit', 'spent'],
+        }
+
+    def get_category_name(self, obj):
+        return obj.category.category_name
+
+
+class JobSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = Job
+        fields = ['job_id', 'kind', 'params', 'status', 'result', 'error',
+                  'created_at', 'started_at', 'finished_at']
+        read_only_fields = fields
@@ -0,0 +1,147 @@
+"""
+Monte Carlo simulation of goal attainment.
+
+A goal's future is simulated from its family's own history: every month of
+a path draws one of the family's past monthly nets (income - expenses, in
+the base currency) at random, and the net is saved towards the goal (a
+month in deficit takes savings back, but never below zero). Paths are NumPy
+rows, so thousands of them are drawn and accumulated at once. The
+result is the share of paths that reach `target_amount` by the deadline,
+plus percentile trajectories of the saved amount.
+
+Draws are made in chunks until the requested number of paths is reached or
+the time budget runs out, whichever comes first. The response reports how
+many paths it used. The generator is seeded per goal, so identical data
+gives identical results. Results are cached in the snapshot store under the
+family's data version (see snapshots.py).
+"""
+
+import time
+from datetime import date, timedelta
+
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+
+DEFAULT_PATHS = 5000
+MAX_PATHS = 20000
+# Paths are drawn in chunks of this many until the budget is spent
+CHUNK_PATHS = 1000
+# Wall-clock budget for drawing paths; at least one chunk is always drawn
+TIME_BUDGET_SECONDS = 0.2
+
+# Months of history the nets are drawn from, and the fewest a simulation needs
+HISTORY_MONTHS = 24
+MIN_HISTORY_MONTHS = 3
+# Longest horizon simulated; later deadlines are reported at this horizon
+MAX_MONTHS = 240
+
+PERCENTILES = (10, 25, 50, 75, 90)
+
+
+def _month_index(day):
+    return day.year * 12 + day.month - 1
+
+
+def _label(index):
+    return f'{index // 12:04d}-{index % 12 + 1:02d}'
+
+
+def _add_months(day, months):
+    index = _month_index(day) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def monthly_nets(finances, today=None):
+    """Net of each complete month since the first transaction of `finances`, at most HISTORY_MONTHS back"""
+    from . import timeseries
+    from .models import Transaction
+
+    today = today or timezone.localdate()
+    first = Transaction.objects.filter(finance__in=finances).order_by('date').values_list('date', flat=True).first()
+    if first is None:
+        return np.zeros(0)
+    end = date(today.year, today.month, 1) - timedelta(days=1)
+    start = max(timezone.localtime(first).date().replace(day=1), _add_months(end.replace(day=1), 1 - HISTORY_MONTHS))
+    if start > end:
+        return np.zeros(0)
+    return np.array(timeseries.cashflow(finances, 'month', start, end)['net'], dtype=np.float64)
+
+
+def simulate(nets, current, target, months, paths=DEFAULT_PATHS, seed=0, budget=TIME_BUDGET_SECONDS):
+    """Draw paths of `months` monthly nets sampled from `nets` on top of `current`.
+
+    Returns (probability, percentile rows (len(PERCENTILES) x months),
+    sorted month offsets at which reaching paths first hit the target,
+    paths drawn).
+    """
+    rng = np.random.default_rng(seed)
+    started = time.perf_counter()
+    chunks, drawn = [], 0
+    while drawn < paths:
+        size = min(CHUNK_PATHS, paths - drawn)
+        totals = current + np.cumsum(rng.choice(nets, size=(size, months)), axis=1)
+        # Savings floored at zero: max(0, previous + net) for every month, via the running minimum
+        chunks.append(totals - np.minimum(np.minimum.accumulate(totals, axis=1), 0))
+        drawn += size
+        if time.perf_counter() - started > budget:
+            break
+    balances = np.concatenate(chunks)
+    hit = balances >= target
+    reached = hit.any(axis=1)
+    first_hit = np.sort(hit.argmax(axis=1)[reached])
+    return float(reached.mean()), np.percentile(balances, PERCENTILES, axis=0), first_hit, drawn
+
+
+def simulate_goal(goal, paths=DEFAULT_PATHS):
+    """Probability and percentile trajectories of `goal` reaching its target by its deadline"""
+    from .models import Finance
+
+    started = time.perf_counter()
+    today = timezone.localdate()
+    current, target = float(goal.current_amount), float(goal.target_amount)
+    result = {
+        'goal_id': goal.pk,
+        'target_amount': round(target, 2),
+        'current_amount': round(current, 2),
+        'deadline': goal.deadline.isoformat(),
+        'currency': settings.BASE_CURRENCY,
+    }
+
+    if current >= target:
+        return {**result, 'probability': 1.0, 'note': 'Target already reached'}
+    # Months from next month up to the deadline's month each save one net
+    months = _month_index(goal.deadline) - _month_index(today)
+    if months < 1:
+        return {**result, 'probability': 0.0, 'note': 'No month left before the deadline'}
+
+    nets = monthly_nets(Finance.objects.filter(user__family_id=goal.family_id), today)
+    if len(nets) < MIN_HISTORY_MONTHS:
+        return {
+            **result, 'probability': None, 'history_months': len(nets),
+            'note': f'Need at least {MIN_HISTORY_MONTHS} complete months of family history',
+        }
+
+    horizon = min(months, MAX_MONTHS)
+    probability, bands, first_hit, drawn = simulate(
+        nets, current, target, horizon, min(max(paths, CHUNK_PATHS), MAX_PATHS), seed=goal.pk
+    )
+    start = _month_index(today) + 1
+    # Month by which half of all paths have reached the target, if half of them ever do
+    half = (drawn + 1) // 2
+    return {
+        **result,
+        'probability': round(probability, 4),
+        'median_completion': _label(start + int(first_hit[half - 1])) if len(first_hit) >= half else None,
+        'months': [_label(start + i) for i in range(horizon)],
+        'percentiles': {f'p{p}': np.round(row, 2).tolist() for p, row in zip(PERCENTILES, bands)},
+        'history_months': len(nets),
+        'mean_monthly_net': round(float(nets.mean()), 2),
+        'monthly_net_std': round(float(nets.std()), 2),
+        'paths': drawn,
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+        'note': (
+            'Each month saves a net drawn from the family\'s past months' +
+            (f'; simulated {MAX_MONTHS} of {months} months to the deadline' if months > horizon else '')
+        ),
+    }
@@ -0,0 +1,183 @@
+"""
+Versioned analytics snapshots for instant dashboard reads.
+
+AI endpoints call `read()` instead of computing inline. A snapshot is keyed by
+scope, kind and parameters and remembers the ledger version it was computed
+from:
+
+- finance scope: `Finance.version`, bumped on every transaction write
+- family scope: member count, member ids and the sum of their finance
+  versions; versions only grow, so the token changes whenever any member's
+  ledger changes or someone joins or leaves the family
+
+Both also carry the exchange-rate table's version, since payloads are
+converted to the base currency (see rates.py).
+
+A fresh snapshot costs one version lookup plus one indexed row read. A stale
+one is recomputed synchronously, or (background=True) the stale payload is
+returned while a job refreshes it; see jobs.py.
+"""
+
+import hashlib
+import json
+from typing import Dict, NamedTuple, Optional
+
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from .models import AnalyticsSnapshot, Finance, User
+from .rates import cache as rates
+
+# kind -> function(user, **params) computing the payload; registered with @kind
+KINDS = {}
+
+
+def kind(name):
+    def register(func):
+        KINDS[name] = func
+        return func
+    return register
+
+
+class Scope(NamedTuple):
+    key: str
+    version: str
+    family_id: Optional[int] = None
+    finance_id: Optional[int] = None
+
+
+class Result(NamedTuple):
+    payload: Optional[Dict]
+    computed_at: Optional[object]
+    fresh: bool
+    job: Optional[object] = None
+
+
+def params_hash(params):
+    return hashlib.sha256(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def family_versions(family_ids):
+    """Data version token of each family, from one grouped query"""
+    rate_version = rates.version
+    return {
+        row['family_id']: f"{row['members']}:{row['ids']}:{row['version'] or 0}:{rate_version}"
+        for row in User.objects.filter(family_id__in=family_ids)
+        .values('family_id')
+        .annotate(members=Count('pk'), ids=Sum('pk'), version=Sum('finance__version'))
+        .order_by()
+    }
+
+
+def family_scope(family_id, version):
+    return Scope(f'family:{family_id}', version, family_id=family_id)
+
+
+def resolve_scope(user, params) -> Optional[Scope]:
+    """Whose data a request covers; None when there is nothing to cache (no finance)"""
+    if params.get('scope') == 'family' and user.family_id and not (user.role and user.role.role_name == 'kid'):
+        return family_scope(user.family_id, family_versions([user.family_id]).get(user.family_id, ''))
+    finance = Finance.objects.filter(user=user).values_list('finance_id', 'version').first()
+    if finance is None:
+        return None
+    return Scope(f'finance:{finance[0]}', f'{finance[1]}:{rates.version}', finance_id=finance[0])
+
+
+def build(scope, kind_name, params, payload, computed_at=None):
+    return AnalyticsSnapshot(
+        scope_key=scope.key,
+        family_id=scope.family_id,
+        finance_id=scope.finance_id,
+        kind=kind_name,
+        params=params,
+        params_hash=params_hash(params),
+        data_version=scope.version,
+        payload=payload,
+        computed_at=computed_at or timezone.now(),
+    )
+
+
+def save(scope, kind_name, params, payload, computed_at=None):
+    """Upsert the snapshot for (scope, kind, params)"""
+    AnalyticsSnapshot.objects.bulk_create(
+        [build(scope, kind_name, params, payload, computed_at)],
+        update_conflicts=True,
+        unique_fields=['scope_key', 'kind', 'params_hash'],
+        update_fields=['payload', 'data_version', 'computed_at'],
+    )
+
+
+def read(user, kind_name, params=None, background=False, scope=None) -> Result:
+    """Snapshot payload for this request, recomputing it if stale.
+
+    Kinds whose data does not follow the requesting user (a family goal seen by
+    a kid, say) pass their `scope` in.
+    """
+    params = params or {}
+    compute = KINDS[kind_name]
+    # The version is read before computing, so writes made meanwhile leave the new snapshot stale
+    if scope is None:
+        scope = resolve_scope(user, params)
+    if scope is None:
+        return Result(compute(user, **params), timezone.now(), True)
+
+    snapshot = (
+        AnalyticsSnapshot.objects.filter(scope_key=scope.key, kind=kind_name, params_hash=params_hash(params))
+        .only('payload', 'data_version', 'computed_at')
+        .first()
+    )
+    if snapshot and snapshot.data_version == scope.version:
+        return Result(snapshot.payload, snapshot.computed_at, True)
+
+    if background:
+        from . import jobs
+        job = jobs.enqueue(user, kind_name, params)
+        if snapshot:
+            return Result(snapshot.payload, snapshot.computed_at, False, job)
+        return Result(None, None, False, job)
+
+    payload = compute(user, **params)
+    computed_at = timezone.now()
+    save(scope, kind_name, params, payload, computed_at)
+    return Result(payload, computed_at, True)
+
+
+@kind('ai.analyze')
+def analyze(user, scope='user', months_ahead=1):
+    from .ai_service import BudgetAIService, FamilyBudgetAIService
+    if scope == 'family':
+        return FamilyBudgetAIService(user).analyze(months_ahead)
+    return BudgetAIService(user).analyze_spending()
+
+
+@kind('ai.predict')
+def predict(user, months_ahead=1):
+    from .ai_service import BudgetAIService
+    return BudgetAIService(user).predict_monthly_expenses(months_ahead)
+
+
+@kind('ai.forecast')
+def forecast(user, scope='user', months_ahead=3, level=0.8):
+    from .ai_service import FamilyBudgetAIService
+    members = None if scope == 'family' else [user]
+    return FamilyBudgetAIService(user, members=members).forecast(months_ahead, level)
+
+
+@kind('goal.simulate')
+def goal_simulation(user, goal_id, paths, state=None):
+    # `state` (target, current amount, deadline) only keys the snapshot to the goal as it is now
+    from .models import Goal
+    from .simulation import simulate_goal
+    return simulate_goal(Goal.objects.get(pk=goal_id), paths)
+
+
+@kind('ai.recommendations')
+def recommendations(user):
+    from .ai_service import BudgetAIService
+    return BudgetAIService(user).get_budget_recommendations()
+
+
+@kind('ai.anomalies')
+def anomalies(user, threshold=2.0):
+    from .ai_service import BudgetAIService
+    return BudgetAIService(user).detect_anomalies(threshold)
@@ -0,0 +1,300 @@
+"""
+Deterministic synthetic data for benchmarks and load tests.
+
+Everything is created with bulk_create in batches and namespaced by a
+prefix (usernames, emails and family names), so generated data never
+collides with or modifies existing rows. The same seed always produces the
+same dataset.
+"""
+
+import calendar
+import math
+import random
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+from .ledger import ledger_totals
+from .models import Category, Family, Finance, RecurringRule, Transaction, User, _add_months
+from .registry import roles
+
+EXPENSE_CATEGORIES = [
+    'Жилье', 'Продукты', 'Транспорт', 'Развлечения', 'Кафе и рестораны', 'Здоровье',
+    'Подписки', 'Подарки', 'Коммуналка', 'Фитнес', 'Связь', 'Книги',
+]
+INCOME_CATEGORIES = ['Доход']
+
+DEFAULT_PASSWORD = 'synthetic-pass-123'
+
+
+def ensure_categories(names):
+    """Return {name: Category}, creating only the names that are missing"""
+    existing = {}
+    for category in Category.objects.filter(category_name__in=names).order_by('category_id'):
+        existing.setdefault(category.category_name, category)
+    missing = [name for name in names if name not in existing]
+    if missing:
+        Category.objects.bulk_create([Category(category_name=name) for name in missing])
+        for category in Category.objects.filter(category_name__in=missing):
+            existing.setdefault(category.category_name, category)
+    return existing
+
+
+def create_family(prefix, members, password_hash=None):
+    """Create a family with `members` users (the first one is admin) and their finances.
+
+    Returns (family, users, finances).
+    """
+    password_hash = password_hash or make_password(DEFAULT_PASSWORD)
+    admin = User.objects.create(
+        username=f'{prefix}-1', email=f'{prefix}-1@synthetic.local',
+        password=password_hash, role=roles.get('admin'),
+    )
+    family = Family.objects.create(admin=admin, family_name=prefix)
+    admin.family = family
+    admin.save(update_fields=['family'])
+
+    member_role = roles.get('family_member')
+    kid_role = roles.get('kid')
+    User.objects.bulk_create([
+        User(
+            username=f'{prefix}-{i}', email=f'{prefix}-{i}@synthetic.local', password=password_hash,
+            family=family, role=kid_role if i % 4 == 0 else member_role, age=12 if i % 4 == 0 else 35,
+        )
+        for i in range(2, members + 1)
+    ], batch_size=1000)
+    users = list(User.objects.filter(family=family).order_by('user_id'))
+    Finance.objects.bulk_create([Finance(user=user) for user in users], batch_size=1000)
+    finances = list(Finance.objects.filter(user__family=family).order_by('user_id'))
+    return family, users, finances
+
+
+def generate_transactions(finances, count, seed=0, days=365, batch_size=5000, categories=None):
+    """Bulk-insert `count` random transactions spread over the last `days` days"""
+    rng = random.Random(seed)
+    categories = categories or ensure_categories(EXPENSE_CATEGORIES + INCOME_CATEGORIES)
+    expense_categories = [categories[name] for name in EXPENSE_CATEGORIES]
+    income_category = categories[INCOME_CATEGORIES[0]]
+    now = timezone.now()
+    span = days * 24 * 3600
+
+    batch = []
+    for _ in range(count):
+        is_income = rng.random() < 0.1
+        batch.append(Transaction(
+            finance_id=rng.choice(finances).pk,
+            amount=Decimal(round(rng.lognormvariate(9.5 if is_income else 6.5, 0.8), 2)).quantize(Decimal('0.01')),
+            category=income_category if is_income else rng.choice(expense_categories),
+            type='income' if is_income else 'expense',
+            date=now - timedelta(seconds=rng.randrange(span)),
+            description='Зарплата' if is_income else f'Покупка #{rng.randrange(1000)}',
+        ))
+        if len(batch) >= batch_size:
+            Transaction.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        Transaction.objects.bulk_create(batch)
+    refresh_finance_totals(finances)
+
+
+def refresh_finance_totals(finances):
+    """Recompute income/expenses/balance of `finances` with one grouped query"""
+    totals = ledger_totals([finance.pk for finance in finances])
+    for finance in finances:
+        finance.income, finance.expenses = totals.get(finance.pk, (Decimal('0'), Decimal('0')))
+        finance.balance = finance.income - finance.expenses
+        finance.version += 1
+    Finance.objects.bulk_update(finances, ['income', 'expenses', 'balance', 'version'], batch_size=1000)
+
+
+# --- Realistic households for load testing (manage.py generate_load_data) ---
+
+# (description, category, day of month, base amount, payer, type) of recurring
+# payments; payer is 'adult', 'admin' or 'kid'
+RECURRING_PAYMENTS = [
+    ('Зарплата', 'Доход', 5, 50000, 'adult', 'income'),
+    ('Карманные деньги', 'Доход', 1, 3000, 'kid', 'income'),
+    ('Аренда квартиры', 'Жилье', 1, 20000, 'admin', 'expense'),
+    ('Интернет', 'Связь', 5, 1000, 'admin', 'expense'),
+    ('Мобильная связь', 'Связь', 12, 500, 'adult', 'expense'),
+    ('Netflix', 'Подписки', 15, 400, 'admin', 'expense'),
+    ('Spotify', 'Подписки', 20, 270, 'adult', 'expense'),
+    ('Фитнес', 'Фитнес', 10, 1200, 'adult', 'expense'),
+]
+
+# (description, category, visits per month, base amount, seasonal amplitude, peak month, payer)
+VARIABLE_SPENDING = [
+    ('Покупка продуктов', 'Продукты', 8, 3000, 0.15, 12, 'adult'),
+    ('Магнит', 'Продукты', 4, 1200, 0.15, 12, 'adult'),
+    ('Коммуналка', 'Коммуналка', 1, 4000, 0.35, 1, 'admin'),
+    ('Такси', 'Транспорт', 4, 500, 0.25, 1, 'adult'),
+    ('Кафе', 'Кафе и рестораны', 3, 1500, 0.2, 7, 'adult'),
+    ('Доставка', 'Кафе и рестораны', 2, 300, 0.2, 1, 'kid'),
+    ('Кино', 'Развлечения', 1, 800, 0.3, 1, 'kid'),
+    ('Аптека', 'Здоровье', 1, 900, 0.4, 2, 'adult'),
+    ('Подарки', 'Подарки', 0.3, 2500, 1.5, 12, 'adult'),
+    ('Книги', 'Книги', 0.5, 700, 0.5, 9, 'kid'),
+]
+
+
+def _seasonal(amplitude, peak_month, month):
+    """Multiplier following a yearly cosine that peaks in `peak_month`"""
+    return 1 + amplitude * math.cos(2 * math.pi * (month - peak_month) / 12)
+
+
+def _pays(kind, index, is_kid):
+    if kind == 'kid':
+        return is_kid
+    if kind == 'admin':
+        return index == 0
+    return not is_kid
+
+
+def _months_back(months):
+    """First day (aware datetime) of each of the last `months` months, oldest first"""
+    today = timezone.localdate()
+    first = today.replace(day=1)
+    starts = [_add_months(first, -offset, 1) for offset in range(months - 1, -1, -1)]
+    return [timezone.make_aware(datetime.combine(day, datetime.min.time())) for day in starts]
+
+
+class LoadDataGenerator:
+    """Generate families with seasonal income/expenses and recurring payments.
+
+    Rows are streamed into bulk_create in batches of `batch_size`, so memory
+    use stays flat however many transactions are generated.
+    """
+
+    def __init__(self, prefix, seed=0, months=12, batch_size=5000):
+        self.prefix = prefix
+        self.rng = random.Random(seed)
+        self.months = _months_back(months)
+        self.batch_size = batch_size
+        self.now = timezone.now()
+        self.password_hash = make_password(DEFAULT_PASSWORD)
+        names = {row[1] for row in RECURRING_PAYMENTS} | {row[1] for row in VARIABLE_SPENDING}
+        self.categories = ensure_categories(sorted(names))
+        self.stats = {'families': 0, 'users': 0, 'recurring_rules': 0, 'transactions': 0}
+        self._pending = []
+
+    def generate(self, families, min_members, max_members, chunk_size=500):
+        for start in range(0, families, chunk_size):
+            sizes = [self.rng.randint(min_members, max_members)
+                     for _ in range(min(chunk_size, families - start))]
+            households = self._create_households(start, sizes)
+            self._recurring_payments(households)
+            for members in households:
+                self._variable_spending(members)
+            self._flush()
+            refresh_finance_totals([finance for members in households for finance, _ in members])
+        return self.stats
+
+    def _create_households(self, offset, sizes):
+        """Bulk-create admins, families, members and finances for one chunk.
+
+        Returns, per family, a list of (finance, is_kid) with the admin first.
+        """
+        admin_role, member_role, kid_role = roles.get('admin'), roles.get('family_member'), roles.get('kid')
+        names = [f'{self.prefix}-f{offset + i}' for i in range(len(sizes))]
+        admins = User.objects.bulk_create([
+            User(username=f'{name}-1', email=f'{name}-1@synthetic.local', password=self.password_hash,
+                 role=admin_role, age=self.rng.randint(28, 60))
+            for name in names
+        ])
+        families = Family.objects.bulk_create([
+            Family(admin=admin, family_name=name) for admin, name in zip(admins, names)
+        ])
+        User.objects.filter(pk__in=[admin.pk for admin in admins]).update(
+            family=Subquery(Family.objects.filter(admin=OuterRef('pk')).values('pk')[:1])
+        )
+        members = []
+        for family, name, size in zip(families, names, sizes):
+            for i in range(2, size + 1):
+                is_kid = i > 2 and self.rng.random() < 0.5
+                members.append(User(
+                    username=f'{name}-{i}', email=f'{name}-{i}@synthetic.local', password=self.password_hash,
+                    family=family, role=kid_role if is_kid else member_role,
+                    age=self.rng.randint(6, 17) if is_kid else self.rng.randint(25, 60),
+                ))
+        User.objects.bulk_create(members, batch_size=1000)
+
+        users = list(User.objects.filter(family__in=families).order_by('family_id', 'user_id')
+                     .values_list('user_id', 'family_id', 'role_id'))
+        Finance.objects.bulk_create([Finance(user_id=user_id) for user_id, _, _ in users], batch_size=1000)
+        finance_by_user = {f.user_id: f for f in Finance.objects.filter(user__family__in=families)}
+
+        households = {}
+        for user_id, family_id, role_id in users:
+            households.setdefault(family_id, []).append((finance_by_user[user_id], role_id == kid_role.pk))
+        self.stats['families'] += len(families)
+        self.stats['users'] += len(users)
+        return [households[family.pk] for family in families]
+
+    def _recurring_payments(self, households):
+        """Create recurring rules for a chunk of households plus their past occurrences"""
+        rng = self.rng
+        rules = []
+        for members in households:
+            for index, (finance, is_kid) in enumerate(members):
+                for description, category, day, base, payer, tx_type in RECURRING_PAYMENTS:
+                    # Not every adult has every subscription
+                    if not _pays(payer, index, is_kid) or (payer == 'adult' and tx_type == 'expense' and rng.random() < 0.4):
+                        continue
+                    amount = Decimal(round(base * rng.uniform(0.7, 1.6), -1)).quantize(Decimal('0.01'))
+                    start = self.months[0].replace(day=day)
+                    rules.append(RecurringRule(
+                        finance=finance, amount=amount, category=self.categories[category], type=tx_type,
+                        description=description, frequency='monthly', start_date=start, next_run=start,
+                    ))
+        # History is materialized up front, so rules are created with their final next_run
+        occurrences = []
+        for rule in rules:
+            dates, rule.next_run = rule.due_occurrences(self.now)
+            occurrences.append(dates)
+        RecurringRule.objects.bulk_create(rules, batch_size=1000)
+        self.stats['recurring_rules'] += len(rules)
+        for rule, dates in zip(rules, occurrences):
+            for date in dates:
+                self._add(Transaction(
+                    finance=rule.finance, amount=rule.amount, category=rule.category, type=rule.type,
+                    description=rule.description, date=date, recurring_rule=rule,
+                ))
+
+    def _variable_spending(self, members):
+        """Day-to-day expenses following each category's seasonal curve"""
+        rng = self.rng
+        for index, (finance, is_kid) in enumerate(members):
+            for description, category, per_month, base, amplitude, peak, payer in VARIABLE_SPENDING:
+                if not _pays(payer, index, is_kid):
+                    continue
+                for month_start in self.months:
+                    factor = _seasonal(amplitude, peak, month_start.month)
+                    days = calendar.monthrange(month_start.year, month_start.month)[1]
+                    # Binomial number of visits with mean `per_month`
+                    trials = int(per_month * 2) + 1
+                    visits = sum(rng.random() < per_month / trials for _ in range(trials))
+                    for _ in range(visits):
+                        date = month_start + timedelta(days=rng.randrange(days),
+                                                       seconds=rng.randrange(8 * 3600, 22 * 3600))
+                        if date > self.now:
+                            continue
+                        amount = max(base * factor * rng.lognormvariate(0, 0.35), 10)
+                        self._add(Transaction(
+                            finance=finance, amount=Decimal(round(amount, 2)).quantize(Decimal('0.01')),
+                            category=self.categories[category], type='expense',
+                            description=description, date=date,
+                        ))
+
+    def _add(self, transaction):
+        self._pending.append(transaction)
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        if self._pending:
+            Transaction.objects.bulk_create(self._pending)
+            self.stats['transactions'] += len(self._pending)
+            self._pending = []
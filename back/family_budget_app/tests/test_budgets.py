@@ -0,0 +1,85 @@
+from decimal import Decimal
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from family_budget_app.models import Category, CategoryBudget, Transaction
+from family_budget_app.synthetic import create_family
+
+
+class CategoryBudgetTests(TestCase):
+    def setUp(self):
+        self.family, users, self.finances = create_family('budgets', 2)
+        self.food = Category.objects.create(category_name='Food')
+        self.fun = Category.objects.create(category_name='Fun')
+        self.month = timezone.localdate().replace(day=1)
+        self.client = APIClient(HTTP_HOST='localhost')
+        self.client.force_authenticate(users[0])
+
+    def _spend(self, amount, category, finance=0):
+        return Transaction.objects.create(
+            finance=self.finances[finance], amount=Decimal(amount), type='expense', category=category,
+        )
+
+    def _create(self, category, limit='500.00'):
+        return self.client.post('/api/budgets/', {
+            'category': category.pk, 'month': self.month.isoformat(), 'limit': limit,
+        }, format='json')
+
+    def _spent(self, budget_id):
+        return CategoryBudget.objects.get(pk=budget_id).spent
+
+    def test_create_seeds_counter_and_writes_maintain_it(self):
+        self._spend('120', self.food)
+        budget_id = self._create(self.food).data['budget_id']
+        self.assertEqual(self._spent(budget_id), Decimal('120'))
+
+        expense = self._spend('30', self.food, finance=1)
+        self.assertEqual(self._spent(budget_id), Decimal('150'))
+        expense.category = self.fun
+        expense.save()
+        self.assertEqual(self._spent(budget_id), Decimal('120'))
+        expense.category = self.food
+        expense.save()
+        expense.delete()
+        self.assertEqual(self._spent(budget_id), Decimal('120'))
+
+    def test_changing_category_recomputes_spent(self):
+        self._spend('120', self.food)
+        self._spend('45', self.fun)
+        budget_id = self._create(self.food).data['budget_id']
+        response = self.client.patch(f'/api/budgets/{budget_id}/', {'category': self.fun.pk}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['spent'], '45.00')
+        self.assertEqual(self._spent(budget_id), CategoryBudget.objects.get(pk=budget_id).compute_spent())
+
+    def test_changing_month_recomputes_spent(self):
+        self._spend('120', self.food)
+        budget_id = self._create(self.food).data['budget_id']
+        response = self.client.patch(
+            f'/api/budgets/{budget_id}/', {'month': f'{self.month.year - 1}-01-01'}, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['spent'], '0.00')
+
+    def test_duplicate_budgets_are_rejected(self):
+        self.assertEqual(self._create(self.food).status_code, 201)
+        self.assertEqual(self._create(self.food).status_code, 400)
+        fun_id = self._create(self.fun).data['budget_id']
+        response = self.client.patch(f'/api/budgets/{fun_id}/', {'category': self.food.pk}, format='json')
+        self.assertEqual(response.status_code, 400)
+        # Saving a budget onto its own key is not a duplicate
+        response = self.client.patch(f'/api/budgets/{fun_id}/', {'limit': '50.00'}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+    def test_status_totals(self):
+        self._spend('600', self.food)
+        self._spend('20', self.fun)
+        self._create(self.food)
+        self._create(self.fun, limit='100.00')
+        response = self.client.get('/api/budgets/status/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total_limit'], 600.0)
+        self.assertEqual(response.data['total_spent'], 620.0)
+        self.assertEqual(response.data['over_budget_count'], 1)
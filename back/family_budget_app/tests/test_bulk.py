@@ -0,0 +1,69 @@
+from decimal import Decimal
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from family_budget_app.ledger import ledger_totals
+from family_budget_app.models import Category, CategoryBudget, Finance, Transaction
+from family_budget_app.synthetic import create_family
+
+
+class BulkTransactionTests(TestCase):
+    def setUp(self):
+        self.family, users, self.finances = create_family('bulk', 2)
+        self.food = Category.objects.create(category_name='Food')
+        self.fun = Category.objects.create(category_name='Fun')
+        month = timezone.localdate().replace(day=1)
+        self.food_budget = CategoryBudget.objects.create(family=self.family, category=self.food, month=month, limit=1000)
+        self.fun_budget = CategoryBudget.objects.create(family=self.family, category=self.fun, month=month, limit=1000)
+        self.ids = [
+            Transaction.objects.create(
+                finance=self.finances[i % 2], amount=Decimal(amount), type='expense', category=self.food,
+            ).pk
+            for i, amount in enumerate(('10', '20', '30'))
+        ]
+        self.income = Transaction.objects.create(finance=self.finances[0], amount=Decimal('500'), type='income')
+        self.client = APIClient(HTTP_HOST='localhost')
+        self.client.force_authenticate(users[0])
+
+    def assertLedgerConsistent(self):
+        totals = ledger_totals([finance.pk for finance in self.finances])
+        for finance in Finance.objects.filter(pk__in=[f.pk for f in self.finances]):
+            income, expenses = totals.get(finance.pk, (Decimal('0'), Decimal('0')))
+            self.assertEqual((finance.income, finance.expenses), (income, expenses))
+            self.assertEqual(finance.balance, income - expenses)
+
+    def _spent(self, budget):
+        budget.refresh_from_db()
+        return budget.spent
+
+    def test_bulk_delete_reverses_totals_and_counters(self):
+        response = self.client.post('/api/transactions/bulk_delete/', {'ids': self.ids[:2]}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['deleted'], 2)
+        self.assertFalse(Transaction.objects.filter(pk__in=self.ids[:2]).exists())
+        self.assertEqual(self._spent(self.food_budget), Decimal('30'))
+        self.assertLedgerConsistent()
+
+    def test_bulk_update_moves_budget_spending(self):
+        response = self.client.post(
+            '/api/transactions/bulk_update/', {'ids': self.ids, 'category': self.fun.pk}, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['updated'], 3)
+        self.assertEqual(self._spent(self.food_budget), Decimal('0'))
+        self.assertEqual(self._spent(self.fun_budget), Decimal('60'))
+        self.assertLedgerConsistent()
+
+    def test_invisible_ids_reject_the_whole_request(self):
+        _, _, (stranger,) = create_family('bulk-other', 1)
+        foreign = Transaction.objects.create(finance=stranger, amount=Decimal('5'), type='expense').pk
+        response = self.client.post('/api/transactions/bulk_delete/', {'ids': [self.ids[0], foreign]}, format='json')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.data['ids'], [foreign])
+        self.assertEqual(Transaction.objects.filter(pk__in=[self.ids[0], foreign]).count(), 2)
+        response = self.client.post(
+            '/api/transactions/bulk_update/', {'ids': [foreign], 'description': 'mine now'}, format='json'
+        )
+        self.assertEqual(response.status_code, 404)
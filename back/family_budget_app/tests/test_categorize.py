@@ -0,0 +1,58 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from family_budget_app.ai_service import suggest_categories
+from family_budget_app.models import Category, Transaction
+from family_budget_app.synthetic import create_family
+
+
+class AutoCategorizeTests(TestCase):
+    def setUp(self):
+        _, users, _ = create_family('categorize', 1)
+        self.cafe = Category.objects.create(category_name='Кафе и рестораны')
+        self.transport = Category.objects.create(category_name='Транспорт')
+        self.client = APIClient(HTTP_HOST='localhost')
+        self.client.force_authenticate(users[0])
+
+    def _create(self, **row):
+        return self.client.post('/api/transactions/', {'amount': '5.00', 'type': 'expense', **row}, format='json')
+
+    def test_create_files_expenses_under_stored_categories(self):
+        response = self._create(description='Lunch at the cafe')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Transaction.objects.get(pk=response.data['transaction_id']).category, self.cafe)
+
+    def test_explicit_null_and_income_are_left_alone(self):
+        explicit = self._create(description='Taxi home', category=None).data['transaction_id']
+        income = self._create(description='Taxi refund', type='income').data['transaction_id']
+        self.assertEqual(
+            list(Transaction.objects.filter(pk__in=[explicit, income]).values_list('category', flat=True)),
+            [None, None],
+        )
+
+    def test_suggestions_never_create_categories(self):
+        before = Category.objects.count()
+        response = self._create(description='coffee shop')
+        self.assertIsNone(Transaction.objects.get(pk=response.data['transaction_id']).category)
+        self.assertEqual(Category.objects.count(), before)
+
+    def test_import_categorizes_in_one_batch(self):
+        rows = [
+            {'amount': '5.00', 'type': 'expense', 'description': description}
+            for description in ('Taxi to work', 'Dinner', 'Something else', 'Taxi to work')
+        ]
+        response = self.client.post('/api/transactions/import/', {'transactions': rows}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['categorized'], 3)
+        self.assertEqual(
+            [row['category'] for row in response.data['transactions']],
+            [self.transport.pk, self.cafe.pk, None, self.transport.pk],
+        )
+
+    def test_categories_removed_elsewhere_are_not_assigned(self):
+        self.assertEqual(suggest_categories(['Taxi']), [self.transport])
+        # A queryset delete sends no model save/delete hooks, as in another process
+        Category.objects.filter(pk=self.transport.pk).delete()
+        self.assertEqual(suggest_categories(['Taxi']), [None])
+        renamed = Category.objects.create(category_name='Transportation')
+        self.assertEqual(suggest_categories(['Taxi', 'nothing to see']), [renamed, None])
@@ -0,0 +1,72 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.test import TestCase
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework.test import APIClient
+
+from family_budget_app.models import ExchangeRate, Finance, Transaction, User
+from family_budget_app.rates import cache
+from family_budget_app.synthetic import create_family
+
+
+class ConditionalGetTests(TestCase):
+    URL = '/api/families/family_transactions/'
+
+    def setUp(self):
+        self.family, users, self.finances = create_family('conditional', 2)
+        self.user = users[0]
+        Transaction.objects.create(finance=self.finances[0], amount=Decimal('10'), type='expense')
+        self.client = APIClient(HTTP_HOST='localhost')
+        self.client.force_authenticate(self.user)
+
+    def _get(self, url=None, **headers):
+        return self.client.get(url or self.URL, **headers)
+
+    def _revalidate(self, response, url=None):
+        return self._get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+    def test_unchanged_data_is_not_modified(self):
+        first = self._get()
+        self.assertEqual(first.status_code, 200)
+        second = self._revalidate(first)
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_writes_and_membership_changes_invalidate(self):
+        first = self._get()
+        Transaction.objects.create(finance=self.finances[1], amount=Decimal('5'), type='income')
+        self.assertEqual(self._revalidate(first).status_code, 200)
+
+        second = self._get()
+        newcomer = User.objects.create(username='newcomer', email='newcomer@example.com', family=self.family)
+        Finance.objects.create(user=newcomer)
+        self.assertEqual(self._revalidate(second).status_code, 200)
+
+    def test_query_string_is_part_of_the_tag(self):
+        full = self._get()
+        sparse = self._get(f'{self.URL}?fields=amount')
+        self.assertNotEqual(full['ETag'], sparse['ETag'])
+        self.assertEqual(self._revalidate(full, f'{self.URL}?fields=amount').status_code, 200)
+
+    def test_if_modified_since_alone_never_gives_304(self):
+        response = self._get()
+        self.assertNotIn('Last-Modified', response)
+        User.objects.create(username='newcomer', email='newcomer@example.com', family=self.family)
+        later = http_date((timezone.now() + timedelta(days=1)).timestamp())
+        self.assertEqual(self._get(HTTP_IF_MODIFIED_SINCE=later).status_code, 200)
+
+    def test_summary_changes_with_exchange_rates(self):
+        url = '/api/finance/summary/'
+        first = self._get(url)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(self._revalidate(first, url).status_code, 304)
+        ExchangeRate.objects.create(
+            from_currency='USD', to_currency=settings.BASE_CURRENCY, date=timezone.localdate(), rate=Decimal('500'),
+        )
+        # The process-wide rate table must not outlive the test's data
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.assertEqual(self._revalidate(first, url).status_code, 200)
@@ -0,0 +1,78 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from family_budget_app.models import Transaction
+from family_budget_app.synthetic import create_family
+
+
+class DuplicateTransactionTests(TestCase):
+    ROW = {'amount': '12.50', 'type': 'expense', 'date': '2026-03-14T10:00:00Z', 'description': 'Coffee  shop'}
+
+    def setUp(self):
+        _, users, self.finances = create_family('duplicates', 1)
+        self.client = APIClient(HTTP_HOST='localhost')
+        self.client.force_authenticate(users[0])
+        self.original = self._create({**self.ROW, 'description': 'coffee shop!'}).data['transaction_id']
+
+    def _create(self, row, mode=None):
+        query = f'?on_duplicate={mode}' if mode else ''
+        return self.client.post(f'/api/transactions/{query}', row, format='json')
+
+    def _import(self, rows, mode):
+        return self.client.post(
+            f'/api/transactions/import/?on_duplicate={mode}', {'transactions': rows}, format='json'
+        )
+
+    def test_fingerprint_ignores_description_formatting(self):
+        stored = Transaction.objects.get(pk=self.original)
+        self.assertEqual(stored.fingerprint, stored.compute_fingerprint())
+        copy = Transaction.objects.get(pk=self._create(self.ROW, 'allow').data['transaction_id'])
+        self.assertEqual(copy.fingerprint, stored.fingerprint)
+        self.assertNotIn('duplicate_of', self._create({**self.ROW, 'amount': '12.51'}).data)
+
+    def test_create_modes(self):
+        flagged = self._create(self.ROW)
+        self.assertEqual(flagged.status_code, 201)
+        self.assertEqual(flagged.data['duplicate_of'], [self.original])
+
+        rejected = self._create(self.ROW, 'reject')
+        self.assertEqual(rejected.status_code, 409)
+        self.assertEqual(rejected.data['duplicate_of'], [self.original, flagged.data['transaction_id']])
+
+        allowed = self._create(self.ROW, 'allow')
+        self.assertEqual(allowed.status_code, 201)
+        self.assertNotIn('duplicate_of', allowed.data)
+        self.assertEqual(Transaction.objects.count(), 3)
+        self.assertEqual(self._create(self.ROW, 'sometimes').status_code, 400)
+
+    def test_import_modes(self):
+        other = {**self.ROW, 'description': 'Bakery'}
+        response = self._import([other, self.ROW], 'reject')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.data['created'], response.data['skipped']), (1, 1))
+        self.assertEqual(response.data['duplicates'], [{'index': 1, 'duplicate_of': [self.original]}])
+
+        response = self._import([self.ROW, self.ROW], 'flag')
+        self.assertEqual(response.data['created'], 2)
+        self.assertEqual([d['index'] for d in response.data['duplicates']], [0, 1])
+
+        response = self._import([self.ROW], 'allow')
+        self.assertEqual((response.data['created'], response.data['duplicates']), (1, []))
+
+    def test_groups_and_bulk_description_changes(self):
+        copy = self._create(self.ROW).data['transaction_id']
+        self._create({**self.ROW, 'description': 'Bakery'})
+        response = self.client.get('/api/transactions/duplicates/')
+        self.assertEqual(response.data['count'], 1)
+        group, = response.data['results']
+        self.assertEqual(group['size'], 2)
+        self.assertEqual([t['transaction_id'] for t in group['transactions']], [self.original, copy])
+
+        response = self.client.post(
+            '/api/transactions/bulk_update/', {'ids': [copy], 'description': 'Bakery'}, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        moved = Transaction.objects.get(pk=copy)
+        self.assertEqual(moved.fingerprint, moved.compute_fingerprint())
+        group, = self.client.get('/api/transactions/duplicates/').data['results']
+        self.assertNotIn(self.original, [t['transaction_id'] for t in group['transactions']])
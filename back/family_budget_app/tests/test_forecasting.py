@@ -0,0 +1,104 @@
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+
+import numpy as np
+from django.test import SimpleTestCase, TestCase
+
+from family_budget_app import forecasting
+from family_budget_app.ai_service import BudgetAIService
+from family_budget_app.models import Transaction
+from family_budget_app.synthetic import create_family
+
+# A yearly shape: quiet spring, expensive summer holidays and December
+PATTERN = np.array([0, -100, -150, -150, -50, 100, 300, 250, 0, -50, -50, 300], dtype=np.float64)
+
+
+def seasonal_series(years, level=1000.0, noise=20.0, seed=0):
+    rng = np.random.default_rng(seed)
+    return level + np.tile(PATTERN, years) + rng.normal(0, noise, years * forecasting.SEASON)
+
+
+class ForecastTests(SimpleTestCase):
+    def test_recovers_the_yearly_pattern(self):
+        result = forecasting.forecast(seasonal_series(4), forecasting.SEASON)
+        self.assertTrue(result.seasonal)
+        self.assertEqual(result.method, 'holt_winters')
+        self.assertEqual(result.mean.shape, (1, forecasting.SEASON))
+        self.assertLess(np.abs(result.mean[0] - (1000 + PATTERN)).max(), 60)
+        self.assertGreater(result.r2[0], 0.8)
+
+    def test_intervals_widen_with_the_horizon(self):
+        result = forecasting.forecast(seasonal_series(3, noise=80), 18)
+        width = result.upper[0] - result.lower[0]
+        self.assertTrue((np.diff(width) >= -1e-9).all())
+        self.assertGreater(width[-1], width[0])
+        self.assertTrue(((result.lower <= result.mean) & (result.mean <= result.upper)).all())
+        wider = forecasting.forecast(seasonal_series(3, noise=80), 18, level=0.95)
+        self.assertTrue((wider.upper - wider.lower >= width - 1e-9).all())
+
+    def test_short_histories_drop_the_season(self):
+        with self.assertRaises(ValueError):
+            forecasting.forecast([[100.0] * (forecasting.MIN_MONTHS - 1)], 3)
+        two = forecasting.forecast([[100.0, 120.0]], 3)
+        self.assertFalse(two.seasonal)
+        self.assertEqual(two.method, 'holt')
+        self.assertEqual(two.mean.shape, (1, 3))
+        self.assertFalse(forecasting.forecast([seasonal_series(2)[:-1]], 3).seasonal)
+        self.assertTrue(forecasting.forecast([seasonal_series(2)], 3).seasonal)
+
+    def test_rows_are_forecast_independently_and_never_negative(self):
+        falling = np.linspace(500, 0, 36)
+        rows = np.vstack([seasonal_series(3), falling])
+        batch = forecasting.forecast(rows, 6)
+        for i, row in enumerate(rows):
+            alone = forecasting.forecast(row, 6)
+            np.testing.assert_allclose(batch.mean[i], alone.mean[0])
+            np.testing.assert_allclose(batch.upper[i], alone.upper[0])
+        self.assertTrue((batch.lower >= 0).all())
+
+    def test_backtest_scores_every_method(self):
+        report = forecasting.backtest(np.vstack([seasonal_series(4, seed=s) for s in range(3)]), horizon=3, folds=4)
+        self.assertEqual((report['series'], report['folds']), (3, 4))
+        self.assertEqual(report['methods'], ['holt_winters'])
+        self.assertEqual(set(report['accuracy']), {'holt_winters', 'naive', 'linear'})
+        self.assertLess(report['accuracy']['holt_winters']['mae'], report['accuracy']['linear']['mae'])
+        self.assertTrue(0 <= report['interval_coverage'] <= 1)
+        with self.assertRaises(ValueError):
+            forecasting.backtest([[1.0, 2.0, 3.0]], horizon=3)
+
+
+class PredictMonthlyExpensesTests(TestCase):
+    def setUp(self):
+        _, (self.user,), (self.finance,) = create_family('forecast', 1)
+
+    def _month(self, index, amount, type='expense'):
+        year, month = divmod(index, 12)
+        return Transaction(
+            finance=self.finance, amount=Decimal(amount), type=type,
+            date=datetime(2022 + year, month + 1, 15, tzinfo=dt_timezone.utc),
+        )
+
+    def test_output_shape(self):
+        expenses = seasonal_series(3)
+        Transaction.objects.bulk_create(
+            [self._month(i, f'{value:.2f}') for i, value in enumerate(expenses)]
+            + [self._month(i, '2000', 'income') for i in range(len(expenses))]
+        )
+        result = BudgetAIService(self.user).predict_monthly_expenses(months_ahead=3)
+        self.assertEqual(result['method'], 'holt_winters')
+        self.assertEqual(result['historical_months'], 36)
+        self.assertEqual(result['prediction_months'], ['2025-01', '2025-02', '2025-03'])
+        for key in ('predicted_expenses', 'predicted_income', 'predicted_net'):
+            self.assertEqual(len(result[key]), 3, key)
+        self.assertEqual(set(result['intervals']['expenses']), {'predicted', 'lower', 'upper'})
+        self.assertTrue(0 <= result['confidence_score'] <= 1)
+
+    def test_too_little_history(self):
+        Transaction.objects.bulk_create([self._month(0, '10'), self._month(0, '20')])
+        result = BudgetAIService(self.user).predict_monthly_expenses()
+        self.assertEqual(result['predicted_expenses'], [])
+        Transaction.objects.bulk_create([self._month(0, '30')])
+        result = BudgetAIService(self.user).predict_monthly_expenses()
+        self.assertEqual(result['prediction_months'], [])
+        Transaction.objects.bulk_create([self._month(1, '30')])
+        self.assertEqual(BudgetAIService(self.user).predict_monthly_expenses()['method'], 'holt')
@@ -0,0 +1,67 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from family_budget_app.ledger import apply_transactions
+from family_budget_app.models import Category, Goal, Transaction
+from family_budget_app.synthetic import create_family
+
+
+class GoalProgressTests(TestCase):
+    def setUp(self):
+        self.family, self.users, self.finances = create_family('goals', 2)
+        self.category = Category.objects.create(category_name='Savings')
+        self.goal = Goal.objects.create(
+            family=self.family, goal_name='Car', target_amount=Decimal('1000'),
+            category=self.category, deadline=timezone.localdate() + timedelta(days=365),
+        )
+        self.client = APIClient(HTTP_HOST='localhost')
+        self.client.force_authenticate(self.users[0])
+
+    def _add(self, amount, type='expense', finance=0):
+        return Transaction.objects.create(
+            finance=self.finances[finance], amount=Decimal(amount), type=type, category=self.category,
+        )
+
+    def _current(self):
+        self.goal.refresh_from_db()
+        return self.goal.current_amount
+
+    def test_expenses_contribute_and_income_withdraws(self):
+        self._add('300')
+        self._add('200', finance=1)
+        self.assertEqual(self._current(), Decimal('500'))
+        self._add('50', type='income')
+        self.assertEqual(self._current(), Decimal('450'))
+
+    def test_update_and_delete_move_progress(self):
+        saving = self._add('300')
+        saving.amount = Decimal('100')
+        saving.save()
+        self.assertEqual(self._current(), Decimal('100'))
+        saving.type = 'income'
+        saving.save()
+        self.assertEqual(self._current(), Decimal('-100'))
+        saving.delete()
+        self.assertEqual(self._current(), Decimal('0'))
+
+    def test_bulk_writes_match_recalculate(self):
+        rows = [
+            Transaction(finance=self.finances[0], amount=Decimal('40'), type=type, goal=self.goal)
+            for type in ('expense', 'expense', 'income')
+        ]
+        Transaction.objects.bulk_create(rows)
+        apply_transactions(rows)
+        self.assertEqual(self._current(), Decimal('40'))
+        self.goal.recalculate()
+        self.assertEqual(self._current(), Decimal('40'))
+
+    def test_current_amount_is_read_only(self):
+        self._add('300')
+        response = self.client.patch(f'/api/goals/{self.goal.pk}/', {'current_amount': '999'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['current_amount'], '300.00')
+        self.assertEqual(self._current(), Decimal('300'))
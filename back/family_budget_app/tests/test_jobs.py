@@ -0,0 +1,56 @@
+from unittest import mock
+
+from django.db import IntegrityError, transaction
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from family_budget_app import jobs
+from family_budget_app.models import Job
+from family_budget_app.synthetic import create_family
+
+
+class JobQueueTests(TestCase):
+    def setUp(self):
+        _, users, _ = create_family('jobs', 1)
+        self.user = users[0]
+        self.client = APIClient(HTTP_HOST='localhost')
+        self.client.force_authenticate(self.user)
+
+    def test_identical_requests_share_a_job(self):
+        first = jobs.enqueue(self.user, 'ai.predict', {'months_ahead': 2})
+        self.assertEqual(jobs.enqueue(self.user, 'ai.predict', {'months_ahead': 2}).pk, first.pk)
+        self.assertNotEqual(jobs.enqueue(self.user, 'ai.predict', {'months_ahead': 3}).pk, first.pk)
+        Job.objects.filter(pk=first.pk).update(status='done')
+        self.assertNotEqual(jobs.enqueue(self.user, 'ai.predict', {'months_ahead': 2}).pk, first.pk)
+
+    def test_active_duplicates_are_rejected_by_the_database(self):
+        job = jobs.enqueue(self.user, 'ai.predict', {})
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Job.objects.create(user=self.user, kind=job.kind, params={}, params_hash=job.params_hash)
+
+    def test_enqueue_returns_the_job_a_concurrent_request_queued(self):
+        job = jobs.enqueue(self.user, 'ai.predict', {})
+        real_filter = Job.objects.filter
+        calls = []
+
+        def racing_filter(*args, **kwargs):
+            # The first lookup misses, as if the other request had not committed yet
+            calls.append(kwargs)
+            return Job.objects.none() if len(calls) == 1 else real_filter(*args, **kwargs)
+
+        with mock.patch.object(Job.objects, 'filter', side_effect=racing_filter):
+            self.assertEqual(jobs.enqueue(self.user, 'ai.predict', {}).pk, job.pk)
+        self.assertEqual(Job.objects.count(), 1)
+
+    def test_failures_are_logged_not_exposed(self):
+        def broken(user):
+            raise RuntimeError('SELECT secret FROM internals')
+
+        with mock.patch.dict(jobs.HANDLERS, {'test.broken': broken}):
+            job = jobs.enqueue(self.user, 'test.broken')
+            with self.assertLogs('family_budget_app.jobs', 'ERROR') as logs:
+                self.assertFalse(jobs.run(jobs.claim_next('test')))
+        self.assertIn('SELECT secret', logs.output[0])
+        response = self.client.get(f'/api/jobs/{job.pk}/')
+        self.assertEqual(response.data['status'], 'failed')
+        self.assertEqual(response.data['error'], jobs.FAILED_MESSAGE)
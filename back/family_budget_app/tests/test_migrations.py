@@ -0,0 +1,54 @@
+from decimal import Decimal
+
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+
+from family_budget_app.search import repair
+
+APP = 'family_budget_app'
+
+
+class MoneyCentsMigrationTests(TransactionTestCase):
+    # Other tests rely on the roles seeded by 0003_seed_roles
+    serialized_rollback = True
+    before = [(APP, '0010_transaction_search')]
+    after = [(APP, '0011_money_cents')]
+
+    def setUp(self):
+        self.addCleanup(self._migrate_to_latest)
+        self.apps = self._migrate(self.before)
+
+    def _migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        # As the post_migrate hook does; otherwise rows written now miss the search index
+        repair(connection)
+        return executor.loader.project_state(targets).apps
+
+    def _migrate_to_latest(self):
+        self._migrate(MigrationExecutor(connection).loader.graph.leaf_nodes(APP))
+
+    def _column(self, table, column, pk_column, pk):
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT "{column}" FROM "{table}" WHERE "{pk_column}" = %s', [pk])
+            return cursor.fetchone()[0]
+
+    def test_amounts_survive_a_round_trip(self):
+        User = self.apps.get_model(APP, 'User')
+        Finance = self.apps.get_model(APP, 'Finance')
+        Transaction = self.apps.get_model(APP, 'Transaction')
+        user = User.objects.create(username='cents', email='cents@example.com')
+        finance = Finance.objects.create(user=user, balance=Decimal('-12.35'), income=Decimal('0.10'))
+        transaction = Transaction.objects.create(finance=finance, amount=Decimal('1234.56'), type='expense')
+
+        self._migrate(self.after)
+        self.assertEqual(self._column('family_budget_app_transaction', 'amount', 'transaction_id', transaction.pk), 123456)
+        self.assertEqual(self._column('family_budget_app_finance', 'balance', 'finance_id', finance.pk), -1235)
+        self.assertEqual(self._column('family_budget_app_finance', 'income', 'finance_id', finance.pk), 10)
+
+        apps = self._migrate(self.before)
+        self.assertEqual(apps.get_model(APP, 'Transaction').objects.get(pk=transaction.pk).amount, Decimal('1234.56'))
+        restored = apps.get_model(APP, 'Finance').objects.get(pk=finance.pk)
+        self.assertEqual((restored.balance, restored.income), (Decimal('-12.35'), Decimal('0.10')))
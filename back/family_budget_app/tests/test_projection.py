@@ -0,0 +1,50 @@
+from decimal import Decimal
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from family_budget_app.models import Category, CategoryBudget, Transaction
+from family_budget_app.synthetic import create_family
+
+
+class SparseFieldsTests(TestCase):
+    def setUp(self):
+        self.family, users, self.finances = create_family('projection', 1)
+        self.food = Category.objects.create(category_name='Food')
+        self.client = APIClient(HTTP_HOST='localhost')
+        self.client.force_authenticate(users[0])
+
+    def test_fields_trim_list_output(self):
+        Transaction.objects.create(finance=self.finances[0], amount=Decimal('10'), type='expense')
+        response = self.client.get('/api/transactions/?fields=transaction_id,amount')
+        self.assertEqual(response.status_code, 200)
+        rows = response.data['results'] if isinstance(response.data, dict) else response.data
+        self.assertEqual(set(rows[0]), {'transaction_id', 'amount'})
+
+    def test_fields_do_not_skip_validation_on_write(self):
+        response = self.client.post('/api/transactions/?fields=amount', {'amount': '5.00'}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('type', response.data)
+        self.assertFalse(Transaction.objects.exists())
+
+    def test_fields_trim_the_write_response(self):
+        response = self.client.post(
+            '/api/transactions/?fields=transaction_id', {'amount': '5.00', 'type': 'expense'}, format='json'
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(set(response.data), {'transaction_id'})
+        self.assertEqual(Transaction.objects.get().type, 'expense')
+
+    def test_budget_status_totals_ignore_fields(self):
+        month = timezone.localdate().replace(day=1)
+        CategoryBudget.objects.create(family=self.family, category=self.food, month=month, limit=100)
+        Transaction.objects.create(
+            finance=self.finances[0], amount=Decimal('150'), type='expense', category=self.food,
+        )
+        response = self.client.get('/api/budgets/status/?fields=limit')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['budgets'], [{'limit': '100.00'}])
+        self.assertEqual(response.data['total_limit'], 100.0)
+        self.assertEqual(response.data['total_spent'], 150.0)
+        self.assertEqual(response.data['over_budget_count'], 1)
@@ -0,0 +1,72 @@
+import os
+import subprocess
+import sys
+import tempfile
+from decimal import Decimal
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from family_budget_app.ai_service import BudgetAIService
+from family_budget_app.models import Category, ExchangeRate, Transaction
+from family_budget_app.rates import cache
+from family_budget_app.synthetic import create_family
+
+
+class ConversionTests(TestCase):
+    def setUp(self):
+        _, users, self.finances = create_family('rates', 2)
+        self.user = users[0]
+        self.food = Category.objects.create(category_name='Food')
+        ExchangeRate.objects.create(
+            from_currency='USD', to_currency=settings.BASE_CURRENCY,
+            date=timezone.localdate().replace(day=1), rate=Decimal('450'),
+        )
+        cache.clear()
+        self.addCleanup(cache.clear)
+        for finance, amount, currency in ((0, '10.00', 'USD'), (1, '500.00', settings.BASE_CURRENCY)):
+            Transaction.objects.create(
+                finance=self.finances[finance], amount=Decimal(amount), currency=currency,
+                type='expense', category=self.food,
+            )
+        self.client = APIClient(HTTP_HOST='localhost')
+        self.client.force_authenticate(self.user)
+
+    def test_grouped_totals_are_in_the_base_currency(self):
+        response = self.client.get('/api/transactions/by_category/')
+        self.assertEqual(response.data['Food']['total'], 5000.0)
+        response = self.client.get('/api/transactions/by_user/')
+        self.assertEqual(response.data[self.user.username]['total'], 4500.0)
+
+    def test_analysis_uses_base_currency_amounts(self):
+        transactions = BudgetAIService(self.user).transactions
+        self.assertEqual([(t.amount, t.currency) for t in transactions], [(Decimal('4500.00'), settings.BASE_CURRENCY)])
+
+    def test_version_follows_corrected_rates(self):
+        day = timezone.localdate().replace(day=1).isoformat()
+
+        def load(rate):
+            with tempfile.NamedTemporaryFile('w', suffix='.csv') as handle:
+                handle.write(f'{day},USD,{settings.BASE_CURRENCY},{rate}\n')
+                handle.flush()
+                call_command('load_exchange_rates', handle.name, stdout=StringIO())
+            return cache.version
+
+        before = load('450')
+        # Same row corrected in place: the count and the newest pk stay the same
+        self.assertNotEqual(load('500'), before)
+        self.assertEqual(load('450'), before)
+        response = self.client.get('/api/transactions/by_user/')
+        self.assertEqual(response.data[self.user.username]['total'], 4500.0)
+
+    def test_numpy_is_not_imported_at_startup(self):
+        code = 'import django, sys; django.setup(); import family_budget_app.views; print("numpy" in sys.modules)'
+        result = subprocess.run(
+            [sys.executable, '-c', code], capture_output=True, text=True, check=True, cwd=settings.BASE_DIR,
+            env={**os.environ, 'DJANGO_SETTINGS_MODULE': 'family_budget.settings'},
+        )
+        self.assertEqual(result.stdout.strip(), 'False')
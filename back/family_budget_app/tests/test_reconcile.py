@@ -0,0 +1,54 @@
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+
+from family_budget_app.management.commands import reconcile_finances
+from family_budget_app.models import Finance, Transaction
+from family_budget_app.synthetic import create_family
+
+
+class ReconcileFinancesTests(TestCase):
+    def setUp(self):
+        _, _, self.finances = create_family('reconcile', 2)
+        Transaction.objects.create(finance=self.finances[0], amount=Decimal('100'), type='income')
+        Transaction.objects.create(finance=self.finances[0], amount=Decimal('30'), type='expense')
+        self.drifted = self.finances[0].pk
+        Finance.objects.filter(pk=self.drifted).update(income=Decimal('1'), balance=Decimal('1'))
+        self.before = Finance.objects.get(pk=self.drifted)
+
+    def _reconcile(self, *args):
+        out = StringIO()
+        call_command('reconcile_finances', *args, '--chunk-size', '1', stdout=out)
+        return out.getvalue()
+
+    def test_dry_run_only_reports(self):
+        self.assertIn('found 1 with drifted totals', self._reconcile('--dry-run'))
+        finance = Finance.objects.get(pk=self.drifted)
+        self.assertEqual((finance.income, finance.balance), (Decimal('1'), Decimal('1')))
+
+    def test_repairs_totals_version_and_timestamp(self):
+        self.assertIn('repaired 1 with drifted totals', self._reconcile())
+        finance = Finance.objects.get(pk=self.drifted)
+        self.assertEqual(
+            (finance.income, finance.expenses, finance.balance), (Decimal('100'), Decimal('30'), Decimal('70'))
+        )
+        self.assertEqual(finance.version, self.before.version + 1)
+        self.assertGreater(finance.updated_at, self.before.updated_at)
+        self.assertIn('repaired 0 with drifted totals', self._reconcile())
+
+    def test_totals_are_read_inside_the_locking_transaction(self):
+        real = reconcile_finances.ledger_totals
+        # TestCase wraps each test in one atomic block; the command must add its own
+        depth = len(connection.atomic_blocks)
+
+        def checked(finance_ids):
+            self.assertGreater(len(connection.atomic_blocks), depth)
+            return real(finance_ids)
+
+        with mock.patch.object(reconcile_finances, 'ledger_totals', side_effect=checked) as totals:
+            self._reconcile()
+        self.assertEqual(totals.call_count, 2)
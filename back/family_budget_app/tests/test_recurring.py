@@ -0,0 +1,54 @@
+from datetime import datetime, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from family_budget_app.models import RecurringRule, Transaction
+from family_budget_app.synthetic import create_family
+
+
+class RecurringRuleScheduleTests(TestCase):
+    def setUp(self):
+        _, users, self.finances = create_family('recurring', 1)
+        self.client = APIClient(HTTP_HOST='localhost')
+        self.client.force_authenticate(users[0])
+        self.start = timezone.make_aware(datetime(2026, 1, 5, 9))
+        response = self.client.post('/api/recurring/', {
+            'amount': '100.00', 'type': 'expense', 'description': 'Rent',
+            'frequency': 'monthly', 'start_date': self.start.isoformat(),
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.rule_id = response.data['rule_id']
+
+    def _materialize(self, until):
+        call_command('materialize_recurring', until=until.isoformat(), stdout=StringIO())
+
+    def _next_run(self):
+        return RecurringRule.objects.get(pk=self.rule_id).next_run
+
+    def test_new_rule_starts_at_start_date(self):
+        self.assertEqual(self._next_run(), self.start)
+
+    def test_frequency_change_continues_after_last_occurrence(self):
+        self._materialize(self.start + timedelta(days=40))
+        self.assertEqual(self._next_run(), self.start.replace(month=3))
+        response = self.client.patch(f'/api/recurring/{self.rule_id}/', {'frequency': 'weekly'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        # Last occurrence was Feb 5; the weekly schedule from Jan 5 continues on Feb 9
+        self.assertEqual(self._next_run(), timezone.make_aware(datetime(2026, 2, 9, 9)))
+        self._materialize(timezone.make_aware(datetime(2026, 2, 20)))
+        dates = list(Transaction.objects.filter(recurring_rule_id=self.rule_id).order_by('date').values_list('date', flat=True))
+        self.assertEqual([d.day for d in dates], [5, 5, 9, 16])
+
+    def test_moving_start_date_moves_next_run(self):
+        later = self.start + timedelta(days=90)
+        self.client.patch(f'/api/recurring/{self.rule_id}/', {'start_date': later.isoformat()}, format='json')
+        self.assertEqual(self._next_run(), later)
+
+    def test_other_edits_keep_schedule(self):
+        self._materialize(self.start + timedelta(days=40))
+        self.client.patch(f'/api/recurring/{self.rule_id}/', {'amount': '120.00'}, format='json')
+        self.assertEqual(self._next_run(), self.start.replace(month=3))
@@ -0,0 +1,106 @@
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from family_budget_app import search
+from family_budget_app.apps import _repair_search
+from family_budget_app.models import Transaction
+from family_budget_app.synthetic import create_family
+
+
+class TransactionSearchTests(TestCase):
+    def setUp(self):
+        _, self.users, self.finances = create_family('search', 4)
+        self.kid = self.users[3]
+        self.assertEqual(self.kid.role.role_name, 'kid')
+        _, _, (self.stranger,) = create_family('search-other', 1)
+
+    def _add(self, description, finance=None):
+        return Transaction.objects.create(
+            finance=finance or self.finances[0], amount=Decimal('1'), type='expense', description=description,
+        ).pk
+
+    def _ids(self, text, finances=None):
+        return [pk for pk, _ in search.search([f.pk for f in finances or self.finances], text, 50)]
+
+    def _api(self, user, text):
+        client = APIClient(HTTP_HOST='localhost')
+        client.force_authenticate(user)
+        response = client.get('/api/transactions/search/', {'q': text})
+        self.assertEqual(response.status_code, 200)
+        return [row['transaction_id'] for row in response.data['results']]
+
+    def test_prefixes_match_any_case_and_script(self):
+        groceries = self._add('Покупка продуктов в Магните')
+        coffee = self._add('Coffee at the airport')
+        self.assertEqual(self._ids('прод'), [groceries])
+        self.assertEqual(self._ids('МАГНИТ покуп'), [groceries])
+        self.assertEqual(self._ids('COF air'), [coffee])
+        self.assertEqual(self._ids('coffee магнит'), [])
+
+    def test_rank_then_newest_first(self):
+        long = self._add('coffee beans, milk, sugar, bread, cheese and apples')
+        short = self._add('coffee')
+        older, newer = self._add('tea'), self._add('tea')
+        self.assertEqual(self._ids('coffee'), [short, long])
+        self.assertEqual(self._ids('tea'), [newer, older])
+
+    def test_query_operators_are_plain_words(self):
+        pk = self._add('Bread AND butter OR NOT near the market')
+        for text in ('AND', 'NEAR', '"bread', 'butter OR', 'market*', 'NOT bread', '(bread)', 'bread: market^'):
+            self.assertIn(pk, self._ids(text), text)
+        self.assertEqual(search.terms('  !!  '), [])
+
+    def test_results_stay_within_the_family(self):
+        mine = self._add('Pizza night')
+        kids = self._add('Pizza party', finance=self.finances[3])
+        foreign = self._add('Pizza lunch', finance=self.stranger)
+        self.assertEqual(set(self._api(self.users[0], 'pizza')), {mine, kids})
+        # Kids see what the transaction list shows them, never another family's rows
+        self.assertEqual(set(self._api(self.kid, 'pizza')), {mine, kids})
+        self.assertEqual(self._ids('pizza', [self.stranger]), [foreign])
+
+    def test_index_follows_writes(self):
+        pk = self._add('Taxi home')
+        Transaction.objects.filter(pk=pk).update(description='Bus home')
+        self.assertEqual(self._ids('taxi'), [])
+        self.assertEqual(self._ids('bus'), [pk])
+
+        Transaction.objects.filter(pk=pk).update(finance=self.stranger)
+        self.assertEqual(self._ids('bus'), [])
+        self.assertEqual(self._ids('bus', [self.stranger]), [pk])
+
+        created = Transaction.objects.bulk_create([
+            Transaction(finance=self.finances[1], amount=Decimal('1'), type='expense', description=f'Bulk row {i}')
+            for i in range(3)
+        ])
+        self.assertEqual(len(self._ids('bulk')), 3)
+        Transaction.objects.filter(pk__in=[t.pk for t in created[:2]]).delete()
+        self.assertEqual(self._ids('bulk'), [created[2].pk])
+        self._assert_index_consistent()
+
+    def test_repair_restores_triggers_dropped_by_a_table_rebuild(self):
+        with connection.cursor() as cursor:
+            for suffix in ('insert', 'delete', 'update'):
+                cursor.execute(f'DROP TRIGGER {search.FTS_TABLE}_{suffix}')
+        # Only after a migrate that actually ran something
+        _repair_search('default', plan=[])
+        self.assertEqual(self._triggers(), set())
+        _repair_search('default', plan=[('migration', False)])
+        self.assertEqual(self._triggers(), {f'{search.FTS_TABLE}_{s}' for s in ('insert', 'delete', 'update')})
+        pk = self._add('Rebuilt table')
+        self.assertEqual(self._ids('rebuilt'), [pk])
+        self._assert_index_consistent()
+
+    def _triggers(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = %s",
+                           [search.TRANSACTION_TABLE])
+            return {name for name, in cursor.fetchall()}
+
+    def _assert_index_consistent(self):
+        with connection.cursor() as cursor:
+            # Raises when the external-content index disagrees with the table
+            cursor.execute(f"INSERT INTO {search.FTS_TABLE}({search.FTS_TABLE}, rank) VALUES ('integrity-check', 1)")
@@ -0,0 +1,103 @@
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+import numpy as np
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from family_budget_app import simulation
+from family_budget_app.models import Goal, Transaction
+from family_budget_app.synthetic import create_family
+
+
+class SimulateTests(SimpleTestCase):
+    def test_savings_are_floored_at_zero(self):
+        nets = np.array([-300.0, 100.0, 250.0])
+        _, bands, _, drawn = simulation.simulate(nets, 50.0, 10 ** 6, 12, paths=1000, seed=7)
+        # The same draws, accumulated one month at a time
+        draws = np.random.default_rng(7).choice(nets, size=(drawn, 12))
+        expected = np.empty_like(draws)
+        saved = np.full(drawn, 50.0)
+        for month in range(12):
+            saved = np.maximum(saved + draws[:, month], 0)
+            expected[:, month] = saved
+        np.testing.assert_allclose(bands, np.percentile(expected, simulation.PERCENTILES, axis=0))
+        self.assertTrue((bands >= 0).all())
+
+    def test_seeded_runs_repeat(self):
+        nets = np.array([-50.0, 20.0, 80.0, 120.0])
+        first = simulation.simulate(nets, 0.0, 500.0, 12, seed=3)
+        second = simulation.simulate(nets, 0.0, 500.0, 12, seed=3)
+        self.assertEqual(first[0], second[0])
+        np.testing.assert_array_equal(first[1], second[1])
+        np.testing.assert_array_equal(first[2], second[2])
+
+
+class SimulateGoalTests(TestCase):
+    def setUp(self):
+        self.family, users, self.finances = create_family('simulation', 1)
+        self.today = timezone.localdate()
+        self.client = APIClient(HTTP_HOST='localhost')
+        self.client.force_authenticate(users[0])
+
+    def _history(self, nets):
+        """One income and one expense in each of the last len(nets) complete months"""
+        first = self.today.replace(day=1)
+        rows = []
+        for back, net in enumerate(reversed(nets), start=1):
+            index = first.year * 12 + first.month - 1 - back
+            day = timezone.make_aware(datetime.combine(datetime(index // 12, index % 12 + 1, 10), time(12)))
+            rows += [
+                Transaction(finance=self.finances[0], amount=Decimal(1000 + max(net, 0)), type='income', date=day),
+                Transaction(finance=self.finances[0], amount=Decimal(1000 - min(net, 0)), type='expense', date=day),
+            ]
+        Transaction.objects.bulk_create(rows)
+
+    def _goal(self, target, current='0', days=365):
+        goal = Goal.objects.create(
+            family=self.family, goal_name='Trip', target_amount=Decimal(target),
+            deadline=self.today + timedelta(days=days),
+        )
+        Goal.objects.filter(pk=goal.pk).update(current_amount=Decimal(current))
+        goal.refresh_from_db()
+        return goal
+
+    def test_reached_goal(self):
+        result = simulation.simulate_goal(self._goal('100', current='100'))
+        self.assertEqual(result['probability'], 1.0)
+        self.assertEqual(result['note'], 'Target already reached')
+
+    def test_impossible_goal(self):
+        self._history([-200, -50, 0, -10, -300, 0])
+        result = simulation.simulate_goal(self._goal('5000'))
+        self.assertEqual(result['probability'], 0.0)
+        self.assertIsNone(result['median_completion'])
+        self.assertTrue(all(value == 0 for row in result['percentiles'].values() for value in row))
+
+    def test_typical_goal_is_reproducible(self):
+        self._history([400, -200, 300, 250, -100, 500, 150, 350, 0, 200, -50, 300])
+        goal = self._goal('2000', days=300)
+        first, second = simulation.simulate_goal(goal), simulation.simulate_goal(goal)
+        self.assertTrue(0 < first['probability'] < 1)
+        self.assertEqual(first['history_months'], 12)
+        self.assertEqual(len(first['months']), len(first['percentiles']['p50']))
+        for key in ('probability', 'median_completion', 'percentiles', 'paths'):
+            self.assertEqual(first[key], second[key], key)
+        p10, p90 = first['percentiles']['p10'], first['percentiles']['p90']
+        self.assertTrue(all(low <= high for low, high in zip(p10, p90)))
+
+    def test_short_history(self):
+        self._history([100, 200])
+        result = simulation.simulate_goal(self._goal('1000'))
+        self.assertIsNone(result['probability'])
+        self.assertEqual(result['history_months'], 2)
+
+    def test_results_are_cached_until_the_family_data_changes(self):
+        self._history([400, -200, 300, 250])
+        url = f'/api/goals/{self._goal("2000").pk}/simulate/'
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(self.client.get(url).data['computed_at'], first.data['computed_at'])
+        Transaction.objects.create(finance=self.finances[0], amount=Decimal('10'), type='expense')
+        self.assertNotEqual(self.client.get(url).data['computed_at'], first.data['computed_at'])
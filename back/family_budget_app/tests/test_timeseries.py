@@ -0,0 +1,84 @@
+import time
+from datetime import date, datetime, timezone as dt_timezone
+from decimal import Decimal
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from family_budget_app import timeseries
+from family_budget_app.models import Transaction
+from family_budget_app.synthetic import create_family
+
+
+class BucketTests(TestCase):
+    def test_bucket_count_matches_the_buckets(self):
+        for granularity in timeseries.GRANULARITIES:
+            for start, end in ((date(2023, 1, 31), date(2024, 3, 1)), (date(2024, 2, 29), date(2024, 2, 29))):
+                self.assertEqual(
+                    timeseries.bucket_count(start, end, granularity),
+                    len(list(timeseries.buckets(start, end, granularity))),
+                )
+
+    def test_buckets_stop_at_the_end_of_the_calendar(self):
+        self.assertEqual(list(timeseries.buckets(date(9999, 1, 1), date.max, 'year')), [date(9999, 1, 1)])
+        self.assertEqual(list(timeseries.buckets(date.max, date.max, 'day')), [date.max])
+        self.assertEqual(timeseries.default_start(date(1, 1, 5), 'day'), date.min)
+
+
+class CashflowTests(TestCase):
+    URL = '/api/finance/cashflow/'
+
+    def setUp(self):
+        _, users, self.finances = create_family('cashflow', 1)
+        self.client = APIClient(HTTP_HOST='localhost')
+        self.client.force_authenticate(users[0])
+
+    def test_buckets_are_filled(self):
+        Transaction.objects.create(
+            finance=self.finances[0], amount=Decimal('10'), type='income', date=datetime(2024, 2, 10, 12, tzinfo=dt_timezone.utc),
+        )
+        response = self.client.get(self.URL, {'granularity': 'month', 'from': '2024-01-01', 'to': '2024-03-31'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['buckets'], ['2024-01-01', '2024-02-01', '2024-03-01'])
+        self.assertEqual([float(value) for value in response.data['income']], [0.0, 10.0, 0.0])
+
+    def test_calendar_edges_are_client_errors(self):
+        for params in (
+            {'granularity': 'year', 'from': '9995-01-01', 'to': '9999-12-31'},
+            {'granularity': 'day', 'to': '9999-12-31'},
+        ):
+            self.assertEqual(self.client.get(self.URL, params).status_code, 400, params)
+        response = self.client.get(self.URL, {'granularity': 'year', 'from': '9995-01-01', 'to': '9999-12-30'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['buckets']), 5)
+        self.assertEqual(self.client.get(self.URL, {'granularity': 'day', 'to': '0001-01-05'}).status_code, 200)
+
+    def test_oversized_ranges_are_rejected_without_walking_them(self):
+        started = time.perf_counter()
+        response = self.client.get(self.URL, {'granularity': 'day', 'from': '0001-01-01', 'to': '9999-12-30'})
+        self.assertEqual(response.status_code, 400)
+        self.assertLess(time.perf_counter() - started, 1)
+
+
+class BalanceHistoryTests(TestCase):
+    URL = '/api/finance/balance_history/'
+
+    def setUp(self):
+        _, users, self.finances = create_family('balance', 1)
+        self.client = APIClient(HTTP_HOST='localhost')
+        self.client.force_authenticate(users[0])
+
+    def test_opening_balance_and_window(self):
+        for day, amount, type in ((1, '100', 'income'), (2, '30', 'expense'), (3, '5', 'expense')):
+            Transaction.objects.create(
+                finance=self.finances[0], amount=Decimal(amount), type=type,
+                date=datetime(2024, 5, day, 12, tzinfo=dt_timezone.utc),
+            )
+        response = self.client.get(self.URL, {'from': '2024-05-02', 'to': '2024-05-02'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([float(value) for value in response.data['balance']], [70.0])
+
+    def test_calendar_edges_are_client_errors(self):
+        for params in ({'to': '9999-12-31'}, {'from': '9999-12-31'}):
+            self.assertEqual(self.client.get(self.URL, params).status_code, 400, params)
+        self.assertEqual(self.client.get(self.URL, {'to': '9999-12-30'}).status_code, 200)
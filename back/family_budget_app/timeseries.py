@@ -0,0 +1,188 @@
+"""
+Time-bucketed series over the transaction ledger for dashboard charts.
+
+Bucketing happens in SQL with Trunc(); gaps are filled here so every series
+has one value per bucket. Running balances use window functions and are
+downsampled in the same query. Results are columnar (parallel lists) to
+keep payloads small. Amounts are in the base currency, except per-finance
+balances, which are in each finance's own currency like its totals.
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from django.db.models import Case, Count, DateField, F, Sum, Value, When, Window
+from django.db.models.functions import RowNumber, Trunc
+from django.utils import timezone
+
+from .models import Transaction, _add_months
+from .money import MoneyField
+from .rates import converted
+
+GRANULARITIES = ('day', 'week', 'month', 'year')
+
+# Default window (in buckets) when `from` is omitted, and the most a request may span
+DEFAULT_BUCKETS = {'day': 30, 'week': 12, 'month': 12, 'year': 5}
+MAX_BUCKETS = 1000
+
+# day_range() needs the day after the last one requested
+LAST_DAY = date.max - timedelta(days=1)
+
+
+def bucket_start(day, granularity):
+    """First day of the bucket containing `day` (weeks start on Monday, as Trunc('week'))"""
+    if granularity == 'week':
+        return day - timedelta(days=day.weekday())
+    if granularity == 'month':
+        return day.replace(day=1)
+    if granularity == 'year':
+        return day.replace(month=1, day=1)
+    return day
+
+
+def next_bucket(day, granularity):
+    if granularity == 'week':
+        return day + timedelta(days=7)
+    if granularity == 'month':
+        return _add_months(day, 1, 1)
+    if granularity == 'year':
+        return day.replace(year=day.year + 1)
+    return day + timedelta(days=1)
+
+
+def buckets(start, end, granularity):
+    """Bucket start dates covering [start, end]"""
+    day = bucket_start(start, granularity)
+    while day <= end:
+        yield day
+        try:
+            day = next_bucket(day, granularity)
+        except (OverflowError, ValueError):
+            # The last bucket of the calendar
+            return
+
+
+def bucket_count(start, end, granularity):
+    """len(list(buckets(start, end, granularity))) without walking them"""
+    first, last = bucket_start(start, granularity), bucket_start(end, granularity)
+    if granularity == 'month':
+        return (last.year - first.year) * 12 + last.month - first.month + 1
+    if granularity == 'year':
+        return last.year - first.year + 1
+    return (last - first).days // (7 if granularity == 'week' else 1) + 1
+
+
+def default_start(end, granularity):
+    day = bucket_start(end, granularity)
+    try:
+        for _ in range(DEFAULT_BUCKETS[granularity] - 1):
+            if granularity == 'month':
+                day = _add_months(day, -1, 1)
+            elif granularity == 'year':
+                day = day.replace(year=day.year - 1)
+            else:
+                day -= timedelta(days=7 if granularity == 'week' else 1)
+    except (OverflowError, ValueError):
+        # date.min is a Monday, so it starts a bucket of every granularity
+        return date.min
+    return day
+
+
+def day_range(start, end):
+    """Aware datetimes [start 00:00, day after end 00:00) in the current time zone"""
+    tz = timezone.get_current_timezone()
+    return (
+        timezone.make_aware(datetime.combine(start, time.min), tz),
+        timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min), tz),
+    )
+
+
+def cashflow(finances, granularity, start, end):
+    """Income, expenses, net and transaction count per bucket between two dates"""
+    money = MoneyField()
+    amount = converted()
+    since, until = day_range(bucket_start(start, granularity), end)
+    totals = {
+        row['bucket']: row
+        for row in Transaction.objects.filter(finance__in=finances, date__gte=since, date__lt=until)
+        .annotate(bucket=Trunc('date', granularity, output_field=DateField()))
+        .values('bucket')
+        .annotate(
+            income=Sum(Case(When(type='income', then=amount), default=0, output_field=money)),
+            expenses=Sum(Case(When(type='expense', then=amount), default=0, output_field=money)),
+            count=Count('pk'),
+        )
+        .order_by()
+    }
+
+    series = {'buckets': [], 'income': [], 'expenses': [], 'net': [], 'count': []}
+    for day in buckets(start, end, granularity):
+        row = totals.get(day)
+        income = float(row['income'] or 0) if row else 0.0
+        expenses = float(row['expenses'] or 0) if row else 0.0
+        series['buckets'].append(day.isoformat())
+        series['income'].append(income)
+        series['expenses'].append(expenses)
+        series['net'].append(round(income - expenses, 2))
+        series['count'].append(row['count'] if row else 0)
+    return series
+
+
+MAX_POINTS = 2000
+
+
+def _signed_amount(money, amount):
+    return Case(When(type='income', then=amount), default=-amount, output_field=money)
+
+
+def balance_history(finances, points, since=None, until=None, per_finance=False):
+    """Running balance after each transaction, downsampled to at most `points` per series.
+
+    SUM(...) OVER (ORDER BY date) gives the balance after every row and
+    ROW_NUMBER()/COUNT() OVER pick evenly spaced rows, all in one query: a row
+    is kept when (row_number * points) % row_count < points, which selects
+    the last row of each of `points` equal slices (always including the
+    final balance). Rows before `since` only contribute an opening balance.
+
+    Returns {finance_id or None: {'dates': [...], 'balance': [...]}}.
+    """
+    money = MoneyField()
+    amount = converted(to_field='finance__currency') if per_finance else converted()
+    transactions = Transaction.objects.filter(finance__in=finances)
+    opening = defaultdict(Decimal)
+    if since is not None:
+        earlier = transactions.filter(date__lt=since)
+        if per_finance:
+            for finance_id, total in (
+                earlier.values('finance_id').annotate(total=Sum(_signed_amount(money, amount)))
+                .order_by().values_list('finance_id', 'total')
+            ):
+                opening[finance_id] = total or Decimal('0')
+        else:
+            opening[None] = earlier.aggregate(total=Sum(_signed_amount(money, amount)))['total'] or Decimal('0')
+        transactions = transactions.filter(date__gte=since)
+    if until is not None:
+        transactions = transactions.filter(date__lt=until)
+
+    partition = [F('finance_id')] if per_finance else None
+    order = [F('date').asc(), F('transaction_id').asc()]
+    rows = (
+        transactions
+        .annotate(
+            running=Window(Sum(_signed_amount(money, amount)), partition_by=partition, order_by=order),
+            row_number=Window(RowNumber(), partition_by=partition, order_by=order),
+            row_count=Window(Count('pk'), partition_by=partition),
+        )
+        .annotate(slot=(F('row_number') * Value(points)) % F('row_count'))
+        .filter(slot__lt=points)
+        .order_by('finance_id' if per_finance else 'date', 'date', 'transaction_id')
+        .values_list('finance_id', 'date', 'running')
+    )
+
+    series = defaultdict(lambda: {'dates': [], 'balance': []})
+    for finance_id, date, running in rows:
+        key = finance_id if per_finance else None
+        series[key]['dates'].append(date.isoformat())
+        series[key]['balance'].append(float(opening[key] + running))
+    return dict(series)
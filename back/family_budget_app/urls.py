@@ -9,7 +9,10 @@ router.register(r'families', FamilyViewSet, basename='family')
 router.register(r'finance', FinanceViewSet, basename='finance')
 router.register(r'transactions', TransactionViewSet, basename='transaction')
 router.register(r'goals', GoalViewSet, basename='goal')
+router.register(r'recurring', RecurringRuleViewSet, basename='recurring')
+router.register(r'budgets', CategoryBudgetViewSet, basename='budget')
 router.register(r'ai', AIAssistantViewSet, basename='ai')
+router.register(r'jobs', JobViewSet, basename='job')
 
 urlpatterns = [
     path('', include(router.urls)),
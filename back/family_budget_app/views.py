@@ -1,17 +1,35 @@
 from rest_framework import status, viewsets, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.exceptions import APIException, NotFound, ValidationError
 from rest_framework.views import APIView
 from django.db import transaction
-from .models import User, Family, Finance, Transaction, Goal, Role, Category, Invitation
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+from datetime import datetime
+import time
+from .models import User, Family, Finance, Transaction, Goal, Role, Category, Invitation, RecurringRule, CategoryBudget, Job
 from .serializers import *
-from .ai_service import BudgetAIService
+from .registry import roles
+from . import conditional, duplicates, rates
+from .projection import ProjectionMixin, project_queryset, projected
 from rest_framework.authtoken.models import Token
 from rest_framework.decorators import permission_classes
-from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser
+from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
 
 
+class DuplicateTransaction(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_code = 'duplicate'
+
+    def __init__(self, duplicate_of):
+        super().__init__()
+        # Set directly: APIException would turn the ids into strings
+        self.detail = {'error': 'Duplicate transaction', 'duplicate_of': duplicate_of}
+
+
 def _role_to_redirect(role_name: str):
     """Map role name to a frontend route. Frontend can override these routes.
 
@@ -59,7 +77,7 @@ class AuthViewSet(viewsets.ViewSet):
             })
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(ProjectionMixin, viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -69,7 +87,7 @@ class UserViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(request.user)
         return Response(serializer.data)
 
-class FamilyViewSet(viewsets.ModelViewSet):
+class FamilyViewSet(ProjectionMixin, viewsets.ModelViewSet):
     queryset = Family.objects.all()
     serializer_class = FamilySerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -77,7 +95,7 @@ class FamilyViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         family = serializer.save(admin=self.request.user)
         self.request.user.family = family
-        admin_role, _ = Role.objects.get_or_create(role_name='admin')
+        admin_role = roles.get('admin')
         self.request.user.role = admin_role
         self.request.user.save()
 
@@ -117,7 +135,7 @@ class FamilyViewSet(viewsets.ModelViewSet):
         if not user or not user.is_authenticated:
             return Response({'error': 'Authentication required to join by code'}, status=status.HTTP_401_UNAUTHORIZED)
 
-        member_role, _ = Role.objects.get_or_create(role_name='family_member')
+        member_role = roles.get('family_member')
         user.family = family
         user.role = member_role
         user.save()
@@ -138,7 +156,7 @@ class FamilyViewSet(viewsets.ModelViewSet):
         if user.email.lower() != invite.invited_email.lower():
             return Response({'error': 'This invitation is not for your account'}, status=status.HTTP_403_FORBIDDEN)
 
-        member_role, _ = Role.objects.get_or_create(role_name='family_member')
+        member_role = roles.get('family_member')
         user.family = invite.family
         user.role = member_role
         user.save()
@@ -184,7 +202,7 @@ class FamilyViewSet(viewsets.ModelViewSet):
             return Response({'error': 'User not found in family'}, status=status.HTTP_404_NOT_FOUND)
 
         # allow creating new roles on demand
-        role, _ = Role.objects.get_or_create(role_name=role_name)
+        role = roles.get(role_name)
 
         user.role = role
         user.save()
@@ -196,7 +214,7 @@ class FamilyViewSet(viewsets.ModelViewSet):
         try:
             family = Family.objects.get(family_id=family_id)
             request.user.family = family
-            member_role, _ = Role.objects.get_or_create(role_name='family_member')
+            member_role = roles.get('family_member')
             request.user.role = member_role
             request.user.save()
             return Response({'message': 'Successfully joined family'})
@@ -213,8 +231,8 @@ class FamilyViewSet(viewsets.ModelViewSet):
 
         try:
             user = User.objects.get(user_id=user_id, family=self.get_object())
-            kid_role, _ = Role.objects.get_or_create(role_name='kid')
-            member_role, _ = Role.objects.get_or_create(role_name='family_member')
+            kid_role = roles.get('kid')
+            member_role = roles.get('family_member')
 
             user.role = kid_role if is_kid else member_role
             user.save()
@@ -229,8 +247,9 @@ class FamilyViewSet(viewsets.ModelViewSet):
         if not request.user.family:
             return Response({'error': 'User is not in a family'}, status=status.HTTP_404_NOT_FOUND)
         
-        serializer = self.get_serializer(request.user.family)
-        return Response(serializer.data)
+        serializer = self.get_serializer()
+        family = project_queryset(Family.objects.filter(pk=request.user.family_id), serializer).get()
+        return Response(self.get_serializer(family).data)
 
     @action(detail=False, methods=['get'])
     def family_members(self, request):
@@ -238,9 +257,12 @@ class FamilyViewSet(viewsets.ModelViewSet):
         if not request.user.family:
             return Response({'error': 'User is not in a family'}, status=status.HTTP_404_NOT_FOUND)
         
-        members = User.objects.filter(family=request.user.family)
-        serializer = UserSerializer(members, many=True)
-        return Response(serializer.data)
+        def build():
+            members = User.objects.filter(family=request.user.family).order_by('pk')
+            return Response(projected(UserSerializer, members, self.get_serializer_context()).data)
+
+        validators = conditional.family_validators('family_members', request.user.family_id, include_finances=False)
+        return conditional.respond(request, validators, build)
 
     @action(detail=False, methods=['get'])
     def family_transactions(self, request):
@@ -248,16 +270,19 @@ class FamilyViewSet(viewsets.ModelViewSet):
         if not request.user.family:
             return Response({'error': 'User is not in a family'}, status=status.HTTP_404_NOT_FOUND)
         
-        family_members = User.objects.filter(family=request.user.family)
-        family_finances = Finance.objects.filter(user__in=family_members)
-        transactions = Transaction.objects.filter(
-            finance__in=family_finances
-        ).select_related('finance', 'category', 'finance__user').order_by('-date')
-        
-        serializer = TransactionSerializer(transactions, many=True)
-        return Response(serializer.data)
+        def build():
+            family_members = User.objects.filter(family=request.user.family)
+            family_finances = Finance.objects.filter(user__in=family_members)
+            transactions = Transaction.objects.filter(
+                finance__in=family_finances
+            ).select_related('finance', 'category', 'finance__user').order_by('-date')
+
+            return Response(projected(TransactionSerializer, transactions, self.get_serializer_context()).data)
 
-class FinanceViewSet(viewsets.ModelViewSet):
+        validators = conditional.family_validators('family_transactions', request.user.family_id)
+        return conditional.respond(request, validators, build)
+
+class FinanceViewSet(ProjectionMixin, viewsets.ModelViewSet):
     queryset = Finance.objects.all()
     serializer_class = FinanceSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -277,28 +302,135 @@ class FinanceViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def self_data(self, request):
         finance, created = Finance.objects.get_or_create(user=request.user)
-        serializer = self.get_serializer(finance)
-        return Response(serializer.data)
+        validators = conditional.Validators('self_data', finance.pk, finance.version, finance.updated_at)
+        return conditional.respond(request, validators, lambda: Response(self.get_serializer(finance).data))
 
     @action(detail=False, methods=['get'])
     def summary(self, request):
         if not request.user.family:
             return Response({'error': 'User is not in a family'}, status=status.HTTP_400_BAD_REQUEST)
 
-        family_members = User.objects.filter(family=request.user.family)
-        finances = Finance.objects.filter(user__in=family_members)
+        def build():
+            family_members = User.objects.filter(family=request.user.family)
+            finances = Finance.objects.filter(user__in=family_members)
+
+            # Each finance keeps its totals in its own currency; add them up in the base currency at today's rate
+            base, today = rates.base_currency(), timezone.now()
+            total_balance = total_income = total_expenses = 0
+            for finance in finances:
+                total_balance += rates.cache.convert(finance.balance, finance.currency, base, today)
+                total_income += rates.cache.convert(finance.income, finance.currency, base, today)
+                total_expenses += rates.cache.convert(finance.expenses, finance.currency, base, today)
+
+            return Response({
+                'total_balance': total_balance,
+                'total_income': total_income,
+                'total_expenses': total_expenses,
+                'currency': base,
+                'member_count': family_members.count()
+            })
+
+        # member_count also changes when a member without a finance joins, hence the member fingerprint;
+        # totals are converted at today's rates, so the rate table and the day are part of the tag too
+        validators = conditional.family_validators(
+            'summary', request.user.family_id, extra=(rates.cache.version, timezone.localdate())
+        )
+        return conditional.respond(request, validators, build)
+
+    @action(detail=False, methods=['get'])
+    def cashflow(self, request):
+        """
+        Income/expense series bucketed by day, week, month or year
+
+        Query params:
+        - granularity: day | week | month (default) | year
+        - from, to: YYYY-MM-DD (default: the last few buckets up to today)
+        - scope: self (default) | family (every finance the user can see)
+
+        Returns columnar arrays: buckets, income, expenses, net and count,
+        with empty buckets filled with zeros.
+        """
+        from . import timeseries
+        params = request.query_params
+        granularity = params.get('granularity', 'month')
+        if granularity not in timeseries.GRANULARITIES:
+            raise ValidationError({'granularity': f"Must be one of {', '.join(timeseries.GRANULARITIES)}"})
+        try:
+            end = datetime.strptime(params['to'], '%Y-%m-%d').date() if params.get('to') else timezone.localdate()
+            start = (datetime.strptime(params['from'], '%Y-%m-%d').date() if params.get('from')
+                     else timeseries.default_start(end, granularity))
+        except ValueError:
+            raise ValidationError({'detail': 'from/to must be in YYYY-MM-DD format'})
+        if start > end:
+            raise ValidationError({'detail': 'from must not be after to'})
+        if end > timeseries.LAST_DAY:
+            raise ValidationError({'detail': f'to must be on or before {timeseries.LAST_DAY.isoformat()}'})
+        if timeseries.bucket_count(start, end, granularity) > timeseries.MAX_BUCKETS:
+            raise ValidationError({'detail': f'At most {timeseries.MAX_BUCKETS} buckets per request'})
 
-        total_balance = sum(finance.balance for finance in finances)
-        total_income = sum(finance.income for finance in finances)
-        total_expenses = sum(finance.expenses for finance in finances)
+        scope = params.get('scope', 'self')
+        if scope not in ('self', 'family'):
+            raise ValidationError({'scope': 'Must be self or family'})
+        finances = self.get_queryset() if scope == 'family' else Finance.objects.filter(user=request.user)
 
         return Response({
-            'total_balance': total_balance,
-            'total_income': total_income,
-            'total_expenses': total_expenses,
-            'member_count': family_members.count()
+            'granularity': granularity,
+            'from': start.isoformat(),
+            'to': end.isoformat(),
+            'scope': scope,
+            'currency': rates.base_currency(),
+            **timeseries.cashflow(finances, granularity, start, end),
         })
 
+    @action(detail=False, methods=['get'])
+    def balance_history(self, request):
+        """
+        Running balance over time, computed with SQL window functions
+
+        Query params:
+        - scope: self (default) | family (combined balance) | members (one series per member)
+        - points: maximum number of points per series (default: 200, max: 2000)
+        - from, to: YYYY-MM-DD; earlier transactions still count towards the opening balance
+        """
+        from . import timeseries
+        params = request.query_params
+        scope = params.get('scope', 'self')
+        if scope not in ('self', 'family', 'members'):
+            raise ValidationError({'scope': 'Must be self, family or members'})
+        try:
+            points = min(max(int(params.get('points', 200)), 2), timeseries.MAX_POINTS)
+            start = datetime.strptime(params['from'], '%Y-%m-%d').date() if params.get('from') else None
+            end = datetime.strptime(params['to'], '%Y-%m-%d').date() if params.get('to') else None
+        except ValueError:
+            raise ValidationError({'detail': 'points must be an integer and from/to YYYY-MM-DD dates'})
+        if any(day is not None and day > timeseries.LAST_DAY for day in (start, end)):
+            raise ValidationError({'detail': f'from/to must be on or before {timeseries.LAST_DAY.isoformat()}'})
+        since = timeseries.day_range(start, start)[0] if start else None
+        until = timeseries.day_range(end, end)[1] if end else None
+
+        if scope == 'self':
+            finances = Finance.objects.filter(user=request.user)
+        else:
+            finances = self.get_queryset()
+        history = timeseries.balance_history(finances, points, since, until, per_finance=scope == 'members')
+
+        if scope != 'members':
+            return Response({
+                'scope': scope, 'currency': rates.base_currency(), **history.get(None, {'dates': [], 'balance': []})
+            })
+        members = []
+        # Per-member balances are in the currency of each member's finance
+        for finance_id, user_id, username, currency in finances.values_list(
+            'finance_id', 'user_id', 'user__username', 'currency'
+        ):
+            members.append({
+                'user_id': user_id,
+                'username': username,
+                'currency': currency,
+                **history.get(finance_id, {'dates': [], 'balance': []}),
+            })
+        return Response({'scope': scope, 'members': members})
+
     @action(detail=False, methods=['post'])
     def update_data(self, request):
         finance = Finance.objects.get(user=request.user)
@@ -312,7 +444,7 @@ class FinanceViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(finance)
         return Response(serializer.data)
 
-class TransactionViewSet(viewsets.ModelViewSet):
+class TransactionViewSet(ProjectionMixin, viewsets.ModelViewSet):
     serializer_class = TransactionSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -333,29 +465,305 @@ class TransactionViewSet(viewsets.ModelViewSet):
         except Finance.DoesNotExist:
             return Transaction.objects.none()
     
-    def perform_create(self, serializer):
-        """Create a transaction for the authenticated user's finance"""
+    ON_DUPLICATE = ('flag', 'reject', 'allow')
+
+    def _on_duplicate(self, request):
+        """How a write treats rows matching a stored transaction (?on_duplicate=, see duplicates.py)"""
+        mode = request.query_params.get('on_duplicate', self.ON_DUPLICATE[0])
+        if mode not in self.ON_DUPLICATE:
+            raise ValidationError({'on_duplicate': f"Must be one of {', '.join(self.ON_DUPLICATE)}"})
+        return mode
+
+    def perform_create(self, serializer, on_duplicate='allow'):
+        """Create a transaction for the authenticated user's finance; returns ids of stored duplicates"""
         try:
             finance = Finance.objects.get(user=self.request.user)
-            serializer.save(finance=finance)
         except Finance.DoesNotExist:
-            return Response({'error': 'Finance profile not found'}, status=status.HTTP_400_BAD_REQUEST)
+            raise ValidationError({'error': 'Finance profile not found'})
+        data = serializer.validated_data
+        # Amounts are in the finance's currency unless the client says otherwise
+        extra = {'currency': data.get('currency', finance.currency)}
+        # Expenses sent without a category are categorized from their description;
+        # an explicit "category": null is respected
+        if 'category' not in data and data.get('type') == 'expense' and data.get('description'):
+            from .ai_service import suggest_categories
+            extra['category'], = suggest_categories([data['description']])
+        duplicate_of = []
+        if on_duplicate != 'allow':
+            duplicate_of, = duplicates.matches([Transaction(**{**data, **extra}, finance=finance)])
+            if duplicate_of and on_duplicate == 'reject':
+                raise DuplicateTransaction(duplicate_of)
+        serializer.save(finance=finance, **extra)
+        return duplicate_of
+
+    def create(self, request, *args, **kwargs):
+        """
+        Create a transaction and report the state of the category budget it hit
+
+        Query params:
+        - on_duplicate: what to do when a stored transaction has the same
+          finance, type, amount, day and description: 'flag' (default)
+          creates it and lists the matches in "duplicate_of", 'reject'
+          answers 409 with them, 'allow' skips the check
+        """
+        on_duplicate = self._on_duplicate(request)
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        duplicate_of = self.perform_create(serializer, on_duplicate)
+        data = serializer.data
+        if duplicate_of:
+            data['duplicate_of'] = duplicate_of
+        budget = self._budget_for(serializer.instance)
+        if budget is not None:
+            data['budget'] = CategoryBudgetSerializer(budget).data
+        return Response(data, status=status.HTTP_201_CREATED, headers=self.get_success_headers(data))
+
+    def _budget_for(self, trans):
+        """One indexed lookup of the family budget a freshly written expense counts against"""
+        budget_key = trans._budget_key()
+        if budget_key is None or not self.request.user.family_id:
+            return None
+        _, category_id, month = budget_key
+        return (
+            CategoryBudget.objects.filter(family_id=self.request.user.family_id, category_id=category_id, month=month)
+            .select_related('category')
+            .first()
+        )
     
+    def _bulk_rows(self, ids, fields):
+        """Lock and load the requested rows; every id must be visible to the user.
+
+        Visibility is checked once for the whole set (the same rule as
+        get_queryset()), and the request is rejected if any id is missing.
+        """
+        ids = set(ids)
+        rows = list(
+            self.get_queryset().filter(pk__in=ids).select_for_update().order_by().values('transaction_id', *fields)
+        )
+        missing = ids - {row['transaction_id'] for row in rows}
+        if missing:
+            error = NotFound()
+            # Set directly: NotFound would turn the ids into strings
+            error.detail = {'error': 'Transactions not found', 'ids': sorted(missing)}
+            raise error
+        return rows
+
+    def _finances(self):
+        """Finances whose transactions the user can see (the same rule as get_queryset())"""
+        user = self.request.user
+        return Finance.objects.filter(user__family=user.family) if user.family_id else Finance.objects.filter(user=user)
+
+    SEARCH_LIMIT = 50
+    MAX_SEARCH_LIMIT = 200
+
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """
+        Full-text search over descriptions of the transactions the user can see
+
+        Query params:
+        - q: words to look for; every word must match the start of a word in
+          the description (case-insensitive, any script)
+        - limit: results per page (default 50, max 200)
+        - offset: results to skip (default 0)
+
+        Results are best matches first, newest first among equal matches,
+        each with its rank (lower is better).
+        """
+        from . import search
+        params = request.query_params
+        if not search.terms(params.get('q')):
+            raise ValidationError({'q': 'Enter at least one word to search for'})
+        try:
+            limit = min(int(params.get('limit', self.SEARCH_LIMIT)), self.MAX_SEARCH_LIMIT)
+            offset = int(params.get('offset', 0))
+        except ValueError:
+            raise ValidationError({'detail': 'limit and offset must be integers'})
+        if limit < 1 or offset < 0:
+            raise ValidationError({'detail': 'limit must be positive and offset not negative'})
+
+        ranked = search.search(self._finances().values_list('pk', flat=True), params['q'], limit, offset)
+        serializer = self.get_serializer(many=True)
+        instances = project_queryset(
+            Transaction.objects.filter(pk__in=[pk for pk, _ in ranked]).select_related('finance', 'category', 'finance__user'),
+            serializer,
+        ).in_bulk()
+        ranked = [(pk, rank) for pk, rank in ranked if pk in instances]
+        serializer.instance = [instances[pk] for pk, _ in ranked]
+        results = [{**row, 'rank': round(rank, 4)} for row, (_, rank) in zip(serializer.data, ranked)]
+        return Response({'query': params['q'], 'limit': limit, 'offset': offset, 'results': results})
+
+    @action(detail=False, methods=['get'])
+    def duplicates(self, request):
+        """
+        Groups of suspected duplicate transactions the user can see
+
+        Transactions are suspected duplicates when they share a finance,
+        type, amount, currency, calendar day and description (ignoring case,
+        spacing and punctuation).
+
+        Query params:
+        - limit: groups per page (default 50, max 200)
+        - offset: groups to skip (default 0)
+
+        Groups are newest first; transactions within a group oldest first.
+        """
+        params = request.query_params
+        try:
+            limit = min(int(params.get('limit', self.SEARCH_LIMIT)), self.MAX_SEARCH_LIMIT)
+            offset = int(params.get('offset', 0))
+        except ValueError:
+            raise ValidationError({'detail': 'limit and offset must be integers'})
+        if limit < 1 or offset < 0:
+            raise ValidationError({'detail': 'limit must be positive and offset not negative'})
+
+        finances = self._finances()
+        count, page = duplicates.groups(finances, limit, offset)
+        serializer = self.get_serializer(many=True)
+        serializer.instance = list(project_queryset(
+            Transaction.objects.filter(finance__in=finances, fingerprint__in=[key for key, _ in page])
+            .select_related('finance', 'category', 'finance__user')
+            .order_by('date', 'pk'),
+            serializer,
+            extra=('fingerprint',),
+        ))
+        members = {}
+        for instance, row in zip(serializer.instance, serializer.data):
+            members.setdefault(instance.fingerprint, []).append(row)
+        return Response({
+            'count': count,
+            'limit': limit,
+            'offset': offset,
+            'results': [
+                {'fingerprint': key, 'size': size, 'transactions': members.get(key, [])}
+                for key, size in page
+            ],
+        })
+
+    MAX_IMPORT = 1000
+
+    @action(detail=False, methods=['post'], url_path='import')
+    def import_transactions(self, request):
+        """
+        Create many transactions of the user's finance in one request
+
+        Request body: {"transactions": [{"amount": "12.50", "type": "expense",
+        "date": "...", "description": "Coffee"}, ...]} (at most 1000 rows)
+
+        Query params:
+        - on_duplicate: rows matching a stored transaction are created and
+          listed in "duplicates" ('flag', default), left out and listed
+          ('reject', e.g. for overlapping bank statements), or not checked
+          ('allow'). Rows are not compared with each other.
+
+        Rows are validated like single creates and checked for duplicates
+        with one indexed lookup. Expenses without a category are categorized
+        from their descriptions in one batch, then all rows are inserted
+        together and finance totals, goal progress and budget counters are
+        adjusted with one aggregated update per table.
+        """
+        from .ai_service import assign_categories
+        from .ledger import apply_transactions, tag_goals
+        on_duplicate = self._on_duplicate(request)
+        try:
+            finance = Finance.objects.get(user=request.user)
+        except Finance.DoesNotExist:
+            raise ValidationError({'error': 'Finance profile not found'})
+        rows = request.data.get('transactions') if isinstance(request.data, dict) else None
+        if not isinstance(rows, list) or not rows:
+            raise ValidationError({'transactions': 'Send a non-empty list of transactions'})
+        serializer = TransactionSerializer(data=rows, many=True, max_length=self.MAX_IMPORT, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+
+        rows = serializer.validated_data
+        objs = [Transaction(**{'currency': finance.currency, **row}, finance=finance) for row in rows]
+        matches = duplicates.matches(objs) if on_duplicate != 'allow' else [[] for _ in objs]
+        found = [{'index': i, 'duplicate_of': ids} for i, ids in enumerate(matches) if ids]
+        if on_duplicate == 'reject':
+            rows = [row for row, ids in zip(rows, matches) if not ids]
+            objs = [obj for obj, ids in zip(objs, matches) if not ids]
+        categorized = assign_categories([obj for obj, row in zip(objs, rows) if 'category' not in row])
+        with transaction.atomic():
+            tag_goals(objs)
+            Transaction.objects.bulk_create(objs, batch_size=1000)
+            apply_transactions(objs)
+        serializer.instance = objs
+        return Response({
+            'created': len(objs),
+            'categorized': categorized,
+            'skipped': len(found) if on_duplicate == 'reject' else 0,
+            'duplicates': found,
+            'transactions': serializer.data,
+        }, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['post'])
+    def bulk_delete(self, request):
+        """
+        Delete many transactions at once
+
+        Request body: {"ids": [1, 2, 3]}
+
+        Finance totals, goal progress and budget counters are adjusted with
+        one aggregated delta per affected row of each table.
+        """
+        from .ledger import LEDGER_FIELDS, apply_transactions
+        payload = TransactionBulkSerializer(data=request.data)
+        payload.is_valid(raise_exception=True)
+        with transaction.atomic():
+            rows = self._bulk_rows(payload.validated_data['ids'], LEDGER_FIELDS)
+            apply_transactions(rows, sign=-1)
+            Transaction.objects.filter(pk__in=[row['transaction_id'] for row in rows]).delete()
+        return Response({'deleted': len(rows)})
+
+    @action(detail=False, methods=['post'])
+    def bulk_update(self, request):
+        """
+        Recategorize (or retag/redescribe) many transactions at once
+
+        Request body: {"ids": [1, 2, 3], "category": 5, "goal": null, "description": "..."}
+        Any of category, goal and description may be given; ids is required.
+        """
+        from .ledger import LEDGER_FIELDS, apply_transactions
+        payload = TransactionBulkUpdateSerializer(data=request.data, context={'request': request})
+        payload.is_valid(raise_exception=True)
+        changes = {
+            f'{name}_id' if name in ('category', 'goal') else name: value.pk if hasattr(value, 'pk') else value
+            for name, value in payload.validated_data.items() if name != 'ids'
+        }
+        with transaction.atomic():
+            rows = self._bulk_rows(payload.validated_data['ids'], LEDGER_FIELDS)
+            updated = Transaction.objects.filter(pk__in=[row['transaction_id'] for row in rows]).update(**changes)
+            if 'description' in changes:
+                duplicates.refresh(rows, changes['description'])
+            # Old rows are reversed and the new ones applied in the same pass, so
+            # finances net to zero while goal and budget counters move between keys
+            if changes.keys() & {'category_id', 'goal_id'}:
+                reversed_rows = [{**row, 'amount': -row['amount']} for row in rows]
+                apply_transactions(reversed_rows + [{**row, **changes} for row in rows])
+            else:
+                # Totals are unchanged, but cached reads of these finances are not
+                Finance.objects.filter(pk__in={row['finance_id'] for row in rows}).update(
+                    version=F('version') + 1, updated_at=timezone.now()
+                )
+        return Response({'updated': updated})
+
     @action(detail=False, methods=['get'])
     def by_category(self, request):
-        """Get transactions grouped by category with totals"""
-        transactions = self.get_queryset()
+        """Get transactions grouped by category with totals (in the base currency)"""
+        # Converted in the same query rather than one rate lookup per row
+        transactions = self.get_queryset().annotate(base_amount=rates.converted())
         
         category_data = {}
         for trans in transactions:
             cat_name = trans.category.category_name if trans.category else 'Uncategorized'
             if cat_name not in category_data:
                 category_data[cat_name] = {'total': 0, 'count': 0, 'transactions': []}
-            category_data[cat_name]['total'] += float(trans.amount)
+            category_data[cat_name]['total'] += float(trans.base_amount)
             category_data[cat_name]['count'] += 1
             category_data[cat_name]['transactions'].append({
                 'id': trans.transaction_id,
                 'amount': float(trans.amount),
+                'currency': trans.currency,
                 'date': trans.date,
                 'description': trans.description,
                 'user': trans.finance.user.username,
@@ -369,7 +777,7 @@ class TransactionViewSet(viewsets.ModelViewSet):
         if not request.user.family:
             return Response({'error': 'User is not in a family'}, status=status.HTTP_400_BAD_REQUEST)
         
-        transactions = self.get_queryset()
+        transactions = self.get_queryset().annotate(base_amount=rates.converted())
         
         user_data = {}
         for trans in transactions:
@@ -377,11 +785,12 @@ class TransactionViewSet(viewsets.ModelViewSet):
             user_key = user.username
             if user_key not in user_data:
                 user_data[user_key] = {'total': 0, 'count': 0, 'transactions': []}
-            user_data[user_key]['total'] += float(trans.amount)
+            user_data[user_key]['total'] += float(trans.base_amount)
             user_data[user_key]['count'] += 1
             user_data[user_key]['transactions'].append({
                 'id': trans.transaction_id,
                 'amount': float(trans.amount),
+                'currency': trans.currency,
                 'date': trans.date,
                 'category': trans.category.category_name if trans.category else 'Uncategorized',
                 'description': trans.description,
@@ -389,11 +798,135 @@ class TransactionViewSet(viewsets.ModelViewSet):
         
         return Response(user_data)
 
-class GoalViewSet(viewsets.ModelViewSet):
-    queryset = Goal.objects.all()
+class RecurringRuleViewSet(ProjectionMixin, viewsets.ModelViewSet):
+    """Recurring income/expenses of the authenticated user.
+
+    Due occurrences are turned into transactions by `manage.py materialize_recurring`.
+    """
+    serializer_class = RecurringRuleSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return RecurringRule.objects.filter(finance__user=self.request.user).select_related('category').order_by('next_run')
+
+    def perform_create(self, serializer):
+        finance, _ = Finance.objects.get_or_create(user=self.request.user)
+        serializer.save(finance=finance, currency=serializer.validated_data.get('currency', finance.currency))
+
+class CategoryBudgetViewSet(ProjectionMixin, viewsets.ModelViewSet):
+    """Monthly per-category spending limits of the user's family"""
+    serializer_class = CategoryBudgetSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        user = self.request.user
+        if not user.family_id:
+            return CategoryBudget.objects.none()
+        return CategoryBudget.objects.filter(family_id=user.family_id).select_related('category').order_by('-month', 'category_id')
+
+    def _check_unique(self, serializer):
+        """One budget per family, category and month (a 400 instead of an IntegrityError)"""
+        data, instance = serializer.validated_data, serializer.instance
+        category = data['category'] if 'category' in data else instance.category
+        month = data['month'] if 'month' in data else instance.month
+        others = CategoryBudget.objects.filter(
+            family_id=self.request.user.family_id, category=category, month=month.replace(day=1)
+        )
+        if instance is not None:
+            others = others.exclude(pk=instance.pk)
+        if others.exists():
+            raise ValidationError({'category': 'A budget for this category and month already exists'})
+
+    def perform_create(self, serializer):
+        if not self.request.user.family_id:
+            raise ValidationError({'family': 'User is not in a family'})
+        self._check_unique(serializer)
+        serializer.save(family_id=self.request.user.family_id)
+
+    def perform_update(self, serializer):
+        self._check_unique(serializer)
+        serializer.save()
+
+    @action(detail=False, methods=['get'])
+    def status(self, request):
+        """
+        Budget status for a month, read straight from the maintained counters
+
+        Query params:
+        - month: YYYY-MM (default: current month)
+        """
+        month_param = request.query_params.get('month')
+        try:
+            month = datetime.strptime(month_param, '%Y-%m').date() if month_param else timezone.localdate().replace(day=1)
+        except ValueError:
+            return Response({'error': 'month must be in YYYY-MM format'}, status=status.HTTP_400_BAD_REQUEST)
+
+        budgets = self.get_queryset().filter(month=month)
+        # From the counters, not the rendered rows: ?fields may leave limit/spent out of those
+        totals = budgets.aggregate(
+            total_limit=Sum('limit'), total_spent=Sum('spent'),
+            over_budget_count=Count('pk', filter=Q(spent__gt=F('limit'))),
+        )
+        return Response({
+            'month': month.strftime('%Y-%m'),
+            'budgets': self.get_serializer(budgets, many=True).data,
+            'total_limit': float(totals['total_limit'] or 0),
+            'total_spent': float(totals['total_spent'] or 0),
+            'over_budget_count': totals['over_budget_count'],
+        })
+
+class GoalViewSet(ProjectionMixin, viewsets.ModelViewSet):
     serializer_class = GoalSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    def get_queryset(self):
+        """Goals of the user's family, with progress computed in SQL"""
+        user = self.request.user
+        if not user.family_id:
+            return Goal.objects.none()
+        return Goal.objects.filter(family_id=user.family_id).with_progress().order_by('deadline')
+
+    def perform_create(self, serializer):
+        if not self.request.user.family_id:
+            raise ValidationError({'family': 'User is not in a family'})
+        serializer.save(family_id=self.request.user.family_id)
+
+    @action(detail=True, methods=['post'])
+    def recalculate(self, request, pk=None):
+        """Rebuild current_amount from the goal's tagged contributions"""
+        goal = self.get_object()
+        goal.recalculate()
+        return Response(self.get_serializer(self.get_queryset().get(pk=goal.pk)).data)
+
+    @action(detail=True, methods=['get'])
+    def simulate(self, request, pk=None):
+        """
+        Monte Carlo probability of reaching the goal by its deadline (see simulation.py)
+
+        Query params:
+        - paths: number of simulated paths (default: 5000, max: 20000); fewer
+          are drawn if the time budget runs out
+
+        Cached per family data version and goal state, so repeated reads are one row lookup.
+        """
+        from . import simulation, snapshots
+        goal = self.get_object()
+        try:
+            paths = int(request.query_params.get('paths', simulation.DEFAULT_PATHS))
+        except ValueError:
+            raise ValidationError({'paths': 'Must be an integer'})
+        paths = min(max(paths, simulation.CHUNK_PATHS), simulation.MAX_PATHS)
+        params = {
+            'goal_id': goal.pk,
+            'paths': paths,
+            'state': f'{goal.target_amount}:{goal.current_amount}:{goal.deadline}:{timezone.localdate():%Y-%m}',
+        }
+        version = snapshots.family_versions([goal.family_id]).get(goal.family_id, '')
+        result = snapshots.read(
+            request.user, 'goal.simulate', params, scope=snapshots.family_scope(goal.family_id, version)
+        )
+        return Response({**result.payload, 'computed_at': result.computed_at})
+
 
 class AIAssistantViewSet(viewsets.ViewSet):
     """
@@ -401,15 +934,54 @@ class AIAssistantViewSet(viewsets.ViewSet):
     
     Endpoints:
     - GET /api/ai/analyze/ - Spending analysis by category and time period
-    - GET /api/ai/predict/ - Predict monthly expenses using linear regression
+      (?scope=family analyzes every visible family member in one pass)
+    - GET /api/ai/predict/ - Predict monthly expenses (Holt-Winters, with prediction intervals)
+    - GET /api/ai/forecast/ - Per-category seasonal forecasts with prediction intervals
     - GET /api/ai/recommendations/ - Get personalized budget recommendations
     - GET /api/ai/anomalies/ - Detect unusual transactions
-    - POST /api/ai/categorize/ - Auto-categorize transaction by description
+    - POST /api/ai/categorize/ - Auto-categorize transactions by description (one or a batch)
+
+    The GET endpoints are served from versioned snapshots (see snapshots.py):
+    results are recomputed only when the underlying transactions changed.
+    - ?refresh=background returns a stale snapshot immediately and refreshes
+      it in a background job instead of recomputing inline
+    - ?async=1 always queues the computation as a background job (see
+      jobs.py) and returns 202 with the job id to poll at /api/jobs/<id>/
     """
     permission_classes = [IsAuthenticated]
 
+    def _ai_response(self, request, kind, params):
+        if request.query_params.get('async') in ('1', 'true'):
+            from . import jobs
+            return self._job_response(jobs.enqueue(request.user, kind, params))
+        from . import snapshots
+        result = snapshots.read(
+            request.user, kind, params, background=request.query_params.get('refresh') == 'background'
+        )
+        if result.payload is None:
+            # Nothing cached yet and the refresh was sent to the background
+            return self._job_response(result.job)
+        return Response({
+            'status': 'success',
+            'data': result.payload,
+            'computed_at': result.computed_at,
+            'stale': not result.fresh,
+        })
+
+    def _job_response(self, job):
+        """Point the client at a queued (or joined identical) job"""
+        return Response({
+            'status': 'accepted',
+            'job_id': job.job_id,
+            'job_status': job.status,
+            'url': f'/api/jobs/{job.job_id}/',
+        }, status=status.HTTP_202_ACCEPTED)
+
     def _get_ai_service(self, user):
         """Initialize AI service for user"""
+        # Imported lazily: ai_service pulls in NumPy, which we
+        # don't want to pay for at worker startup.
+        from .ai_service import BudgetAIService
         return BudgetAIService(user)
 
     @action(detail=False, methods=['get'])
@@ -418,14 +990,18 @@ class AIAssistantViewSet(viewsets.ViewSet):
         Analyze user's spending patterns
         
         Returns spending breakdown by category and month, plus averages and trends
+
+        Query params:
+        - scope: 'user' (default) or 'family' for per-member and combined
+          breakdowns, forecasts and anomalies. Kids only ever see themselves.
+        - months_ahead: Forecast horizon for scope=family (default: 1, max: 12)
         """
         try:
-            ai_service = self._get_ai_service(request.user)
-            analysis = ai_service.analyze_spending()
-            return Response({
-                'status': 'success',
-                'data': analysis
-            })
+            scope = 'family' if request.query_params.get('scope') == 'family' else 'user'
+            months_ahead = int(request.query_params.get('months_ahead', 1))
+            months_ahead = min(max(months_ahead, 1), 12)
+            params = {'scope': scope, 'months_ahead': months_ahead} if scope == 'family' else {}
+            return self._ai_response(request, 'ai.analyze', params)
         except Exception as e:
             return Response({
                 'status': 'error',
@@ -435,7 +1011,7 @@ class AIAssistantViewSet(viewsets.ViewSet):
     @action(detail=False, methods=['get'])
     def predict(self, request):
         """
-        Predict monthly expenses for next N months using linear regression
+        Predict monthly expenses for next N months (Holt-Winters exponential smoothing)
         
         Query params:
         - months_ahead: Number of months to predict (default: 1, max: 12)
@@ -443,19 +1019,37 @@ class AIAssistantViewSet(viewsets.ViewSet):
         try:
             months_ahead = int(request.query_params.get('months_ahead', 1))
             months_ahead = min(max(months_ahead, 1), 12)  # Clamp between 1-12
-            
-            ai_service = self._get_ai_service(request.user)
-            prediction = ai_service.predict_monthly_expenses(months_ahead)
-            return Response({
-                'status': 'success',
-                'data': prediction
-            })
+            return self._ai_response(request, 'ai.predict', {'months_ahead': months_ahead})
         except Exception as e:
             return Response({
                 'status': 'error',
                 'message': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    @action(detail=False, methods=['get'])
+    def forecast(self, request):
+        """
+        Forecast expenses per category, total expenses, income and net for the next N months
+
+        Every series is forecast in one batched Holt-Winters call; yearly
+        seasonality is modelled once 24 months of history exist.
+
+        Query params:
+        - scope: 'user' (default) or 'family' (every member the user can see)
+        - months_ahead: Forecast horizon (default: 3, max: 12)
+        - level: Prediction interval level, 0.8 (default), 0.9 or 0.95
+        """
+        from .forecasting import DEFAULT_LEVEL, Z
+        scope = 'family' if request.query_params.get('scope') == 'family' else 'user'
+        try:
+            months_ahead = min(max(int(request.query_params.get('months_ahead', 3)), 1), 12)
+            level = float(request.query_params.get('level', DEFAULT_LEVEL))
+        except ValueError:
+            raise ValidationError({'detail': 'months_ahead must be an integer and level a number'})
+        if level not in Z:
+            raise ValidationError({'level': f"Must be one of {', '.join(str(z) for z in sorted(Z))}"})
+        return self._ai_response(request, 'ai.forecast', {'scope': scope, 'months_ahead': months_ahead, 'level': level})
+
     @action(detail=False, methods=['get'])
     def recommendations(self, request):
         """
@@ -464,12 +1058,7 @@ class AIAssistantViewSet(viewsets.ViewSet):
         Returns recommendations with priority levels and potential savings
         """
         try:
-            ai_service = self._get_ai_service(request.user)
-            recommendations = ai_service.get_budget_recommendations()
-            return Response({
-                'status': 'success',
-                'data': recommendations
-            })
+            return self._ai_response(request, 'ai.recommendations', {})
         except Exception as e:
             return Response({
                 'status': 'error',
@@ -487,31 +1076,51 @@ class AIAssistantViewSet(viewsets.ViewSet):
         try:
             threshold = float(request.query_params.get('threshold', 2.0))
             threshold = max(threshold, 1.0)  # Minimum 1 std dev
-            
-            ai_service = self._get_ai_service(request.user)
-            anomalies = ai_service.detect_anomalies(threshold)
-            return Response({
-                'status': 'success',
-                'data': anomalies
-            })
+            return self._ai_response(request, 'ai.anomalies', {'threshold': threshold})
         except Exception as e:
             return Response({
                 'status': 'error',
                 'message': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    MAX_CATEGORIZE = 1000
+
     @action(detail=False, methods=['post'])
     def categorize(self, request):
         """
-        Auto-categorize a transaction based on description
+        Auto-categorize transactions based on their descriptions
         
         Request body:
         {
             "description": "Starbucks coffee shop"
         }
+        or, to categorize many at once (at most 1000):
+        {
+            "descriptions": ["Starbucks coffee shop", "Shell gas station"]
+        }
         
-        Returns suggested category with confidence score
+        Returns suggested category with confidence score, or a list of them
+        in request order for "descriptions"
         """
+        from .ai_service import categorize_descriptions
+        descriptions = request.data.get('descriptions')
+        if descriptions is not None:
+            if (not isinstance(descriptions, list) or not descriptions
+                    or not all(isinstance(d, str) for d in descriptions)):
+                return Response({
+                    'status': 'error',
+                    'message': 'descriptions must be a non-empty list of strings'
+                }, status=status.HTTP_400_BAD_REQUEST)
+            if len(descriptions) > self.MAX_CATEGORIZE:
+                return Response({
+                    'status': 'error',
+                    'message': f'At most {self.MAX_CATEGORIZE} descriptions per request'
+                }, status=status.HTTP_400_BAD_REQUEST)
+            return Response({
+                'status': 'success',
+                'data': categorize_descriptions(descriptions)
+            })
+
         try:
             description = request.data.get('description', '')
             if not description:
@@ -530,4 +1139,42 @@ class AIAssistantViewSet(viewsets.ViewSet):
             return Response({
                 'status': 'error',
                 'message': str(e)
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class JobViewSet(ProjectionMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Status and results of the user's background jobs
+
+    GET /api/jobs/<id>/?wait=N waits up to N seconds (max 5) for the job to
+    finish before answering. Each waiting request holds a worker thread, so
+    the wait is kept short; clients poll again for longer jobs.
+    """
+    serializer_class = JobSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    MAX_WAIT = 5
+    POLL_INTERVAL = 0.25
+
+    def get_queryset(self):
+        return Job.objects.filter(user=self.request.user).order_by('-job_id')
+
+    def retrieve(self, request, *args, **kwargs):
+        job = self.get_object()
+        try:
+            wait = min(max(float(request.query_params.get('wait', 0)), 0), self.MAX_WAIT)
+        except ValueError:
+            raise ValidationError({'wait': 'Must be a number of seconds'})
+        deadline = time.monotonic() + wait
+        while not job.is_finished and time.monotonic() < deadline:
+            time.sleep(self.POLL_INTERVAL)
+            job.refresh_from_db()
+        return Response(self.get_serializer(job).data)
+
+
+class MetricsView(APIView):
+    """Per-endpoint performance metrics in Prometheus text format (staff only)"""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        from .metrics import registry
+        return HttpResponse(registry.render_prometheus(), content_type='text/plain; version=0.0.4; charset=utf-8')
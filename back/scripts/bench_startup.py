@@ -0,0 +1,67 @@
+"""
+Startup benchmark for a backend worker.
+
+Spawns fresh Python processes and measures, for each one:
+- import time: django.setup() + loading the URLconf (imports views/serializers)
+- time to first request: first request served through the full middleware stack
+- which heavy ML modules (numpy, pandas, sklearn) ended up loaded
+
+Usage: python scripts/bench_startup.py [--runs 5] [--path /api/]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WORKER_CODE = r'''
+import json, os, sys, time
+t0 = time.perf_counter()
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'family_budget.settings')
+import django
+django.setup()
+from django.urls import get_resolver
+get_resolver().url_patterns  # force URLconf (views, serializers) import
+t1 = time.perf_counter()
+from django.test import Client
+Client(HTTP_HOST='localhost').get(sys.argv[1])
+t2 = time.perf_counter()
+print(json.dumps({
+    'import_ms': (t1 - t0) * 1000,
+    'first_request_ms': (t2 - t1) * 1000,
+    'heavy_modules': sorted(m for m in ('numpy', 'pandas', 'sklearn') if m in sys.modules),
+}))
+'''
+
+
+def run_worker(path):
+    output = subprocess.run(
+        [sys.executable, '-c', WORKER_CODE, path],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--path', default='/api/')
+    args = parser.parse_args()
+
+    results = [run_worker(args.path) for _ in range(args.runs)]
+    import_ms = [r['import_ms'] for r in results]
+    first_ms = [r['first_request_ms'] for r in results]
+
+    print(f"Runs: {args.runs} (first request: GET {args.path})")
+    print(f"Import time:           median {statistics.median(import_ms):8.1f} ms  (min {min(import_ms):.1f})")
+    print(f"Time to first request: median {statistics.median(first_ms):8.1f} ms  (min {min(first_ms):.1f})")
+    print(f"Total startup:         median {statistics.median(a + b for a, b in zip(import_ms, first_ms)):8.1f} ms")
+    print(f"Heavy modules loaded:  {', '.join(results[-1]['heavy_modules']) or 'none'}")
+
+
+if __name__ == '__main__':
+    main()